@@ -0,0 +1,50 @@
+"""Add customer full-text search index
+
+Revision ID: 5d1f3c9a7e20
+Revises: ae2b7c168bba
+Create Date: 2026-10-18 16:20:43.911207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d1f3c9a7e20'
+down_revision: Union[str, Sequence[str], None] = 'ae2b7c168bba'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # FTS5 仅用于 SQLite，其他数据库的搜索回退为 LIKE
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    # 外部内容表引用 customers 的列，没有客户表时无需建立；由迁移建立的客户表缺少 notes 列，先补上
+    inspector = sa.inspect(op.get_bind())
+    if 'customers' not in inspector.get_table_names():
+        return
+    if 'notes' not in {column['name'] for column in inspector.get_columns('customers')}:
+        op.add_column('customers', sa.Column('notes', sa.Text(), nullable=True))
+
+    # 复用模型中的建表与触发器语句，保证与 create_all 创建的结构一致
+    from app.models.customer import CUSTOMER_FTS_DDL
+    for statement in CUSTOMER_FTS_DDL:
+        op.execute(statement)
+
+    # 为已有客户数据建立索引
+    op.execute("INSERT INTO customers_fts(customers_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    op.execute("DROP TRIGGER IF EXISTS customers_fts_au")
+    op.execute("DROP TRIGGER IF EXISTS customers_fts_ad")
+    op.execute("DROP TRIGGER IF EXISTS customers_fts_ai")
+    op.execute("DROP TABLE IF EXISTS customers_fts")
@@ -0,0 +1,36 @@
+"""Add table_versions for conditional GET
+
+Revision ID: 8c4e2a61f0d7
+Revises: 5d1f3c9a7e20
+Create Date: 2026-10-18 17:05:12.503318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c4e2a61f0d7'
+down_revision: Union[str, Sequence[str], None] = '5d1f3c9a7e20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 应用启动时的 create_all 可能已经建好该表
+    if 'table_versions' in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.create_table('table_versions',
+        sa.Column('table_name', sa.String(), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.PrimaryKeyConstraint('table_name')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('table_versions')
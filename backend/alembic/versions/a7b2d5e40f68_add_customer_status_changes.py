@@ -0,0 +1,55 @@
+"""Add customer status change history
+
+Revision ID: a7b2d5e40f68
+Revises: f6a1c4d39e57
+Create Date: 2026-10-18 23:52:19.406318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7b2d5e40f68'
+down_revision: Union[str, Sequence[str], None] = 'f6a1c4d39e57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+STATUS = sa.Enum('LEAD', 'CONTACTED', 'PROPOSAL', 'WON', 'LOST', name='customerstatus')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if 'customer_status_changes' in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.create_table('customer_status_changes',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('customer_id', sa.Integer(), nullable=False),
+        sa.Column('from_status', STATUS, nullable=True),
+        sa.Column('to_status', STATUS, nullable=False),
+        sa.Column('sales_id', sa.Integer(), nullable=True),
+        sa.Column('stage_seconds', sa.Integer(), nullable=True),
+        sa.Column('changed_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+        sa.ForeignKeyConstraint(['customer_id'], ['customers.id'], ),
+        sa.ForeignKeyConstraint(['sales_id'], ['employees.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_customer_status_changes_customer_id_changed_at', 'customer_status_changes', ['customer_id', 'changed_at'], unique=False)
+    op.create_index('ix_customer_status_changes_changed_at', 'customer_status_changes', ['changed_at'], unique=False)
+    op.create_index('ix_customer_status_changes_sales_id_changed_at', 'customer_status_changes', ['sales_id', 'changed_at'], unique=False)
+
+    # 回填：已有客户以创建时间进入当前状态（之前的状态变化没有记录）
+    op.execute(
+        "INSERT INTO customer_status_changes (customer_id, to_status, sales_id, changed_at) "
+        "SELECT id, status, sales_id, COALESCE(created_at, CURRENT_TIMESTAMP) FROM customers"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_customer_status_changes_sales_id_changed_at', table_name='customer_status_changes')
+    op.drop_index('ix_customer_status_changes_changed_at', table_name='customer_status_changes')
+    op.drop_index('ix_customer_status_changes_customer_id_changed_at', table_name='customer_status_changes')
+    op.drop_table('customer_status_changes')
@@ -0,0 +1,66 @@
+"""Add indexes for list endpoint filter paths
+
+Revision ID: ae2b7c168bba
+Revises: 20c085f564f6
+Create Date: 2026-10-18 15:02:11.284530
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ae2b7c168bba'
+down_revision: Union[str, Sequence[str], None] = '20c085f564f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (索引名, 表名, 列) —— 与模型中的 index=True / Index(...) 定义保持一致
+INDEXES = [
+    ('ix_customers_province_city', 'customers', ['province', 'city']),
+    ('ix_customers_city', 'customers', ['city']),
+    ('ix_customers_status', 'customers', ['status']),
+    ('ix_customers_sales_id_status', 'customers', ['sales_id', 'status']),
+    ('ix_customers_service_id', 'customers', ['service_id']),
+    ('ix_orders_customer_id', 'orders', ['customer_id']),
+    ('ix_orders_sales_id_created_at', 'orders', ['sales_id', 'created_at']),
+    ('ix_orders_status_created_at', 'orders', ['status', 'created_at']),
+    ('ix_orders_created_at', 'orders', ['created_at']),
+    ('ix_orders_start_date', 'orders', ['start_date']),
+    ('ix_orders_end_date', 'orders', ['end_date']),
+    ('ix_order_items_order_id', 'order_items', ['order_id']),
+    ('ix_order_items_product_id', 'order_items', ['product_id']),
+    ('ix_contacts_customer_id', 'contacts', ['customer_id']),
+    ('ix_sales_follows_customer_id_follow_date', 'sales_follows', ['customer_id', 'follow_date']),
+    ('ix_service_records_customer_id', 'service_records', ['customer_id']),
+]
+
+
+def _existing_indexes():
+    """返回 {表名: 已有索引名集合}，不存在的表不会出现在结果中"""
+    inspector = sa.inspect(op.get_bind())
+    return {
+        table: {index['name'] for index in inspector.get_indexes(table)}
+        for table in inspector.get_table_names()
+    }
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # contacts / sales_follows / service_records 等表在部分环境中由
+    # Base.metadata.create_all 创建，可能已经带有同名索引，因此逐个检查
+    existing = _existing_indexes()
+    for name, table, columns in INDEXES:
+        if table in existing and name not in existing[table]:
+            op.create_index(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    existing = _existing_indexes()
+    for name, table, _ in reversed(INDEXES):
+        if name in existing.get(table, set()):
+            op.drop_index(name, table_name=table)
@@ -0,0 +1,55 @@
+"""Add change_log for delta sync
+
+Revision ID: b71d05e93a4c
+Revises: 8c4e2a61f0d7
+Create Date: 2026-10-18 17:48:30.127654
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b71d05e93a4c'
+down_revision: Union[str, Sequence[str], None] = '8c4e2a61f0d7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if 'change_log' not in sa.inspect(op.get_bind()).get_table_names():
+        op.create_table('change_log',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('table_name', sa.String(), nullable=False),
+            sa.Column('row_id', sa.Integer(), nullable=False),
+            sa.Column('operation', sa.String(length=1), nullable=False),
+            sa.Column('changed_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+            sa.PrimaryKeyConstraint('id'),
+            sqlite_autoincrement=True
+        )
+        op.create_index('ix_change_log_table_name_row_id', 'change_log', ['table_name', 'row_id'], unique=True)
+
+    # 变更日志由触发器维护（仅 SQLite），复用模型中的语句保证与 create_all 一致；
+    # contacts 等表在部分环境中由 Base.metadata.create_all 创建，只为已存在的表建立触发器
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    from app.models.change_log import CHANGE_LOG_TABLES, change_log_trigger_ddl
+    tables = sa.inspect(op.get_bind()).get_table_names()
+    for table_name in CHANGE_LOG_TABLES:
+        if table_name in tables:
+            for statement in change_log_trigger_ddl(table_name):
+                op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'sqlite':
+        from app.models.change_log import CHANGE_LOG_TABLES
+        for table_name in CHANGE_LOG_TABLES:
+            for suffix in ('ai', 'au', 'ad'):
+                op.execute(f"DROP TRIGGER IF EXISTS {table_name}_change_log_{suffix}")
+    op.drop_index('ix_change_log_table_name_row_id', table_name='change_log')
+    op.drop_table('change_log')
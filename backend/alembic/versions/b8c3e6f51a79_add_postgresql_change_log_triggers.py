@@ -0,0 +1,63 @@
+"""Add change_log triggers on PostgreSQL
+
+Revision ID: b8c3e6f51a79
+Revises: a7b2d5e40f68
+Create Date: 2026-10-19 10:12:37.581204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8c3e6f51a79'
+down_revision: Union[str, Sequence[str], None] = 'a7b2d5e40f68'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 此版本的 change_log 尚无 xact_id 列，触发器函数按当时的表结构写入（c5e2a8d91f37 中替换）
+CHANGE_LOG_FUNCTION = """
+CREATE OR REPLACE FUNCTION change_log_record() RETURNS trigger AS $$
+DECLARE
+    changed_id integer;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        changed_id := OLD.id;
+    ELSE
+        changed_id := NEW.id;
+    END IF;
+    DELETE FROM change_log WHERE table_name = TG_TABLE_NAME AND row_id = changed_id;
+    INSERT INTO change_log(table_name, row_id, operation, changed_at)
+    VALUES (TG_TABLE_NAME, changed_id, CASE WHEN TG_OP = 'DELETE' THEN 'D' ELSE 'U' END, CURRENT_TIMESTAMP);
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # SQLite 的触发器已由 b71d05e93a4c 建立；与其相同，只为已存在的表建立触发器
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    from app.models.change_log import CHANGE_LOG_TABLES, change_log_postgresql_trigger_ddl
+    op.execute(CHANGE_LOG_FUNCTION)
+    tables = sa.inspect(op.get_bind()).get_table_names()
+    for table_name in CHANGE_LOG_TABLES:
+        if table_name in tables:
+            for statement in change_log_postgresql_trigger_ddl(table_name):
+                op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    from app.models.change_log import CHANGE_LOG_TABLES
+    tables = sa.inspect(op.get_bind()).get_table_names()
+    for table_name in CHANGE_LOG_TABLES:
+        if table_name in tables:
+            op.execute(f"DROP TRIGGER IF EXISTS {table_name}_change_log ON {table_name}")
+    op.execute("DROP FUNCTION IF EXISTS change_log_record()")
@@ -0,0 +1,50 @@
+"""Add maintained total_amount / outstanding_amount to orders
+
+Revision ID: c3d8f1a27b64
+Revises: b71d05e93a4c
+Create Date: 2026-10-18 19:12:45.381920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3d8f1a27b64'
+down_revision: Union[str, Sequence[str], None] = 'b71d05e93a4c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 新建的数据库由 create_all 直接建好这两列
+    inspector = sa.inspect(op.get_bind())
+    columns = {column['name'] for column in inspector.get_columns('orders')}
+    for name in ('total_amount', 'outstanding_amount'):
+        if name not in columns:
+            op.add_column('orders', sa.Column(name, sa.Numeric(10, 2), server_default='0', nullable=False))
+
+    indexes = {index['name'] for index in inspector.get_indexes('orders')}
+    for name, column in (('ix_orders_total_amount', 'total_amount'), ('ix_orders_outstanding_amount', 'outstanding_amount')):
+        if name not in indexes:
+            op.create_index(name, 'orders', [column], unique=False)
+
+    # 回填：先按订单项汇总总额，再据此计算未付金额
+    op.execute(
+        "UPDATE orders SET total_amount = ("
+        "SELECT COALESCE(SUM(order_items.quantity * order_items.unit_price), 0) "
+        "FROM order_items WHERE order_items.order_id = orders.id)"
+    )
+    op.execute("UPDATE orders SET outstanding_amount = total_amount - COALESCE(paid_amount, 0)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_orders_outstanding_amount', table_name='orders')
+    op.drop_index('ix_orders_total_amount', table_name='orders')
+    with op.batch_alter_table('orders') as batch_op:
+        batch_op.drop_column('outstanding_amount')
+        batch_op.drop_column('total_amount')
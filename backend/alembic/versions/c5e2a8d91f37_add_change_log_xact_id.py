@@ -0,0 +1,70 @@
+"""Record the writing transaction in change_log instead of serializing writers
+
+Revision ID: c5e2a8d91f37
+Revises: b8c3e6f51a79
+Create Date: 2026-10-19 14:05:26.731948
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e2a8d91f37'
+down_revision: Union[str, Sequence[str], None] = 'b8c3e6f51a79'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# b8c3e6f51a79 中的触发器函数（不写 xact_id 列）
+PREVIOUS_FUNCTION = """
+CREATE OR REPLACE FUNCTION change_log_record() RETURNS trigger AS $$
+DECLARE
+    changed_id integer;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        changed_id := OLD.id;
+    ELSE
+        changed_id := NEW.id;
+    END IF;
+    DELETE FROM change_log WHERE table_name = TG_TABLE_NAME AND row_id = changed_id;
+    INSERT INTO change_log(table_name, row_id, operation, changed_at)
+    VALUES (TG_TABLE_NAME, changed_id, CASE WHEN TG_OP = 'DELETE' THEN 'D' ELSE 'U' END, CURRENT_TIMESTAMP);
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 新建的数据库由 create_all 直接建好这些列；已有记录的事务都已结束，xact_id 取 0 即可
+    inspector = sa.inspect(op.get_bind())
+    tables = inspector.get_table_names()
+    if 'change_log' in tables:
+        if 'xact_id' not in {column['name'] for column in inspector.get_columns('change_log')}:
+            op.add_column('change_log', sa.Column('xact_id', sa.BigInteger(), server_default='0', nullable=False))
+        # SQLite 按主键读取，只有 PostgreSQL 需要 (xact_id, id) 索引
+        if op.get_bind().dialect.name == 'postgresql' and 'ix_change_log_xact_id_id' not in {
+            index['name'] for index in inspector.get_indexes('change_log')
+        }:
+            op.create_index('ix_change_log_xact_id_id', 'change_log', ['xact_id', 'id'], unique=False)
+    if 'order_expiry_scans' in tables and 'change_log_xact_id' not in {
+        column['name'] for column in inspector.get_columns('order_expiry_scans')
+    }:
+        op.add_column('order_expiry_scans', sa.Column('change_log_xact_id', sa.BigInteger(), server_default='0', nullable=False))
+
+    if op.get_bind().dialect.name == 'postgresql':
+        from app.models.change_log import CHANGE_LOG_POSTGRESQL_FUNCTION
+        op.execute(CHANGE_LOG_POSTGRESQL_FUNCTION)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute(PREVIOUS_FUNCTION)
+        op.drop_index('ix_change_log_xact_id_id', table_name='change_log')
+    # 不用 batch 重建表：change_log 上的 SQLite 触发器会让重命名临时表失败（SQLite 3.35 起支持 DROP COLUMN）
+    op.drop_column('order_expiry_scans', 'change_log_xact_id')
+    op.drop_column('change_log', 'xact_id')
@@ -0,0 +1,52 @@
+"""Add order expiry reminder queue and scan state
+
+Revision ID: d4e9a2b17c35
+Revises: c3d8f1a27b64
+Create Date: 2026-10-18 21:06:12.514873
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4e9a2b17c35'
+down_revision: Union[str, Sequence[str], None] = 'c3d8f1a27b64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    tables = sa.inspect(op.get_bind()).get_table_names()
+    if 'order_expiry_reminders' not in tables:
+        op.create_table('order_expiry_reminders',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('order_id', sa.Integer(), nullable=False),
+            sa.Column('window_days', sa.Integer(), nullable=False),
+            sa.Column('end_date', sa.DateTime(), nullable=False),
+            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+            sa.ForeignKeyConstraint(['order_id'], ['orders.id'], ),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('order_id', 'window_days', 'end_date', name='uq_order_expiry_reminders_order_window_end')
+        )
+        op.create_index('ix_order_expiry_reminders_end_date_id', 'order_expiry_reminders', ['end_date', 'id'], unique=False)
+        op.create_index('ix_order_expiry_reminders_window_end_date_id', 'order_expiry_reminders', ['window_days', 'end_date', 'id'], unique=False)
+    if 'order_expiry_scans' not in tables:
+        op.create_table('order_expiry_scans',
+            sa.Column('window_days', sa.Integer(), nullable=False),
+            sa.Column('scanned_until', sa.Date(), nullable=True),
+            sa.Column('change_log_id', sa.Integer(), nullable=False),
+            sa.Column('scanned_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+            sa.PrimaryKeyConstraint('window_days')
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('order_expiry_scans')
+    op.drop_index('ix_order_expiry_reminders_window_end_date_id', table_name='order_expiry_reminders')
+    op.drop_index('ix_order_expiry_reminders_end_date_id', table_name='order_expiry_reminders')
+    op.drop_table('order_expiry_reminders')
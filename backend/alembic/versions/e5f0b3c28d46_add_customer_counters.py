@@ -0,0 +1,75 @@
+"""Add maintained activity counters to customers
+
+Revision ID: e5f0b3c28d46
+Revises: d4e9a2b17c35
+Create Date: 2026-10-18 22:31:40.268159
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5f0b3c28d46'
+down_revision: Union[str, Sequence[str], None] = 'd4e9a2b17c35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = (
+    ('contact_count', sa.Integer(), '0'),
+    ('follow_count', sa.Integer(), '0'),
+    ('order_count', sa.Integer(), '0'),
+    ('service_record_count', sa.Integer(), '0'),
+    ('last_follow_at', sa.DateTime(), None),
+    ('next_follow_at', sa.DateTime(), None),
+    ('latest_intention_level', sa.String(), None),
+)
+INDEXES = (
+    ('ix_customers_next_follow_at', 'next_follow_at'),
+    ('ix_customers_latest_intention_level', 'latest_intention_level'),
+)
+# 回填：(列, 来源表, 表达式)，按关联表统计，与 models.customer_counters 的计算方式一致
+BACKFILL = (
+    ('contact_count', 'contacts', "(SELECT count(*) FROM contacts WHERE contacts.customer_id = customers.id)"),
+    ('follow_count', 'sales_follows', "(SELECT count(*) FROM sales_follows WHERE sales_follows.customer_id = customers.id)"),
+    ('order_count', 'orders', "(SELECT count(*) FROM orders WHERE orders.customer_id = customers.id)"),
+    ('service_record_count', 'service_records',
+     "(SELECT count(*) FROM service_records WHERE service_records.customer_id = customers.id)"),
+    ('last_follow_at', 'sales_follows', "(SELECT max(follow_date) FROM sales_follows WHERE sales_follows.customer_id = customers.id)"),
+    ('next_follow_at', 'sales_follows', "(SELECT next_follow_date FROM sales_follows WHERE sales_follows.customer_id = customers.id "
+     "ORDER BY follow_date DESC, id DESC LIMIT 1)"),
+    ('latest_intention_level', 'sales_follows', "(SELECT intention_level FROM sales_follows WHERE sales_follows.customer_id = customers.id "
+     "ORDER BY follow_date DESC, id DESC LIMIT 1)"),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 新建的数据库由 create_all 直接建好这些列
+    inspector = sa.inspect(op.get_bind())
+    columns = {column['name'] for column in inspector.get_columns('customers')}
+    for name, type_, default in COLUMNS:
+        if name not in columns:
+            op.add_column('customers', sa.Column(name, type_, server_default=default, nullable=default is None))
+
+    indexes = {index['name'] for index in inspector.get_indexes('customers')}
+    for name, column in INDEXES:
+        if name not in indexes:
+            op.create_index(name, 'customers', [column], unique=False)
+
+    # 回填（不改变 updated_at）；关联表在部分环境中由 create_all 创建，不存在的表没有可统计的数据
+    tables = inspector.get_table_names()
+    assignments = [f"{name} = {expression}" for name, table, expression in BACKFILL if table in tables]
+    if assignments:
+        op.execute("UPDATE customers SET " + ", ".join(assignments))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, _ in INDEXES:
+        op.drop_index(name, table_name='customers')
+    with op.batch_alter_table('customers') as batch_op:
+        for name, _, _ in reversed(COLUMNS):
+            batch_op.drop_column(name)
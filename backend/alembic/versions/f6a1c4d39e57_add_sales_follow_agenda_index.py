@@ -0,0 +1,37 @@
+"""Add (employee_id, next_follow_date) index for the follow-up agenda
+
+Revision ID: f6a1c4d39e57
+Revises: e5f0b3c28d46
+Create Date: 2026-10-18 23:14:05.731442
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6a1c4d39e57'
+down_revision: Union[str, Sequence[str], None] = 'e5f0b3c28d46'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # sales_follows 在部分环境中由 Base.metadata.create_all 创建（同时带有该索引）
+    inspector = sa.inspect(op.get_bind())
+    if 'sales_follows' not in inspector.get_table_names():
+        return
+    indexes = {index['name'] for index in inspector.get_indexes('sales_follows')}
+    if 'ix_sales_follows_employee_id_next_follow_date' not in indexes:
+        op.create_index('ix_sales_follows_employee_id_next_follow_date', 'sales_follows', ['employee_id', 'next_follow_date'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    if 'sales_follows' not in inspector.get_table_names():
+        return
+    op.drop_index('ix_sales_follows_employee_id_next_follow_date', table_name='sales_follows')
@@ -10,18 +10,24 @@ from .endpoints import (
     orders,
     sales_follows,
     service_records,
-    sales_view
+    sales_view,
+    sync,
+    cache,
+    analytics
 )
 
 api_router = APIRouter()
-api_router.include_router(auth.router, prefix="/a"uth"", tags=[A""uth""])
-api_router.include_router(employees.router, prefix="/employ"ees"", tags=[E"mploy"ees""])
-api_router.include_router(departments.router, prefix="/departme"nts"", tags=[D"epartme"nts""])
-api_router.include_router(department_groups.router, prefix="/department-gro"ups"", tags=[D"epartment Gro"ups""])
-api_router.include_router(customers.router, prefix="/custom"ers"", tags=[C"ustom"ers""])
-api_router.include_router(contacts.router, prefix="/conta"cts"", tags=[C"onta"cts""])
-api_router.include_router(products.router, prefix="/produ"cts"", tags=[P"rodu"cts""])
-api_router.include_router(orders.router, prefix="/ord"ers"", tags=[O"rd"ers""])
-api_router.include_router(sales_follows.router, prefix="/sales-foll"ows"", tags=[S"alesFoll"ows""])
-api_router.include_router(service_records.router, prefix="/service-reco"rds"", tags=[S"erviceReco"rds""])
-api_router.include_router(sales_view.router, prefix="/sales-v"iew"", tags=[S"ales V"iew""])
\ No newline at end of file
+api_router.include_router(auth.router, prefix="/auth", tags=["Auth"])
+api_router.include_router(employees.router, prefix="/employees", tags=["Employees"])
+api_router.include_router(departments.router, prefix="/departments", tags=["Departments"])
+api_router.include_router(department_groups.router, prefix="/department-groups", tags=["Department Groups"])
+api_router.include_router(customers.router, prefix="/customers", tags=["Customers"])
+api_router.include_router(contacts.router, prefix="/contacts", tags=["Contacts"])
+api_router.include_router(products.router, prefix="/products", tags=["Products"])
+api_router.include_router(orders.router, prefix="/orders", tags=["Orders"])
+api_router.include_router(sales_follows.router, prefix="/sales-follows", tags=["SalesFollows"])
+api_router.include_router(service_records.router, prefix="/service-records", tags=["ServiceRecords"])
+api_router.include_router(sales_view.router, prefix="/sales-view", tags=["Sales View"])
+api_router.include_router(sync.router, prefix="/sync", tags=["Sync"])
+api_router.include_router(cache.router, prefix="/cache", tags=["Cache"])
+api_router.include_router(analytics.router, prefix="/analytics", tags=["Analytics"])
\ No newline at end of file
@@ -0,0 +1,43 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import Optional
+from datetime import date
+from ... import schemas
+from ...crud import crud_analytics
+from ...database import get_db
+from ...utils.conditional import conditional_get
+from ...utils.response_cache import CachedRoute, cache_response
+
+
+router = APIRouter(route_class=CachedRoute)
+
+# 漏斗统计依赖的表
+FUNNEL_TABLES = ("customer_status_changes", "customers", "employees")
+PERIOD_PATTERN = f"^({'|'.join(crud_analytics.FUNNEL_PERIOD_FORMATS)})$"
+
+@router.get("/funnel", response_model=schemas.Funnel, dependencies=[conditional_get(*FUNNEL_TABLES)])
+@cache_response(*FUNNEL_TABLES)
+def read_funnel(
+    db: Session = Depends(get_db),
+    period: str = Query("month", pattern=PERIOD_PATTERN),
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    sales_id: Optional[int] = None,
+    department_id: Optional[int] = None,
+    by_owner: bool = False,
+):
+    """
+    销售漏斗：按周期（week/month/quarter/year）统计各状态的进入/离开客户数、推进比例、平均停留天数和成交率
+
+    from/to 按状态变更日期筛选（含两端），sales_id / department_id 只统计该销售或部门负责的客户，
+    by_owner=true 时每个周期再按销售负责人分行。统计在数据库中分组完成，结果按查询参数缓存。
+    """
+    return crud_analytics.get_funnel(
+        db,
+        period=period,
+        date_from=date_from,
+        date_to=date_to,
+        sales_id=sales_id,
+        department_id=department_id,
+        by_owner=by_owner,
+    )
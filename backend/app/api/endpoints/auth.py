@@ -10,7 +10,7 @@ from ...database import get_db
 
 router = APIRouter()
 
-@router.post("/lo"gin"", response_model=schemas.Token)
+@router.post("/login", response_model=schemas.Token)
 def login_for_access_token(db: Session = Depends(get_db), form_data: OAuth2PasswordRequestForm = Depends()):
     """
     用户登录获取Token
@@ -19,11 +19,11 @@ def login_for_access_token(db: Session = Depends(get_db), form_data: OAuth2Passw
     if not user or not security.verify_password(form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail=I"ncorre"ct" username or pa"ssword""",
-            headers={W"WW"-Authentic"ate"": "B"earer"""},
+            detail="Incorrect username or password",
+            headers={"WWW-Authenticate": "Bearer"},
         )
     access_token_expires = timedelta(minutes=security.settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = security.create_access_token(
-        data={""ub": user.username}, expires_delta=access_token_expires
+        data={"sub": user.username}, expires_delta=access_token_expires
     )
-    return {access_t"ok"en"": access_token, "token""_t"y"pe": "bear"er""}
\ No newline at end of file
+    return {"access_token": access_token, "token_type": "bearer"}
\ No newline at end of file
@@ -0,0 +1,13 @@
+from fastapi import APIRouter
+from ...utils.fastjson import FastJSONResponse
+from ...utils.response_cache import response_cache
+
+
+router = APIRouter()
+
+@router.get("/stats", response_class=FastJSONResponse)
+def read_cache_stats():
+    """
+    响应缓存统计：命中、未命中、淘汰、失效次数，以及进程内缓存的条目数和占用字节数
+    """
+    return response_cache.stats()
@@ -1,9 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from ... import models, schemas
 from ...crud import crud_contact
 from ...database import get_db
+from ...utils.fields import parse_fields, projection_response
 
 
 router = APIRouter()
@@ -17,10 +18,13 @@ def create_contact_for_customer(
 
 @router.get("/customers/{customer_id}/contacts/", response_model=List[schemas.Contact])
 def read_contacts_for_customer(
-    customer_id: int, skip: int = 0, limit: int = 100, db: Session = Depends(get_db)
+    customer_id: int, skip: int = 0, limit: int = 100, fields: Optional[str] = None, db: Session = Depends(get_db)
 ):
-    """读取指定客户的联系人列表"""
-    contacts = crud_contact.get_contacts_by_customer(db, customer_id=customer_id, skip=skip, limit=limit)
+    """读取指定客户的联系人列表，fields 为逗号分隔的字段名时只返回这些字段"""
+    selected = parse_fields(fields, crud_contact.CONTACT_FIELD_COLUMNS)
+    contacts = crud_contact.get_contacts_by_customer(db, customer_id=customer_id, skip=skip, limit=limit, fields=selected)
+    if selected is not None:
+        return projection_response(schemas.Contact, selected, contacts)
     return contacts
 
 @router.put("/contacts/{contact_id}", response_model=schemas.Contact)
@@ -28,7 +32,7 @@ def update_contact(contact_id: int, contact: schemas.ContactUpdate, db: Session
     """更新联系人信息"""
     db_contact = crud_contact.update_contact(db, contact_id=contact_id, contact=contact)
     if db_contact is None:
-        raise HTTPException(status_code=404, detail=C"onta"ct" not "fou"nd"")
+        raise HTTPException(status_code=404, detail="Contact not found")
     return db_contact
 
 @router.delete("/contacts/{contact_id}", response_model=schemas.Contact)
@@ -36,5 +40,5 @@ def delete_contact(contact_id: int, db: Session = Depends(get_db)):
     """删除联系人"""
     db_contact = crud_contact.delete_contact(db, contact_id=contact_id)
     if db_contact is None:
-        raise HTTPException(status_code=404, detail=C"onta"ct" not f"ound""")
+        raise HTTPException(status_code=404, detail="Contact not found")
     return db_contact
\ No newline at end of file
@@ -1,22 +1,60 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Response, UploadFile
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional, Union
 from ... import models, schemas
 from ...crud import crud_customer
 from ...database import get_db
+from ...utils.conditional import conditional_get
+from ...utils.response_cache import CachedRoute, cache_response
+from ...utils.pagination import check_cursor_limit, cursor_to_after_id, split_page
+from ...utils.import_reader import iter_import_rows
+from ...utils.export import export_response
+from ...utils.fields import parse_fields, projection_response
 from ...models.customer import CustomerStatus
 from ...crud import crud_contact
 
 
-router = APIRouter()
+router = APIRouter(route_class=CachedRoute)
+
+TABLES = ("customers", "contacts", "employees")
 
 @router.post("/", response_model=schemas.Customer)
 def create_customer(customer: schemas.CustomerCreate, db: Session = Depends(get_db)):
     return crud_customer.create_customer(db=db, customer=customer)
 
+@router.post("/import", response_model=schemas.CustomerImportResult)
+def import_customers(file: UploadFile = File(...), db: Session = Depends(get_db)):
+    """
+    批量导入客户（CSV 或 XLSX）
+
+    文件逐行流式读取并按块写入，返回逐行错误报告和吞吐统计。
+    """
+    try:
+        rows = iter_import_rows(file.file, file.filename or "")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return crud_customer.bulk_import_customers(db, rows)
+
+def _assign(db: Session, customer_ids: List[int], field: str, employee_id: Optional[int]):
+    if employee_id is not None and db.get(models.Employee, employee_id) is None:
+        raise HTTPException(status_code=404, detail="Employee not found")
+    updated = crud_customer.bulk_assign_customers(db, customer_ids, field=field, employee_id=employee_id)
+    return {"requested": len(set(customer_ids)), "updated": updated}
+
+@router.post("/assign_sales/", response_model=schemas.CustomerAssignResult)
+def assign_sales(assignment: schemas.CustomerAssignSales, db: Session = Depends(get_db)):
+    """批量分配销售负责人（一次请求处理全部选中客户）"""
+    return _assign(db, assignment.customer_ids, "sales_id", assignment.sales_id)
+
+@router.post("/assign_service/", response_model=schemas.CustomerAssignResult)
+def assign_service(assignment: schemas.CustomerAssignService, db: Session = Depends(get_db)):
+    """批量分配客服负责人（一次请求处理全部选中客户）"""
+    return _assign(db, assignment.customer_ids, "service_id", assignment.service_id)
+
 
-@router.get("/", response_model=List[schemas.Customer])
+@router.get("/", response_model=Union[List[schemas.Customer], schemas.CustomerPage], dependencies=[conditional_get(*TABLES)])
 def read_customers(
+    response: Response,
     db: Session = Depends(get_db),
     skip: int = 0,
     limit: int = 100,
@@ -26,51 +64,139 @@ def read_customers(
     city: str = None,
     status: CustomerStatus = None,
     sales_id: int = None,
+    cursor: Optional[str] = None,
+    q: Optional[str] = None,
+    fields: Optional[str] = None,
 ):
+    """
+    读取客户列表
+
+    不传 cursor 时使用 skip/limit 分页并直接返回列表（兼容旧客户端）；
+    传入 cursor 时使用游标分页，首页传空字符串，返回 {items, next_cursor}。
+    q 为全文检索关键词（公司名、行业、地址、备注），offset 分页时结果按相关度排序。
+    fields 为逗号分隔的字段名（如 fields=id,company,status,sales_name），只返回这些字段。
+    """
+    after_id = cursor_to_after_id(cursor)
+    if after_id is not None:
+        check_cursor_limit(limit)
+    selected = parse_fields(fields, crud_customer.CUSTOMER_FIELDS)
+
     customers = crud_customer.get_customers(
         db,
         skip=skip,
-        limit=limit,
+        limit=limit + 1 if after_id is not None else limit,
+        company=company,
+        industry=industry,
+        province=province,
+        city=city,
+        status=status,
+        sales_id=sales_id,
+        after_id=after_id,
+        q=q,
+        fields=selected,
+    )
+
+    if selected is not None:
+        if after_id is not None:
+            customers, next_cursor = split_page(customers, limit, key=lambda c: (c["id"],))
+            return projection_response(schemas.Customer, selected, customers, next_cursor, response=response)
+        return projection_response(schemas.Customer, selected, customers, response=response)
+
+    # 负责人和联系人已在查询中预加载，sales_name/service_name 由模型属性提供，
+    # 直接交给 response_model 做一次序列化即可
+    if after_id is not None:
+        customers, next_cursor = split_page(customers, limit, key=lambda c: (c.id,))
+        return {"items": customers, "next_cursor": next_cursor}
+    return customers
+
+@router.get("/export")
+def export_customers(
+    db: Session = Depends(get_db),
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    company: str = None,
+    industry: str = None,
+    province: str = None,
+    city: str = None,
+    status: CustomerStatus = None,
+    sales_id: int = None,
+    q: Optional[str] = None,
+):
+    """按列表接口相同的筛选条件流式导出客户（CSV 或 NDJSON），不分页"""
+    rows = crud_customer.export_customers(
+        db,
+        company=company,
+        industry=industry,
+        province=province,
+        city=city,
+        status=status,
+        sales_id=sales_id,
+        q=q,
+    )
+    return export_response(crud_customer.CUSTOMER_EXPORT_FIELDS, rows, format, "customers")
+
+@router.get("/facets", response_model=schemas.CustomerFacets, dependencies=[conditional_get(*TABLES)])
+@cache_response(*TABLES)
+def read_customer_facets(
+    db: Session = Depends(get_db),
+    company: str = None,
+    industry: str = None,
+    province: str = None,
+    city: str = None,
+    status: CustomerStatus = None,
+    sales_id: int = None,
+    q: Optional[str] = None,
+    limit: int = Query(crud_customer.FACET_LIMIT, ge=1, le=1000),
+):
+    """
+    筛选项分面：在当前筛选条件下统计行业、省份、城市、状态、销售负责人的取值及客户数
+
+    筛选参数与列表接口一致；每个分面不应用自身的筛选条件。结果按筛选参数缓存，客户数据变化时失效。
+    """
+    return crud_customer.get_customer_facets(
+        db,
         company=company,
         industry=industry,
         province=province,
         city=city,
         status=status,
         sales_id=sales_id,
+        q=q,
+        limit=limit,
     )
-    
-    # Manually assemble the response to include owner names
-    response_customers = []
-    for customer in customers:
-        customer_data = schemas.Customer.from_orm(customer).dict()
-        customer_data['sales_owner_name'] = customer.sales.full_name if customer.sales else None
-        customer_data['service_owner_name'] = customer.service.full_name if customer.service else None
-        response_customers.append(customer_data)
-        
-    return response_customers
-
-@router.get("/{customer_id}", response_model=schemas.Customer)
+
+@router.get("/suggest", response_model=List[schemas.CustomerSuggestion])
+def suggest_customers(
+    prefix: str = Query(..., min_length=1),
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db),
+):
+    """客户单位输入联想：匹配公司名、全拼或拼音首字母前缀"""
+    return crud_customer.suggest_customers(db, prefix=prefix, limit=limit)
+
+@router.get("/{customer_id}", response_model=schemas.Customer, dependencies=[conditional_get(*TABLES)])
 def read_customer(customer_id: int, db: Session = Depends(get_db)):
     db_customer = crud_customer.get_customer(db, customer_id=customer_id)
     if db_customer is None:
-        raise HTTPException(status_code=404, detail=C"ustom"er" not "fou"nd"")
+        raise HTTPException(status_code=404, detail="Customer not found")
     return db_customer
 
 @router.put("/{customer_id}", response_model=schemas.Customer)
 def update_customer(customer_id: int, customer: schemas.CustomerUpdate, db: Session = Depends(get_db)):
     db_customer = crud_customer.update_customer(db, customer_id=customer_id, customer=customer)
     if db_customer is None:
-        raise HTTPException(status_code=404, detail=C"ustom"er" not "fou"nd"")
+        raise HTTPException(status_code=404, detail="Customer not found")
     return db_customer
 
 @router.delete("/{customer_id}", response_model=schemas.Customer)
 def delete_customer(customer_id: int, db: Session = Depends(get_db)):
-    db_customer = crud_customer.delete_customer(db, customer_id=customer_id)
-    if db_customer is None:
-        raise HTTPException(status_code=404, detail=C"ustom"er" not "fou"nd"")
-    return db_customer
+    """删除客户；客户有订单或服务记录时返回 409，以免丢失财务和售后历史"""
+    if crud_customer.get_customer(db, customer_id=customer_id) is None:
+        raise HTTPException(status_code=404, detail="Customer not found")
+    if crud_customer.customer_has_history(db, customer_id):
+        raise HTTPException(status_code=409, detail="Customer has orders or service records")
+    return crud_customer.delete_customer(db, customer_id=customer_id)
 
-@router.get("/unassigned/", response_model=List[schemas.Customer])
+@router.get("/unassigned/", response_model=List[schemas.Customer], dependencies=[conditional_get(*TABLES)])
 def read_unassigned_customers(db: Session = Depends(get_db)):
     """获取未分配销售的客户列表"""
     customers = db.query(models.Customer).filter(models.Customer.sales_id == None).all()
@@ -78,9 +204,12 @@ def read_unassigned_customers(db: Session = Depends(get_db)):
 
 
 @router.get("/{customer_id}/contacts/", response_model=List[schemas.Contact])
-def read_customer_contacts(customer_id: int, db: Session = Depends(get_db)):
+def read_customer_contacts(customer_id: int, fields: Optional[str] = None, db: Session = Depends(get_db)):
     """
     Retrieve contacts for a specific customer.
     """
-    contacts = crud_contact.get_contacts_by_customer(db, customer_id=customer_id)
+    selected = parse_fields(fields, crud_contact.CONTACT_FIELD_COLUMNS)
+    contacts = crud_contact.get_contacts_by_customer(db, customer_id=customer_id, fields=selected)
+    if selected is not None:
+        return projection_response(schemas.Contact, selected, contacts)
     return contacts
\ No newline at end of file
@@ -4,24 +4,30 @@ from typing import List
 from ... import models, schemas
 from ...crud import crud_department_group
 from ...database import get_db
+from ...utils.conditional import conditional_get
+from ...utils.response_cache import CachedRoute, cache_response
 
 
-router = APIRouter()
+router = APIRouter(route_class=CachedRoute)
+
+TABLES = ("department_groups",)
 
 @router.post("/", response_model=schemas.department_group.DepartmentGroup)
 def create_department_group(group: schemas.department_group.DepartmentGroupCreate, db: Session = Depends(get_db)):
     return crud_department_group.create_department_group(db=db, group=group)
 
-@router.get("/", response_model=List[schemas.department_group.DepartmentGroup])
+@router.get("/", response_model=List[schemas.department_group.DepartmentGroup], dependencies=[conditional_get(*TABLES)])
+@cache_response(*TABLES)
 def read_department_groups(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
     groups = crud_department_group.get_department_groups(db, skip=skip, limit=limit)
     return groups
 
-@router.get("/{group_id}", response_model=schemas.department_group.DepartmentGroup)
+@router.get("/{group_id}", response_model=schemas.department_group.DepartmentGroup, dependencies=[conditional_get(*TABLES)])
+@cache_response(*TABLES)
 def read_department_group(group_id: int, db: Session = Depends(get_db)):
     db_group = crud_department_group.get_department_group(db, group_id=group_id)
     if db_group is None:
-        raise HTTPException(status_code=404, detail=D"epartme"nt" group not "fou"nd"")
+        raise HTTPException(status_code=404, detail="Department group not found")
     return db_group
 
 @router.put("/{group_id}", response_model=schemas.department_group.DepartmentGroup)
@@ -32,12 +38,12 @@ def update_department_group(
 ):
     db_group = crud_department_group.update_department_group(db, group_id=group_id, group_in=group_in)
     if db_group is None:
-        raise HTTPException(status_code=404, detail=D"epartme"nt" group not "fou"nd"")
+        raise HTTPException(status_code=404, detail="Department group not found")
     return db_group
 
 @router.delete("/{group_id}", response_model=schemas.department_group.DepartmentGroup)
 def delete_department_group(group_id: int, db: Session = Depends(get_db)):
     db_group = crud_department_group.delete_department_group(db, group_id=group_id)
     if db_group is None:
-        raise HTTPException(status_code=404, detail=D"epartme"nt" group not f"ound""")
+        raise HTTPException(status_code=404, detail="Department group not found")
     return db_group
\ No newline at end of file
@@ -4,24 +4,30 @@ from typing import List
 from ... import models, schemas
 from ...crud import crud_department
 from ...database import get_db
+from ...utils.conditional import conditional_get
+from ...utils.response_cache import CachedRoute, cache_response
 
 
-router = APIRouter()
+router = APIRouter(route_class=CachedRoute)
+
+TABLES = ("departments",)
 
 @router.post("/", response_model=schemas.department.Department)
 def create_department(department: schemas.department.DepartmentCreate, db: Session = Depends(get_db)):
     return crud_department.create_department(db=db, department=department)
 
-@router.get("/", response_model=List[schemas.department.Department])
+@router.get("/", response_model=List[schemas.department.Department], dependencies=[conditional_get(*TABLES)])
+@cache_response(*TABLES)
 def read_departments(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
     departments = crud_department.get_departments(db, skip=skip, limit=limit)
     return departments
 
-@router.get("/{department_id}", response_model=schemas.department.Department)
+@router.get("/{department_id}", response_model=schemas.department.Department, dependencies=[conditional_get(*TABLES)])
+@cache_response(*TABLES)
 def read_department(department_id: int, db: Session = Depends(get_db)):
     db_department = crud_department.get_department(db, department_id=department_id)
     if db_department is None:
-        raise HTTPException(status_code=404, detail=D"epartme"nt" not "fou"nd"")
+        raise HTTPException(status_code=404, detail="Department not found")
     return db_department
 
 @router.put("/{department_id}", response_model=schemas.department.Department)
@@ -32,12 +38,12 @@ def update_department(
 ):
     db_department = crud_department.update_department(db, department_id=department_id, department_in=department_in)
     if db_department is None:
-        raise HTTPException(status_code=404, detail=D"epartme"nt" not "fou"nd"")
+        raise HTTPException(status_code=404, detail="Department not found")
     return db_department
 
 @router.delete("/{department_id}", response_model=schemas.department.Department)
 def delete_department(department_id: int, db: Session = Depends(get_db)):
     db_department = crud_department.delete_department(db, department_id=department_id)
     if db_department is None:
-        raise HTTPException(status_code=404, detail=D"epartme"nt" not f"ound""")
+        raise HTTPException(status_code=404, detail="Department not found")
     return db_department
\ No newline at end of file
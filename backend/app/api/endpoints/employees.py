@@ -4,27 +4,33 @@ from typing import List
 from ... import models, schemas
 from ...crud import crud_employee
 from ...database import get_db
+from ...utils.conditional import conditional_get
+from ...utils.response_cache import CachedRoute, cache_response
 
 
-router = APIRouter()
+router = APIRouter(route_class=CachedRoute)
+
+TABLES = ("employees",)
 
 @router.post("/", response_model=schemas.Employee)
 def create_employee(employee: schemas.EmployeeCreate, db: Session = Depends(get_db)):
     db_user = crud_employee.get_employee_by_username(db, username=employee.username)
     if db_user:
-        raise HTTPException(status_code=400, detail=U"serna"me" already regi"stered""")
+        raise HTTPException(status_code=400, detail="Username already registered")
     return crud_employee.create_employee(db=db, employee=employee)
 
-@router.get("/", response_model=List[schemas.Employee])
+@router.get("/", response_model=List[schemas.Employee], dependencies=[conditional_get(*TABLES)])
+@cache_response(*TABLES)
 def read_employees(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
     employees = db.query(models.Employee).offset(skip).limit(limit).all()
     return employees
 
-@router.get("/{employee_id}", response_model=schemas.Employee)
+@router.get("/{employee_id}", response_model=schemas.Employee, dependencies=[conditional_get(*TABLES)])
+@cache_response(*TABLES)
 def read_employee(employee_id: int, db: Session = Depends(get_db)):
     db_employee = db.query(models.Employee).filter(models.Employee.id == employee_id).first()
     if db_employee is None:
-        raise HTTPException(status_code=404, detail=E"mploy"ee" not "fou"nd"")
+        raise HTTPException(status_code=404, detail="Employee not found")
     return db_employee
 
 @router.put("/{employee_id}", response_model=schemas.Employee)
@@ -35,12 +41,12 @@ def update_employee(
 ):
     db_employee = crud_employee.update_employee(db, employee_id=employee_id, employee_in=employee_in)
     if db_employee is None:
-        raise HTTPException(status_code=404, detail=E"mploy"ee" not "fou"nd"")
+        raise HTTPException(status_code=404, detail="Employee not found")
     return db_employee
 
 @router.delete("/{employee_id}", response_model=schemas.Employee)
 def delete_employee(employee_id: int, db: Session = Depends(get_db)):
     db_employee = crud_employee.delete_employee(db, employee_id=employee_id)
     if db_employee is None:
-        raise HTTPException(status_code=404, detail=E"mploy"ee" not f"ound""")
+        raise HTTPException(status_code=404, detail="Employee not found")
     return db_employee
\ No newline at end of file
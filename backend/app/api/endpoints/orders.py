@@ -1,21 +1,43 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
-from typing import List, Optional
-from datetime import date
+from typing import List, Optional, Union
+from datetime import date, datetime
+from decimal import Decimal
 from ... import models, schemas
-from ...crud import crud_order
+from ...crud import crud_order, crud_order_expiry
 from ...database import get_db
+from ...utils.conditional import conditional_get
+from ...utils.response_cache import CachedRoute, cache_response
+from ...utils.pagination import check_cursor_limit, cursor_to_after_id, decode_cursor, split_page
+from ...utils.export import export_response
+from ...utils.fields import parse_fields, projection_response
 
 
-router = APIRouter()
+router = APIRouter(route_class=CachedRoute)
+
+TABLES = ("orders", "order_items")
+# 财务视图行包含的字段
+FINANCE_FIELDS = tuple(schemas.OrderFinanceRow.model_fields)
+# 列表的财务视图和汇总还依赖客户名称、销售姓名和产品信息
+JOINED_TABLES = (*TABLES, "customers", "employees", "products")
 
 @router.post("/", response_model=schemas.Order)
 def create_order(order: schemas.OrderCreate, db: Session = Depends(get_db)):
     """创建新订单"""
     return crud_order.create_order(db=db, order=order)
 
-@router.get("/", response_model=List[schemas.Order])
+@router.post("/bulk", response_model=schemas.OrderBulkResult)
+def create_orders_bulk(payload: schemas.OrderBulkCreate, db: Session = Depends(get_db)):
+    """
+    批量创建订单（单次最多 1000 单，在一个事务中写入）
+
+    未通过校验的订单（客户、销售或产品不存在等）不写入，并按其在请求中的位置返回错误，其余订单照常创建。
+    """
+    return crud_order.bulk_create_orders(db, payload.orders)
+
+@router.get("/", response_model=Union[List[schemas.Order], schemas.OrderPage], dependencies=[conditional_get(*JOINED_TABLES)])
 def read_orders(
+    response: Response,
     db: Session = Depends(get_db),
     skip: int = 0,
     limit: int = 100,
@@ -28,9 +50,32 @@ def read_orders(
     effective_date_start: Optional[date] = None,
     effective_date_end: Optional[date] = None,
     expiry_date_start: Optional[date] = None,
-    expiry_date_end: Optional[date] = None
+    expiry_date_end: Optional[date] = None,
+    amount_min: Optional[Decimal] = None,
+    amount_max: Optional[Decimal] = None,
+    sort: Optional[str] = Query(None, pattern="^-?(created_at|total_amount|outstanding_amount)$"),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    view: Optional[str] = Query(None, pattern="^finance$"),
 ):
-    """读取订单列表（支持更全面的筛选，包括日期范围）"""
+    """
+    读取订单列表（支持更全面的筛选，包括日期范围和订单总额范围）
+
+    传入 cursor 时使用游标分页（首页传空字符串），返回 {items, next_cursor}；
+    否则使用 skip/limit 分页并直接返回列表，可用 sort 排序（如 sort=-total_amount）。
+    fields 为逗号分隔的字段名（如 fields=id,order_number,status），只返回这些字段。
+    view=finance 返回财务表格使用的扁平行：附带客户名称、销售姓名，
+    订单项附带产品名称、单位、定价和提成（见 OrderFinanceRow），不能与 fields 同时使用。
+    """
+    if sort and cursor is not None:
+        raise HTTPException(status_code=400, detail="sort is not supported with cursor pagination")
+    if view and fields is not None:
+        raise HTTPException(status_code=400, detail="fields cannot be combined with view")
+    after_id = cursor_to_after_id(cursor)
+    if after_id is not None:
+        check_cursor_limit(limit)
+    selected = FINANCE_FIELDS if view == "finance" else parse_fields(fields, crud_order.ORDER_FIELDS)
+
     orders = crud_order.get_orders(
         db,
         company=company,
@@ -44,11 +89,122 @@ def read_orders(
         expiry_date_start=expiry_date_start,
         expiry_date_end=expiry_date_end,
         skip=skip,
-        limit=limit
+        limit=limit + 1 if after_id is not None else limit,
+        after_id=after_id,
+        fields=selected,
+        amount_min=amount_min,
+        amount_max=amount_max,
+        sort=sort,
+        view=view,
     )
+    if selected is not None:
+        schema = schemas.OrderFinanceRow if view == "finance" else schemas.Order
+        if after_id is not None:
+            orders, next_cursor = split_page(orders, limit, key=lambda o: (o["id"],))
+            return projection_response(schema, selected, orders, next_cursor, response=response)
+        return projection_response(schema, selected, orders, response=response)
+    if after_id is not None:
+        orders, next_cursor = split_page(orders, limit, key=lambda o: (o.id,))
+        return {"items": orders, "next_cursor": next_cursor}
     return orders
 
-@router.put("/{order_id}/financi"als"", response_model=schemas.Order)
+@router.get("/summary", response_model=schemas.OrderSummary, dependencies=[conditional_get(*JOINED_TABLES)])
+@cache_response(*JOINED_TABLES)
+def read_order_summary(
+    db: Session = Depends(get_db),
+    company: Optional[str] = None,
+    name: Optional[str] = None,
+    status: Optional[schemas.order.OrderStatus] = None,
+    sales_id: Optional[int] = None,
+    sign_date_start: Optional[date] = None,
+    sign_date_end: Optional[date] = None,
+    effective_date_start: Optional[date] = None,
+    effective_date_end: Optional[date] = None,
+    expiry_date_start: Optional[date] = None,
+    expiry_date_end: Optional[date] = None,
+    amount_min: Optional[Decimal] = None,
+    amount_max: Optional[Decimal] = None,
+):
+    """按列表接口相同的筛选条件汇总订单总额、已付/未付金额及销售、经理、总监提成"""
+    return crud_order.get_order_summary(
+        db,
+        company=company,
+        name=name,
+        status=status,
+        sales_id=sales_id,
+        sign_date_start=sign_date_start,
+        sign_date_end=sign_date_end,
+        effective_date_start=effective_date_start,
+        effective_date_end=effective_date_end,
+        expiry_date_start=expiry_date_start,
+        expiry_date_end=expiry_date_end,
+        amount_min=amount_min,
+        amount_max=amount_max,
+    )
+
+@router.get("/expiring", response_model=schemas.OrderExpiringPage)
+def read_expiring_orders(
+    db: Session = Depends(get_db),
+    window_days: Optional[int] = None,
+    sales_id: Optional[int] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+):
+    """
+    读取合同到期提醒队列（由后台扫描任务生成），按到期日排序
+
+    window_days 只返回该提醒窗口（如 7 表示到期前 7 天）的提醒；使用游标分页，
+    首页不传 cursor，之后传上一页返回的 next_cursor。已取消或已续期订单的提醒不再返回。
+    """
+    after = None
+    last_key = decode_cursor(cursor)
+    if last_key is not None:
+        try:
+            end_date, reminder_id = last_key
+            after = (datetime.fromisoformat(end_date), int(reminder_id))
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    rows = crud_order_expiry.get_expiring(db, window_days=window_days, sales_id=sales_id, after=after, limit=limit + 1)
+    items, next_cursor = split_page(rows, limit, key=lambda row: (row["end_date"], row["id"]))
+    return {"items": items, "next_cursor": next_cursor}
+
+@router.get("/export")
+def export_orders(
+    db: Session = Depends(get_db),
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    company: Optional[str] = None,
+    name: Optional[str] = None,
+    status: Optional[schemas.order.OrderStatus] = None,
+    sales_id: Optional[int] = None,
+    sign_date_start: Optional[date] = None,
+    sign_date_end: Optional[date] = None,
+    effective_date_start: Optional[date] = None,
+    effective_date_end: Optional[date] = None,
+    expiry_date_start: Optional[date] = None,
+    expiry_date_end: Optional[date] = None,
+    amount_min: Optional[Decimal] = None,
+    amount_max: Optional[Decimal] = None,
+):
+    """按列表接口相同的筛选条件流式导出订单（CSV 或 NDJSON），不分页"""
+    rows = crud_order.export_orders(
+        db,
+        company=company,
+        name=name,
+        status=status,
+        sales_id=sales_id,
+        sign_date_start=sign_date_start,
+        sign_date_end=sign_date_end,
+        effective_date_start=effective_date_start,
+        effective_date_end=effective_date_end,
+        expiry_date_start=expiry_date_start,
+        expiry_date_end=expiry_date_end,
+        amount_min=amount_min,
+        amount_max=amount_max,
+    )
+    return export_response(crud_order.ORDER_EXPORT_FIELDS, rows, format, "orders")
+
+@router.put("/{order_id}/financials", response_model=schemas.Order)
 def update_order_financials(
     order_id: int,
     financials: schemas.OrderFinancialUpdate,
@@ -59,5 +215,5 @@ def update_order_financials(
         db, order_id=order_id, financials=financials
     )
     if db_order is None:
-        raise HTTPException(status_code=404, detail=O"rd"er" not f"ound""")
+        raise HTTPException(status_code=404, detail="Order not found")
     return db_order
\ No newline at end of file
@@ -1,9 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
+from datetime import date, datetime, timedelta
 from ... import schemas
+from ...config import settings
 from ...crud import crud_sales_follow
 from ...database import get_db
+from ...utils.dates import business_today
+from ...utils.fields import parse_fields, projection_response
+from ...utils.pagination import decode_cursor, split_page
 
 
 router = APIRouter()
@@ -16,18 +21,67 @@ def create_sales_follow(
 
 @router.get("/customer/{customer_id}", response_model=List[schemas.SalesFollow])
 def read_sales_follows_by_customer(
-    customer_id: int, skip: int = 0, limit: int = 100, db: Session = Depends(get_db)
+    customer_id: int, skip: int = 0, limit: int = 100, fields: Optional[str] = None, db: Session = Depends(get_db)
 ):
+    selected = parse_fields(fields, crud_sales_follow.SALES_FOLLOW_FIELD_COLUMNS)
     follows = crud_sales_follow.get_sales_follows_by_customer(
-        db, customer_id=customer_id, skip=skip, limit=limit
+        db, customer_id=customer_id, skip=skip, limit=limit, fields=selected
     )
+    if selected is not None:
+        return projection_response(schemas.SalesFollow, selected, follows)
     return follows
 
+@router.get("/agenda", response_model=schemas.SalesFollowAgendaPage)
+def read_follow_agenda(
+    employee_id: Optional[List[int]] = Query(None),
+    department_id: Optional[int] = None,
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db),
+):
+    """
+    跟进待办：按下次跟进日期排序，每个客户只列出最近一次跟进
+
+    employee_id 可重复传入多个销售，department_id 列出整个部门（经理查看团队），至少传入其一。
+    from/to 为日期范围（含两端），from 默认为 FOLLOW_AGENDA_OVERDUE_DAYS 天前，to 默认为今天起 7 天内。
+    每项的 status 为 overdue（已逾期）、today（今天）或 upcoming（之后）。
+    使用游标分页：首页不传 cursor，之后传上一页返回的 next_cursor。
+    """
+    employee_ids = set(employee_id or [])
+    if department_id is not None:
+        employee_ids.update(crud_sales_follow.get_team_employee_ids(db, department_id))
+    if not employee_id and department_id is None:
+        raise HTTPException(status_code=400, detail="employee_id or department_id is required")
+
+    after = None
+    last_key = decode_cursor(cursor)
+    if last_key is not None:
+        try:
+            next_follow_date, follow_id = last_key
+            after = (datetime.fromisoformat(next_follow_date), int(follow_id))
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    today = business_today()
+    rows = crud_sales_follow.get_follow_agenda(
+        db,
+        sorted(employee_ids),
+        date_from=date_from or today - timedelta(days=settings.FOLLOW_AGENDA_OVERDUE_DAYS),
+        date_to=date_to or today + timedelta(days=6),
+        after=after,
+        limit=limit + 1,
+        today=today,
+    )
+    items, next_cursor = split_page(rows, limit, key=lambda row: (row["next_follow_date"], row["id"]))
+    return {"items": items, "next_cursor": next_cursor}
+
 @router.get("/{follow_id}", response_model=schemas.SalesFollow)
 def read_sales_follow(follow_id: int, db: Session = Depends(get_db)):
     db_follow = crud_sales_follow.get_sales_follow(db, follow_id=follow_id)
     if db_follow is None:
-        raise HTTPException(status_code=404, detail=S"al"es" follow not "fou"nd"")
+        raise HTTPException(status_code=404, detail="Sales follow not found")
     return db_follow
 
 @router.put("/{follow_id}", response_model=schemas.SalesFollow)
@@ -36,12 +90,12 @@ def update_sales_follow(
 ):
     db_follow = crud_sales_follow.update_sales_follow(db, follow_id=follow_id, follow_update=follow)
     if not db_follow:
-        raise HTTPException(status_code=404, detail=S"al"es" follow not "fou"nd"")
+        raise HTTPException(status_code=404, detail="Sales follow not found")
     return db_follow
 
 @router.delete("/{follow_id}", response_model=schemas.SalesFollow)
 def delete_sales_follow(follow_id: int, db: Session = Depends(get_db)):
     db_follow = crud_sales_follow.delete_sales_follow(db, follow_id=follow_id)
     if not db_follow:
-        raise HTTPException(status_code=404, detail=S"al"es" follow not f"ound""")
+        raise HTTPException(status_code=404, detail="Sales follow not found")
     return db_follow
\ No newline at end of file
@@ -1,21 +1,49 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from ...schemas import sales_view
 from ...crud import crud_sales_view
+from ...models.customer import CustomerStatus
 from ...database import get_db
+from ...utils.conditional import conditional_get
+from ...utils.response_cache import CachedRoute, cache_response
 
 
-router = APIRouter()
+router = APIRouter(route_class=CachedRoute)
 
-@router.get("/", response_model=List[sales_view.SalesView])
+# 视图聚合的表
+TABLES = ("customers", "contacts", "sales_follows", "orders", "employees")
+SORT_PATTERN = f"^-?({'|'.join(crud_sales_view.SALES_VIEW_SORT_COLUMNS)})$"
+
+@router.get("/", response_model=List[sales_view.SalesView], dependencies=[conditional_get(*TABLES)])
+@cache_response(*TABLES)
 def read_sales_view(
     skip: int = 0,
     limit: int = 100,
+    company: Optional[str] = None,
+    province: Optional[str] = None,
+    city: Optional[str] = None,
+    status: Optional[CustomerStatus] = None,
+    sales_id: Optional[int] = None,
+    intention_level: Optional[str] = None,
+    sort: Optional[str] = Query(None, pattern=SORT_PATTERN),
     db: Session = Depends(get_db)
 ):
     """
-    获取销售管理视图数据
+    获取销售管理视图数据，每个客户一行
+
+    可按客户条件和最新跟进的意向等级筛选，sort 为排序列（如 sort=-next_follow_date），默认按客户ID。
     """
-    sales_view_data = crud_sales_view.get_sales_view_data(db, skip=skip, limit=limit)
+    sales_view_data = crud_sales_view.get_sales_view_data(
+        db,
+        skip=skip,
+        limit=limit,
+        company=company,
+        province=province,
+        city=city,
+        status=status,
+        sales_id=sales_id,
+        intention_level=intention_level,
+        sort=sort,
+    )
     return sales_view_data
\ No newline at end of file
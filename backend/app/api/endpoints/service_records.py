@@ -1,9 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from ... import schemas
 from ...crud import crud_service_record
 from ...database import get_db
+from ...utils.conditional import conditional_get
+from ...utils.pagination import cursor_to_after_id, split_page
 
 
 router = APIRouter()
@@ -21,11 +23,47 @@ def read_all_service_records(
     records = crud_service_record.get_all_service_records(db, skip=skip, limit=limit)
     return records
 
+@router.get(
+    "/by-customer",
+    response_model=schemas.ServiceRecordCustomerSummaryPage,
+    dependencies=[conditional_get("service_records", "customers", "employees")],
+)
+def read_service_records_by_customer(
+    db: Session = Depends(get_db),
+    company: Optional[str] = None,
+    province: Optional[str] = None,
+    city: Optional[str] = None,
+    sales_id: Optional[int] = None,
+    service_id: Optional[int] = None,
+    status: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+):
+    """
+    售后服务页面的客户汇总：每个有服务记录的客户一行，包含联系人数、服务记录数、未结束记录数和负责人姓名
+
+    按客户ID游标分页，首页不传 cursor，之后传上一页返回的 next_cursor。
+    status 只返回有该状态服务记录的客户，service_id 为客户的客服负责人。
+    """
+    rows = crud_service_record.get_service_records_by_customer(
+        db,
+        after_id=cursor_to_after_id(cursor) or 0,
+        limit=limit + 1,
+        company=company,
+        province=province,
+        city=city,
+        sales_id=sales_id,
+        service_id=service_id,
+        status=status,
+    )
+    items, next_cursor = split_page(rows, limit, key=lambda row: (row["id"],))
+    return {"items": items, "next_cursor": next_cursor}
+
 @router.get("/{record_id}", response_model=schemas.ServiceRecord)
 def read_service_record(record_id: int, db: Session = Depends(get_db)):
     db_record = crud_service_record.get(db, id=record_id)
     if db_record is None:
-        raise HTTPException(status_code=404, detail=S"ervi"ce" record not "fou"nd"")
+        raise HTTPException(status_code=404, detail="Service record not found")
     return db_record
 
 @router.put("/{record_id}", response_model=schemas.ServiceRecord)
@@ -34,7 +72,7 @@ def update_service_record(
 ):
     db_record = crud_service_record.get(db, id=record_id)
     if not db_record:
-        raise HTTPException(status_code=404, detail=S"ervi"ce" record not "fou"nd"")
+        raise HTTPException(status_code=404, detail="Service record not found")
     db_record = crud_service_record.update(db, db_obj=db_record, obj_in=record)
     return db_record
 
@@ -42,6 +80,6 @@ def update_service_record(
 def delete_service_record(record_id: int, db: Session = Depends(get_db)):
     db_record = crud_service_record.get(db, id=record_id)
     if not db_record:
-        raise HTTPException(status_code=404, detail=S"ervi"ce" record not f"ound""")
+        raise HTTPException(status_code=404, detail="Service record not found")
     db_record = crud_service_record.remove(db, id=record_id)
     return db_record
\ No newline at end of file
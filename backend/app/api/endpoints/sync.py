@@ -0,0 +1,42 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from typing import Optional
+from ... import schemas
+from ...crud import crud_sync
+from ...database import get_db
+from ...utils.pagination import decode_cursor, encode_cursor
+
+
+router = APIRouter()
+
+
+def _since_position(since: str):
+    """解析同步令牌为变更日志位置 (xact_id, id)；只含 id 的旧令牌视为 (0, id)"""
+    values = decode_cursor(since) or [0]
+    try:
+        position = tuple(int(value) for value in values)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if len(position) == 1:
+        return (0, position[0])
+    if len(position) != 2:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return position
+
+
+@router.get("/changes", response_model=schemas.SyncChanges)
+def read_changes(
+    since: Optional[str] = None,
+    limit: int = Query(1000, ge=1, le=5000),
+    db: Session = Depends(get_db),
+):
+    """
+    增量同步：返回 since 令牌之后新增、修改、删除的客户、联系人、订单、销售跟进和服务记录
+
+    不传 since 时只返回当前令牌，客户端应先完整加载一次列表，之后用令牌轮询；
+    has_more 为 True 时说明变更超过 limit 条，应立即用返回的令牌继续拉取。
+    """
+    if since is None:
+        return {"token": encode_cursor(*crud_sync.get_latest_position(db))}
+    changes, token, has_more = crud_sync.get_changes(db, since=_since_position(since), limit=limit)
+    return {"token": encode_cursor(*token), "has_more": has_more, "changes": changes}
@@ -16,6 +16,22 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
 
+    # 响应缓存配置：配置 RESPONSE_CACHE_REDIS_URL 时多个 worker 共享 Redis 缓存，否则使用进程内 LRU
+    RESPONSE_CACHE_TTL: int = int(os.getenv("RESPONSE_CACHE_TTL", "60"))
+    RESPONSE_CACHE_MAX_BYTES: int = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+    RESPONSE_CACHE_REDIS_URL: str = os.getenv("RESPONSE_CACHE_REDIS_URL", "")
+
+    # 业务时区：按天筛选带时区的时间列（如订单签订时间 created_at）时，以该时区的零点为界
+    BUSINESS_TIMEZONE: str = os.getenv("BUSINESS_TIMEZONE", "UTC")
+
+    # 跟进待办：未传 from 时最多列出逾期多少天的待办（更早的逾期需显式传入 from）
+    FOLLOW_AGENDA_OVERDUE_DAYS: int = int(os.getenv("FOLLOW_AGENDA_OVERDUE_DAYS", "30"))
+
+    # 合同到期提醒：提醒窗口（到期前天数，逗号分隔）和进程内扫描间隔（秒）。
+    # 默认 0：不在 Web 进程内扫描，由 scripts/scan_order_expiry.py 定时执行；单 worker 部署可设为正数
+    ORDER_EXPIRY_WINDOWS: str = os.getenv("ORDER_EXPIRY_WINDOWS", "30,15,7")
+    ORDER_EXPIRY_SCAN_INTERVAL: int = int(os.getenv("ORDER_EXPIRY_SCAN_INTERVAL", "0"))
+
     class Config:
         case_sensitive = True
 
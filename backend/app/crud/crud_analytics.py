@@ -0,0 +1,157 @@
+from datetime import date
+from typing import Any, Dict, List, Optional
+from sqlalchemy import Integer, String, case, cast, func, select
+from sqlalchemy.orm import Session
+from .. import models
+from ..models.customer import CustomerStatus
+from ..models.customer_status_change import CustomerStatusChange
+from ..utils.dates import business_datetime, day_range
+
+# 漏斗推进顺序，流失客户不在其中（转为流失不算推进）
+FUNNEL_STAGES = (CustomerStatus.LEAD, CustomerStatus.CONTACTED, CustomerStatus.PROPOSAL, CustomerStatus.WON)
+
+# 统计周期 -> PostgreSQL to_char 格式，周为 ISO 周（周一开始，所属年份以周四为准）
+FUNNEL_PERIOD_FORMATS = {
+    "week": 'IYYY-"W"IW',
+    "month": "YYYY-MM",
+    "quarter": 'YYYY-"Q"Q',
+    "year": "YYYY",
+}
+
+
+def _period_key(db: Session, period: str, column, filters: List):
+    """
+    统计周期标签（如 2025-W23、2025-06、2025-Q2）
+
+    changed_at 按 UTC 保存，先换算到 BUSINESS_TIMEZONE 再取周期。SQLite 没有 ISO 周格式，
+    用所在周的周四计算 ISO 年份和周数；换算时区需要的偏移分段按筛选范围内的最早/最晚时间计算。
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return func.to_char(business_datetime(column, dialect), FUNNEL_PERIOD_FORMATS[period], type_=String)
+
+    start, end = db.execute(select(func.min(column), func.max(column)).where(*filters)).one()
+    local = business_datetime(column, dialect, start, end)
+    if period == "week":
+        thursday = func.date(local, "-3 days", "weekday 4")
+        week = (cast(func.strftime("%j", thursday), Integer) - 1) // 7 + 1
+        return func.printf("%s-W%02d", func.strftime("%Y", thursday), week, type_=String)
+    if period == "quarter":
+        month = cast(func.strftime("%m", local), Integer)
+        return func.printf("%s-Q%d", func.strftime("%Y", local), (month + 2) // 3, type_=String)
+    return func.strftime({"month": "%Y-%m", "year": "%Y"}[period], local, type_=String)
+
+
+def _stage_rank(column):
+    """状态在漏斗中的位置，流失客户为 -1"""
+    return case(*[(column == stage, rank) for rank, stage in enumerate(FUNNEL_STAGES)], else_=-1)
+
+
+def _owner_filters(column, sales_id: Optional[int], department_id: Optional[int]) -> List:
+    conditions = []
+    if sales_id is not None:
+        conditions.append(column == sales_id)
+    if department_id is not None:
+        conditions.append(column.in_(select(models.Employee.id).where(models.Employee.department_id == department_id)))
+    return conditions
+
+
+def get_funnel(
+    db: Session,
+    period: str = "month",
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    sales_id: Optional[int] = None,
+    department_id: Optional[int] = None,
+    by_owner: bool = False,
+) -> Dict[str, Any]:
+    """
+    销售漏斗统计
+
+    按状态变更历史（customer_status_changes）分组统计每个周期（by_owner 时再按销售负责人）
+    各状态的进入/离开客户数、推进到后续阶段的比例和平均停留天数，以及成交率（成交 / (成交 + 流失)）。
+    负责人为状态变更时客户的销售负责人。stages 为当前各状态的客户数（按客户当前的销售负责人筛选）。
+    """
+    change = CustomerStatusChange
+    owner = [change.sales_id] if by_owner else []
+    filters = [
+        *day_range(change.changed_at, date_from, date_to),
+        *_owner_filters(change.sales_id, sales_id, department_id),
+    ]
+    period_key = _period_key(db, period, change.changed_at, filters).label("period")
+
+    groups: Dict[tuple, Dict[str, Any]] = {}
+
+    def stage(row, status) -> Dict[str, Any]:
+        key = (row.period, row.sales_id if by_owner else None)
+        group = groups.get(key)
+        if group is None:
+            group = groups[key] = {
+                "period": key[0],
+                "sales_id": key[1],
+                "stages": {
+                    s: {"status": s, "entered": 0, "exited": 0, "advanced": 0, "conversion_rate": None, "avg_days_in_stage": None}
+                    for s in CustomerStatus
+                },
+            }
+        return group["stages"][status]
+
+    entered = db.execute(
+        select(period_key, *owner, change.to_status, func.count().label("customers"))
+        .where(*filters)
+        .group_by(period_key, *owner, change.to_status)
+    )
+    for row in entered:
+        stage(row, row.to_status)["entered"] = row.customers
+
+    exited = db.execute(
+        select(
+            period_key,
+            *owner,
+            change.from_status,
+            func.count().label("customers"),
+            func.sum(case((_stage_rank(change.to_status) > _stage_rank(change.from_status), 1), else_=0)).label("advanced"),
+            func.avg(change.stage_seconds).label("avg_seconds"),
+        )
+        .where(change.from_status.is_not(None), *filters)
+        .group_by(period_key, *owner, change.from_status)
+    )
+    for row in exited:
+        values = stage(row, row.from_status)
+        values["exited"] = row.customers
+        values["advanced"] = row.advanced
+        values["conversion_rate"] = round(row.advanced / row.customers, 4)
+        if row.avg_seconds is not None:
+            values["avg_days_in_stage"] = round(row.avg_seconds / 86400, 2)
+
+    names = {}
+    if by_owner:
+        owner_ids = {key[1] for key in groups if key[1] is not None}
+        if owner_ids:
+            names = dict(db.execute(select(models.Employee.id, models.Employee.name).where(models.Employee.id.in_(owner_ids))).all())
+
+    periods = []
+    for key in sorted(groups, key=lambda k: (k[0], k[1] is not None, k[1] or 0)):
+        group = groups[key]
+        won = group["stages"][CustomerStatus.WON]["entered"]
+        lost = group["stages"][CustomerStatus.LOST]["entered"]
+        periods.append({
+            "period": group["period"],
+            "sales_id": group["sales_id"],
+            "sales_name": names.get(group["sales_id"]),
+            "stages": list(group["stages"].values()),
+            "won": won,
+            "lost": lost,
+            "conversion_rate": round(won / (won + lost), 4) if won + lost else None,
+        })
+
+    current = dict(db.execute(
+        select(models.Customer.status, func.count())
+        .where(*_owner_filters(models.Customer.sales_id, sales_id, department_id))
+        .group_by(models.Customer.status)
+    ).all())
+    return {
+        "period": period,
+        "stages": [{"status": status, "customers": current.get(status, 0)} for status in CustomerStatus],
+        "periods": periods,
+    }
@@ -0,0 +1,62 @@
+from typing import List, Tuple
+from sqlalchemy import func, select, text, tuple_
+from sqlalchemy.orm import Session
+from .. import models
+
+# 变更日志中的读取位置 (xact_id, id)，(0, 0) 表示起点
+ChangeLogPosition = Tuple[int, int]
+
+_POSITION = tuple_(models.ChangeLog.xact_id, models.ChangeLog.id)
+
+
+def _commits_in_id_order(db: Session) -> bool:
+    """SQLite 写入串行提交，xact_id 恒为 0，按主键 id 即可排序和划分区间"""
+    return db.get_bind().dialect.name != "postgresql"
+
+
+def committed_conditions(db: Session) -> List:
+    """
+    只保留写入事务已经结束的变更
+
+    PostgreSQL 上 id 在插入时分配，并发事务可能乱序提交：事务 A 取得 id=10 后尚未提交，
+    事务 B 取得 id=11 并已提交，此时若按 id 推进位置到 11，A 提交后它的 10 就会被跳过。
+    快照的 xmin 是仍在进行的最早事务号，xact_id 小于它的事务都已提交或回滚；之后才提交的事务
+    事务号不小于当前 xmin，按 (xact_id, id) 排序时必然落在已返回位置之后。
+    上例中 B 的变更要等 A 结束、xmin 越过 B 的事务号后才返回（若 B 的事务号更小则先返回 B，
+    A 的变更排在其后），两种情况都不会跳过。
+    """
+    if _commits_in_id_order(db):
+        return []
+    xmin = db.scalar(text("SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint"))
+    return [models.ChangeLog.xact_id < xmin]
+
+
+def after(db: Session, since: ChangeLogPosition):
+    """位置 since 之后的变更"""
+    if _commits_in_id_order(db):
+        return models.ChangeLog.id > since[1]
+    return _POSITION > tuple_(*since)
+
+
+def up_to(db: Session, until: ChangeLogPosition):
+    """位置 until 及之前的变更"""
+    if _commits_in_id_order(db):
+        return models.ChangeLog.id <= until[1]
+    return _POSITION <= tuple_(*until)
+
+
+def order_by_position(db: Session):
+    """按读取位置排序的列"""
+    if _commits_in_id_order(db):
+        return (models.ChangeLog.id,)
+    return models.ChangeLog.xact_id, models.ChangeLog.id
+
+
+def get_position(db: Session) -> ChangeLogPosition:
+    """当前可以安全推进到的最新位置（主键或 (xact_id, id) 索引上的 max，只读取索引的一端）"""
+    if _commits_in_id_order(db):
+        return (0, db.scalar(select(func.max(models.ChangeLog.id))) or 0)
+    xact_id = select(func.max(models.ChangeLog.xact_id)).where(*committed_conditions(db)).scalar_subquery()
+    change_id = select(func.max(models.ChangeLog.id)).where(models.ChangeLog.xact_id == xact_id).scalar_subquery()
+    row = db.execute(select(xact_id.label("xact_id"), change_id.label("id"))).one()
+    return (row.xact_id, row.id) if row.id is not None else (0, 0)
@@ -1,11 +1,25 @@
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Tuple
 from .. import models
 from ..schemas import contact as contact_schema
+from ..utils.fields import select_fields
 
-def get_contacts_by_customer(db: Session, customer_id: int, skip: int = 0, limit: int = 100) -> List[models.Contact]:
-    """获取指定客户的联系人列表"""
-    return db.query(models.Contact).filter(models.Contact.customer_id == customer_id).offset(skip).limit(limit).all()
+# 稀疏字段（fields=）可选的列
+CONTACT_FIELD_COLUMNS = {
+    "id": models.Contact.id,
+    "customer_id": models.Contact.customer_id,
+    "name": models.Contact.name,
+    "phone": models.Contact.phone,
+    "email": models.Contact.email,
+    "notes": models.Contact.notes,
+}
+
+def get_contacts_by_customer(db: Session, customer_id: int, skip: int = 0, limit: int = 100, fields: Tuple[str, ...] = None):
+    """获取指定客户的联系人列表，传入 fields 时只查询这些列并返回字典列表"""
+    if fields is None:
+        return db.query(models.Contact).filter(models.Contact.customer_id == customer_id).offset(skip).limit(limit).all()
+    query = select_fields(CONTACT_FIELD_COLUMNS, fields).where(models.Contact.customer_id == customer_id)
+    return [dict(row) for row in db.execute(query.offset(skip).limit(limit)).mappings()]
 
 def create_customer_contact(db: Session, contact: contact_schema.ContactCreate, customer_id: int) -> models.Contact:
     """为客户创建新联系人"""
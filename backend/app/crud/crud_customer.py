@@ -1,6 +1,115 @@
-from sqlalchemy.orm import Session
+import csv
+import json
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Tuple
+from pydantic import ValidationError
+from sqlalchemy import and_, column, exists, func, insert, literal_column, or_, select, table, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session, aliased, joinedload, selectinload
 from .. import models
+from ..models.customer import CUSTOMER_FTS_COLUMNS
+from ..models.customer_counters import find_counter_drift, recalculate_customer_counters
+from ..models.customer_status_change import CustomerStatusChange
+from ..models.table_version import bump_table_versions
 from ..schemas import customer as customer_schema
+from ..utils.fields import select_fields
+from ..utils.suggest_index import customer_suggest_index
+from . import crud_change_log
+from .crud_contact import CONTACT_FIELD_COLUMNS
+
+customers_fts = table("customers_fts", column("rowid"))
+
+# trigram 分词器只能匹配不少于三个字符的词，更短的词回退为 LIKE
+FTS_MIN_TERM_LENGTH = 3
+
+# 流式导出时每次从数据库游标读取的行数
+EXPORT_BATCH_SIZE = 1000
+
+# 批量导入时每个事务写入的行数
+IMPORT_BATCH_SIZE = 1000
+
+# 批量分配负责人时每条 UPDATE 语句携带的客户ID数量（低于 SQLite 的绑定参数上限）
+ASSIGN_CHUNK_SIZE = 500
+
+# 导入结果中最多返回的错误行数，避免错误报告本身占用大量内存
+MAX_REPORTED_IMPORT_ERRORS = 1000
+
+# 计数对账时每批检查的客户数
+COUNTER_REPAIR_BATCH_SIZE = 5000
+
+# 对账报告中最多列出的不一致客户数
+MAX_REPORTED_COUNTER_DRIFT = 100
+
+# 联想索引一次追赶的最大变更数（按变更日志ID计），积压更多时（如其他进程批量导入后）整体重新加载
+SUGGEST_CATCH_UP_LIMIT = 5000
+
+# 每个分面最多返回的取值数（按客户数降序）
+FACET_LIMIT = 200
+
+# 稀疏字段（fields=）可选的列；contacts 为关联数据，请求时单独查询
+_sales = aliased(models.Employee, name="sales")
+_service = aliased(models.Employee, name="service")
+CUSTOMER_FIELD_COLUMNS = {
+    "id": models.Customer.id,
+    "company": models.Customer.company,
+    "industry": models.Customer.industry,
+    "province": models.Customer.province,
+    "city": models.Customer.city,
+    "address": models.Customer.address,
+    "website": models.Customer.website,
+    "scale": models.Customer.scale,
+    "status": models.Customer.status,
+    "sales_id": models.Customer.sales_id,
+    "service_id": models.Customer.service_id,
+    "sales_name": _sales.name,
+    "service_name": _service.name,
+    "contact_count": models.Customer.contact_count,
+    "follow_count": models.Customer.follow_count,
+    "order_count": models.Customer.order_count,
+    "service_record_count": models.Customer.service_record_count,
+    "last_follow_at": models.Customer.last_follow_at,
+    "next_follow_at": models.Customer.next_follow_at,
+    "latest_intention_level": models.Customer.latest_intention_level,
+}
+CUSTOMER_FIELDS = (*CUSTOMER_FIELD_COLUMNS, "contacts")
+
+# bm25 列权重，顺序与 CUSTOMER_FTS_COLUMNS 一致：公司名命中最重要
+FTS_COLUMN_WEIGHTS = (10.0, 4.0, 2.0, 1.0)
+
+def _fts_phrase(term: str) -> str:
+    """将用户输入转义为 FTS5 短语，避免被解析为查询语法"""
+    return '"' + term.replace('"', '""') + '"'
+
+def apply_customer_search(db: Session, query, text: str, columns=CUSTOMER_FTS_COLUMNS, ranked: bool = False):
+    """
+    为查询追加客户全文检索条件
+
+    SQLite 下长度不少于三个字符的词走 customers_fts 索引（可限定列），
+    更短的词及其他数据库回退为 LIKE 子串匹配。ranked 为 True 时联接检索表并按 bm25 相关度排序，
+    同一查询中只应有一次 ranked 调用。
+    """
+    terms = text.split()
+    use_fts = db.get_bind().dialect.name == "sqlite"
+    fts_terms = [t for t in terms if use_fts and len(t) >= FTS_MIN_TERM_LENGTH]
+    like_terms = [t for t in terms if t not in fts_terms]
+
+    if fts_terms:
+        match = "{%s} : (%s)" % (" ".join(columns), " AND ".join(_fts_phrase(t) for t in fts_terms))
+        fts_match = literal_column("customers_fts").op("MATCH")(match)
+        if ranked:
+            rank = func.bm25(literal_column("customers_fts"), *FTS_COLUMN_WEIGHTS)
+            query = query.join(customers_fts, customers_fts.c.rowid == models.Customer.id)
+            query = query.filter(fts_match).order_by(rank, models.Customer.id)
+        else:
+            query = query.filter(models.Customer.id.in_(select(customers_fts.c.rowid).where(fts_match)))
+
+    if like_terms:
+        query = query.filter(and_(*[
+            or_(*[getattr(models.Customer, name).contains(term) for name in columns])
+            for term in like_terms
+        ]))
+    return query
 
 def get_customer(db: Session, customer_id: int):
     """通过ID获取客户"""
@@ -16,14 +125,77 @@ def get_customers(
     city: str = None,
     status: str = None,
     sales_id: int = None,
+    after_id: int = None,
+    q: str = None,
+    fields: Tuple[str, ...] = None,
 ):
-    """获取客户列表并根据条件过滤"""
-    query = db.query(models.Customer)
+    """
+    获取客户列表并根据条件过滤
+
+    after_id 不为 None 时使用游标分页：按 id 升序返回 id 大于 after_id 的记录，
+    直接走主键索引，翻页深度不影响查询耗时；否则保持原有的 offset 分页。
 
+    销售/客服负责人随主查询 JOIN 加载，联系人通过一次 IN 查询批量加载，
+    无论分页大小，序列化整页数据都只需要固定的两条 SQL。
+
+    q 为跨公司名、行业、地址、备注的全文检索关键词，offset 分页时按相关度排序。
+
+    fields 不为 None 时只 SELECT 这些字段对应的列并返回字典列表（稀疏字段）：
+    负责人姓名仅在请求时 JOIN，联系人仅在请求时用一次 IN 查询加载。
+    """
+    if fields is None:
+        query = db.query(models.Customer).options(
+            joinedload(models.Customer.sales),
+            joinedload(models.Customer.service),
+            selectinload(models.Customer.contacts),
+        )
+    else:
+        query = select_customer_fields(fields)
+
+    if q:
+        query = apply_customer_search(db, query, q, ranked=after_id is None)
+    query = filter_customers(db, query, company, industry, province, city, status, sales_id)
+
+    if after_id is not None:
+        query = query.filter(models.Customer.id > after_id).order_by(models.Customer.id).limit(limit)
+    else:
+        query = query.offset(skip).limit(limit)
+    if fields is None:
+        return query.all()
+
+    rows = [dict(row) for row in db.execute(query).mappings()]
+    if "contacts" in fields:
+        _attach_contacts(db, rows)
+    return rows
+
+def select_customer_fields(fields: Tuple[str, ...]):
+    """生成客户稀疏字段的 select()，负责人姓名仅在请求时 LEFT JOIN"""
+    query = select_fields(CUSTOMER_FIELD_COLUMNS, fields).select_from(models.Customer)
+    if "sales_name" in fields:
+        query = query.outerjoin(_sales, models.Customer.sales_id == _sales.id)
+    if "service_name" in fields:
+        query = query.outerjoin(_service, models.Customer.service_id == _service.id)
+    return query
+
+def _attach_contacts(db: Session, rows: List[Dict[str, Any]]):
+    """为稀疏字段结果批量加载联系人"""
+    by_customer = {row["id"]: row.setdefault("contacts", []) for row in rows}
+    if not by_customer:
+        return
+    contacts = db.execute(
+        select_fields(CONTACT_FIELD_COLUMNS, CONTACT_FIELD_COLUMNS)
+        .where(models.Contact.customer_id.in_(by_customer))
+        .order_by(models.Contact.id)
+    ).mappings()
+    for contact in contacts:
+        by_customer[contact["customer_id"]].append(dict(contact))
+
+def filter_customers(db: Session, query, company, industry, province, city, status, sales_id):
+    """追加客户筛选条件（客户列表、导出、销售视图和服务记录汇总共用，query 须以 Customer 为主表）"""
     if company:
-        query = query.filter(models.Customer.company.contains(company))
+        query = apply_customer_search(db, query, company, columns=("company",))
     if industry:
-        query = query.filter(models.Customer.industry.contains(industry))
+        query = apply_customer_search(db, query, industry, columns=("industry",))
     if province:
         query = query.filter(models.Customer.province == province)
     if city:
@@ -32,8 +204,130 @@ def get_customers(
         query = query.filter(models.Customer.status == status)
     if sales_id:
         query = query.filter(models.Customer.sales_id == sales_id)
+    return query
+
+# 分面名称 -> (取值列, 显示名列)；显示名为空时直接显示取值
+CUSTOMER_FACETS = {
+    "industry": (models.Customer.industry, None),
+    "province": (models.Customer.province, None),
+    "city": (models.Customer.city, None),
+    "status": (models.Customer.status, None),
+    "sales": (models.Customer.sales_id, _sales.name),
+}
+
+def get_customer_facets(
+    db: Session,
+    company: str = None,
+    industry: str = None,
+    province: str = None,
+    city: str = None,
+    status: str = None,
+    sales_id: int = None,
+    q: str = None,
+    limit: int = FACET_LIMIT,
+):
+    """
+    统计各筛选项的取值及客户数
+
+    每个分面用一条 GROUP BY 查询计算，应用除自身以外的全部筛选条件，
+    这样已选中某个省份时，省份下拉框仍能列出其他省份及其客户数。空值不计入分面。
+    """
+    filters = {
+        "industry": industry, "province": province, "city": city, "status": status, "sales": sales_id,
+    }
+    facets = {}
+    for name, (value_column, label_column) in CUSTOMER_FACETS.items():
+        group_columns = [value_column] if label_column is None else [value_column, label_column]
+        count = func.count(models.Customer.id).label("count")
+        query = select(value_column.label("value"), *[c.label("label") for c in group_columns[1:]], count)
+        query = query.select_from(models.Customer)
+        if label_column is not None:
+            query = query.outerjoin(_sales, models.Customer.sales_id == _sales.id)
+        if q:
+            query = apply_customer_search(db, query, q)
+        own = {key: (None if key == name else value) for key, value in filters.items()}
+        query = filter_customers(
+            db, query, company, own["industry"], own["province"], own["city"], own["status"], own["sales"]
+        )
+        query = (
+            query.where(value_column.is_not(None))
+            .group_by(*group_columns)
+            .order_by(count.desc(), value_column)
+            .limit(limit)
+        )
+        facets[name] = [dict(row) for row in db.execute(query).mappings()]
+    return facets
+
+# 导出文件的列，与 export_customers 返回的元组顺序一致
+CUSTOMER_EXPORT_FIELDS = (
+    "id", "company", "industry", "province", "city", "address", "website", "scale",
+    "status", "sales_name", "service_name", "notes", "created_at",
+)
+
+def export_customers(
+    db: Session,
+    company: str = None,
+    industry: str = None,
+    province: str = None,
+    city: str = None,
+    status: str = None,
+    sales_id: int = None,
+    q: str = None,
+    batch_size: int = EXPORT_BATCH_SIZE,
+):
+    """
+    按列表接口相同的条件导出客户，返回惰性迭代的行元组
+
+    只查询导出需要的列（负责人姓名通过 LEFT JOIN 取得），并用 yield_per 从数据库游标
+    分批读取，内存占用与导出总行数无关。结果按 id 排序。
+    """
+    sales = aliased(models.Employee)
+    service = aliased(models.Employee)
+    query = (
+        db.query(
+            models.Customer.id,
+            models.Customer.company,
+            models.Customer.industry,
+            models.Customer.province,
+            models.Customer.city,
+            models.Customer.address,
+            models.Customer.website,
+            models.Customer.scale,
+            models.Customer.status,
+            sales.name,
+            service.name,
+            models.Customer.notes,
+            models.Customer.created_at,
+        )
+        .select_from(models.Customer)
+        .outerjoin(sales, models.Customer.sales_id == sales.id)
+        .outerjoin(service, models.Customer.service_id == service.id)
+    )
+    if q:
+        query = apply_customer_search(db, query, q)
+    query = filter_customers(db, query, company, industry, province, city, status, sales_id)
+    return query.order_by(models.Customer.id).yield_per(batch_size)
+
+def _record_status_change(db: Session, db_customer: models.Customer, from_status=None):
+    """
+    在当前事务中记录客户进入当前状态（from_status 为空表示新建客户）
 
-    return query.offset(skip).limit(limit).all()
+    客户在原状态停留的时长从上一次状态变更（没有时为客户创建时间）算起。
+    """
+    now = datetime.now(timezone.utc)
+    stage_seconds = None
+    if from_status is not None:
+        entered_at = db.scalar(
+            select(func.max(CustomerStatusChange.changed_at)).where(CustomerStatusChange.customer_id == db_customer.id)
+        ) or db_customer.created_at
+        if entered_at is not None:
+            if entered_at.tzinfo is None:
+                entered_at = entered_at.replace(tzinfo=timezone.utc)
+            stage_seconds = max(int((now - entered_at).total_seconds()), 0)
+    db.add(CustomerStatusChange(
+        customer=db_customer, from_status=from_status, to_status=db_customer.status,
+        sales_id=db_customer.sales_id, stage_seconds=stage_seconds, changed_at=now,
+    ))
 
 def create_customer(db: Session, customer: customer_schema.CustomerCreate):
     """创建新客户（包括联系人）"""
@@ -46,25 +340,241 @@ def create_customer(db: Session, customer: customer_schema.CustomerCreate):
         db_customer.contacts.append(db_contact)
         
     db.add(db_customer)
+    _record_status_change(db, db_customer)
     db.commit()
     db.refresh(db_customer)
+    customer_suggest_index.upsert(db_customer.id, db_customer.company)
     return db_customer
 
 def update_customer(db: Session, customer_id: int, customer: customer_schema.CustomerUpdate):
-    """更新客户信息"""
+    """更新客户信息，状态改变时在同一事务中写入状态变更历史"""
     db_customer = get_customer(db, customer_id)
     if db_customer:
+        previous_status = db_customer.status
         update_data = customer.model_dump(exclude_unset=True)
         for key, value in update_data.items():
             setattr(db_customer, key, value)
+        if db_customer.status != previous_status:
+            _record_status_change(db, db_customer, previous_status)
         db.commit()
         db.refresh(db_customer)
+        customer_suggest_index.upsert(db_customer.id, db_customer.company)
     return db_customer
 
+def customer_has_history(db: Session, customer_id: int) -> bool:
+    """客户是否有订单或服务记录（有则不能删除）"""
+    return db.scalar(select(
+        exists().where(models.Order.customer_id == customer_id)
+        | exists().where(models.ServiceRecord.customer_id == customer_id)
+    ))
+
 def delete_customer(db: Session, customer_id: int):
-    """删除客户"""
+    """删除客户（联系人、跟进记录随之删除；调用方需先用 customer_has_history 确认没有订单和服务记录）"""
     db_customer = get_customer(db, customer_id)
     if db_customer:
         db.delete(db_customer)
         db.commit()
-    return db_customer
\ No newline at end of file
+        customer_suggest_index.remove(customer_id)
+    return db_customer
+
+def _refresh_suggest_index(db: Session) -> None:
+    """
+    让本进程的联想索引追上数据库
+
+    先读取变更日志的最新位置（索引上的 max，没有新变更时只有这一次查询）；有新变更时按位置区间读取
+    索引位置之后的变更（不按表名筛选，否则会改走 (table_name, row_id) 索引读取全部客户变更），
+    对其中的客户按ID重新读取公司名或移除已删除的客户。尚未加载或积压的变更过多（按 id 差值估计）时整体加载。
+    """
+    index = customer_suggest_index
+    latest = crud_change_log.get_position(db)
+    if index.loaded and latest[1] - index.change_id[1] <= SUGGEST_CATCH_UP_LIMIT:
+        if latest <= index.change_id:
+            return
+        entries = db.execute(
+            select(models.ChangeLog.table_name, models.ChangeLog.row_id, models.ChangeLog.operation)
+            .where(crud_change_log.after(db, index.change_id), crud_change_log.up_to(db, latest))
+        ).all()
+        entries = [entry for entry in entries if entry.table_name == models.Customer.__tablename__]
+        removed = [entry.row_id for entry in entries if entry.operation == "D"]
+        changed = [entry.row_id for entry in entries if entry.operation != "D"]
+        rows = []
+        for offset in range(0, len(changed), ASSIGN_CHUNK_SIZE):
+            chunk = changed[offset:offset + ASSIGN_CHUNK_SIZE]
+            rows.extend(db.execute(select(models.Customer.id, models.Customer.company).where(models.Customer.id.in_(chunk))).all())
+        index.catch_up(rows, removed, latest)
+        return
+    index.load(db.query(models.Customer.id, models.Customer.company).yield_per(5000), change_id=latest)
+
+def suggest_customers(db: Session, prefix: str, limit: int = 10):
+    """按公司名或拼音前缀联想客户单位，索引在首次调用时从数据库加载，之后每次查询前追赶变更日志"""
+    _refresh_suggest_index(db)
+    return [
+        {"id": customer_id, "company": company}
+        for customer_id, company in customer_suggest_index.suggest(prefix, limit)
+    ]
+
+def _reserve_customer_ids(db: Session, count: int) -> List[int]:
+    """
+    为一批新客户预先分配ID
+
+    PostgreSQL 从 id 列的序列中一次取号；SQLite 同一时间只有一个写事务，先递增客户表的版本号取得写锁，
+    再从当前最大ID之后顺延，提交前其他连接无法插入客户。
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        sequence = func.pg_get_serial_sequence(models.Customer.__tablename__, "id")
+        return db.scalars(select(func.nextval(sequence)).select_from(func.generate_series(1, count))).all()
+    bump_table_versions(db, [models.Customer.__tablename__])
+    start = (db.scalar(select(func.max(models.Customer.id))) or 0) + 1
+    return list(range(start, start + count))
+
+def _insert_customer_batch(db: Session, batch: List[Tuple[int, customer_schema.CustomerCreate]]):
+    """
+    用 executemany 语句写入一批客户、联系人及客户的初始状态记录
+
+    客户ID预先分配后随行写入，不使用 RETURNING（SQLite 保证 RETURNING 顺序时会退化为逐行 INSERT）。
+    """
+    customer_ids = _reserve_customer_ids(db, len(batch))
+    # 新客户只有随行导入的联系人，计数直接写入，无需再按关联表重新计算
+    db.execute(insert(models.Customer), [
+        dict(customer.model_dump(exclude={'contacts'}), id=customer_id, contact_count=len(customer.contacts))
+        for customer_id, (_, customer) in zip(customer_ids, batch)
+    ])
+    contact_rows = [
+        dict(contact.model_dump(), customer_id=customer_id)
+        for customer_id, (_, customer) in zip(customer_ids, batch)
+        for contact in customer.contacts
+    ]
+    if contact_rows:
+        db.execute(insert(models.Contact), contact_rows)
+    db.execute(insert(CustomerStatusChange), [
+        {"customer_id": customer_id, "to_status": customer.status}
+        for customer_id, (_, customer) in zip(customer_ids, batch)
+    ])
+
+def bulk_import_customers(db: Session, rows: Iterable[Dict[str, Any]], batch_size: int = IMPORT_BATCH_SIZE):
+    """
+    批量导入客户（包括联系人）
+
+    rows 为逐行产生的数据（通常来自流式读取的上传文件），每行先用 CustomerCreate 校验，
+    校验通过的行按 batch_size 分块写入，每块一个事务。某块写入失败时回滚该块并逐行重试，
+    以定位出错的行。内存占用只与 batch_size 有关，与文件大小无关。
+    """
+    started = time.perf_counter()
+    result = {"total_rows": 0, "imported": 0, "failed": 0, "errors": [], "errors_truncated": False, "aborted": None}
+
+    def report(row_number: int, messages: List[str]):
+        result["failed"] += 1
+        if len(result["errors"]) < MAX_REPORTED_IMPORT_ERRORS:
+            result["errors"].append({"row": row_number, "errors": messages})
+        else:
+            result["errors_truncated"] = True
+
+    def flush(batch):
+        try:
+            _insert_customer_batch(db, batch)
+            db.commit()
+            result["imported"] += len(batch)
+            return
+        except SQLAlchemyError:
+            db.rollback()
+        for row_number, customer in batch:
+            try:
+                _insert_customer_batch(db, [(row_number, customer)])
+                db.commit()
+                result["imported"] += 1
+            except SQLAlchemyError as e:
+                db.rollback()
+                report(row_number, [str(getattr(e, "orig", e))])
+
+    batch = []
+    row_number = 1  # 第 1 行为表头
+    try:
+        for row_number, values in enumerate(rows, start=2):
+            result["total_rows"] += 1
+            try:
+                customer = customer_schema.CustomerCreate.model_validate(values)
+            except ValidationError as e:
+                report(row_number, [
+                    f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()
+                ])
+                continue
+            batch.append((row_number, customer))
+            if len(batch) >= batch_size:
+                flush(batch)
+                batch = []
+    except (ValueError, csv.Error) as e:
+        # 文件在读取过程中损坏或编码错误：已写入的块保留，停止继续导入
+        result["aborted"] = f"Row {row_number + 1}: {e}"
+    if batch:
+        flush(batch)
+
+    if result["imported"]:
+        customer_suggest_index.invalidate()
+
+    elapsed = time.perf_counter() - started
+    result["elapsed_seconds"] = round(elapsed, 3)
+    result["rows_per_second"] = round(result["imported"] / elapsed, 1) if elapsed > 0 else 0.0
+    return result
+
+def bulk_assign_customers(db: Session, customer_ids: Iterable[int], field: str, employee_id: int = None):
+    """
+    批量设置客户的销售（field="sales_id"）或客服（field="service_id"）负责人
+
+    按 ASSIGN_CHUNK_SIZE 分块执行 UPDATE ... WHERE id IN (...)，不加载客户对象，
+    整批在同一个事务中完成，并且只写一条审计日志。employee_id 为 None 表示取消分配。
+    返回实际更新的客户数（不存在的ID不计入）。
+    """
+    ids = sorted(set(customer_ids))
+    if not ids:
+        return 0
+    target = getattr(models.Customer, field)
+    updated = 0
+    for start in range(0, len(ids), ASSIGN_CHUNK_SIZE):
+        chunk = ids[start:start + ASSIGN_CHUNK_SIZE]
+        updated += db.execute(
+            update(models.Customer)
+            .where(models.Customer.id.in_(chunk))
+            .values({target: employee_id})
+            .execution_options(synchronize_session=False)
+        ).rowcount
+    db.add(models.AuditLog(
+        action=f"bulk_assign_{field}",
+        details=json.dumps({field: employee_id, "customer_ids": ids, "updated": updated}),
+    ))
+    db.commit()
+    return updated
+
+def repair_customer_counters(db: Session, dry_run: bool = False, batch_size: int = COUNTER_REPAIR_BATCH_SIZE) -> Dict[str, Any]:
+    """
+    按关联表重新核对全部客户的计数与最新跟进摘要，修正不一致的客户
+
+    按客户ID分批检查，每批一个事务，只重写不一致的客户。dry_run 为 True 时只报告不修改。
+    返回检查的客户数、不一致的客户数、各列不一致次数以及部分不一致明细。
+    """
+    result = {"checked": 0, "drifted": 0, "repaired": 0, "columns": {}, "samples": []}
+    last_id = 0
+    while True:
+        ids = db.scalars(
+            select(models.Customer.id).where(models.Customer.id > last_id).order_by(models.Customer.id).limit(batch_size)
+        ).all()
+        if not ids:
+            break
+        last_id = ids[-1]
+        drift = find_counter_drift(db, ids)
+        result["checked"] += len(ids)
+        result["drifted"] += len(drift)
+        for customer_id, columns in drift.items():
+            for name in columns:
+                result["columns"][name] = result["columns"].get(name, 0) + 1
+            if len(result["samples"]) < MAX_REPORTED_COUNTER_DRIFT:
+                result["samples"].append({
+                    "customer_id": customer_id,
+                    "columns": {name: {"stored": stored, "expected": expected} for name, (stored, expected) in columns.items()},
+                })
+        if drift and not dry_run:
+            recalculate_customer_counters(db, drift)
+            db.commit()
+            result["repaired"] += len(drift)
+        else:
+            db.rollback()
+    return result
\ No newline at end of file
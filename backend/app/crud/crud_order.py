@@ -1,10 +1,79 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import exists, func, insert, select
+from sqlalchemy.orm import Session, aliased
 from fastapi import HTTPException
+from typing import Any, Dict, List, Tuple
 from .. import models
+from ..models.customer_counters import recalculate_customer_counters
+from ..models.order import recalculate_order_totals
 from ..schemas import order as order_schema
+from ..utils.dates import day_range
+from ..utils.fields import select_fields
+from .crud_customer import apply_customer_search
 import uuid
 from decimal import Decimal
 
+# 流式导出时每次从数据库游标读取的行数
+EXPORT_BATCH_SIZE = 1000
+
+# 稀疏字段（fields=）可选的列；order_items 为关联数据，请求时单独查询
+ORDER_FIELD_COLUMNS = {
+    "id": models.Order.id,
+    "order_number": models.Order.order_number,
+    "customer_id": models.Order.customer_id,
+    "sales_id": models.Order.sales_id,
+    "status": models.Order.status,
+    "paid_amount": models.Order.paid_amount,
+    "payment_date": models.Order.payment_date,
+    "total_amount": models.Order.total_amount,
+    "outstanding_amount": models.Order.outstanding_amount,
+}
+ORDER_FIELDS = (*ORDER_FIELD_COLUMNS, "order_items")
+
+# 列表接口可用的排序字段（前缀 - 表示降序），均有对应索引
+ORDER_SORT_COLUMNS = {
+    "created_at": models.Order.created_at,
+    "total_amount": models.Order.total_amount,
+    "outstanding_amount": models.Order.outstanding_amount,
+}
+
+ORDER_ITEM_FIELD_COLUMNS = {
+    "id": models.OrderItem.id,
+    "order_id": models.OrderItem.order_id,
+    "product_id": models.OrderItem.product_id,
+    "quantity": models.OrderItem.quantity,
+    "unit_price": models.OrderItem.unit_price,
+}
+
+# 财务视图（view=finance）的扁平行：客户名称和销售姓名随订单一次 JOIN 取得
+_finance_sales = aliased(models.Employee, name="finance_sales")
+ORDER_FINANCE_COLUMNS = {
+    "id": models.Order.id,
+    "order_number": models.Order.order_number,
+    "customer_id": models.Order.customer_id,
+    "company": models.Customer.company,
+    "sales_id": models.Order.sales_id,
+    "sales_name": _finance_sales.name,
+    "status": models.Order.status,
+    "total_amount": models.Order.total_amount,
+    "paid_amount": models.Order.paid_amount,
+    "outstanding_amount": models.Order.outstanding_amount,
+    "payment_date": models.Order.payment_date,
+    "start_date": models.Order.start_date,
+    "end_date": models.Order.end_date,
+    "created_at": models.Order.created_at,
+}
+
+# 财务视图的订单项：产品名称、单位、定价和单位提成随订单项一次 JOIN 取得
+ORDER_FINANCE_ITEM_COLUMNS = {
+    **ORDER_ITEM_FIELD_COLUMNS,
+    "product_name": models.Product.name,
+    "unit": models.Product.unit,
+    "base_price": models.Product.base_price,
+    "sales_commission": models.Product.sales_commission,
+    "manager_commission": models.Product.manager_commission,
+    "director_commission": models.Product.director_commission,
+}
+
 def get_order(db: Session, order_id: int):
     """获取单个订单"""
     return db.query(models.Order).filter(models.Order.id == order_id).first()
@@ -22,31 +91,96 @@ def get_orders(
     expiry_date_start: order_schema.datetime = None,
     expiry_date_end: order_schema.datetime = None,
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    after_id: int = None,
+    fields: Tuple[str, ...] = None,
+    amount_min: Decimal = None,
+    amount_max: Decimal = None,
+    sort: str = None,
+    view: str = None,
 ):
-    """获取订单列表（支持更全面的筛选，包括日期范围）"""
-    query = db.query(models.Order).join(models.Customer)
+    """
+    获取订单列表（支持更全面的筛选，包括日期范围和订单总额范围）
 
-    if company:
-        query = query.filter(models.Customer.company.ilike("f"%{company}%"))
+    after_id 不为 None 时使用游标分页（按 id 升序），否则使用 offset 分页，
+    此时可用 sort 按 ORDER_SORT_COLUMNS 中的字段排序（如 -total_amount）。
+    fields 不为 None 时只查询这些字段对应的列并返回字典列表（稀疏字段），
+    订单项仅在请求时用一次 IN 查询加载。
+    view="finance" 时返回财务视图的扁平字典行（见 ORDER_FINANCE_COLUMNS），
+    订单与客户、销售一次 JOIN 查询，订单项连同产品信息再用一次 IN 查询加载。
+    """
+    if view == "finance":
+        query = (
+            select_fields(ORDER_FINANCE_COLUMNS, ORDER_FINANCE_COLUMNS)
+            .select_from(models.Order)
+            .join(models.Customer)
+            .outerjoin(_finance_sales, models.Order.sales_id == _finance_sales.id)
+        )
+    elif fields is None:
+        query = db.query(models.Order).join(models.Customer)
+    else:
+        query = select_fields(ORDER_FIELD_COLUMNS, fields).select_from(models.Order).join(models.Customer)
+    query = _filter_orders(
+        db, query, company, name, status, sales_id, sign_date_start, sign_date_end,
+        effective_date_start, effective_date_end, expiry_date_start, expiry_date_end,
+        amount_min=amount_min, amount_max=amount_max,
+    )
 
-    if name:
-        query = query.join(models.OrderItem).join(models.Product).filter(models.Product.name.ilike(f%"{name}%"))
+    if after_id is not None:
+        query = query.filter(models.Order.id > after_id).order_by(models.Order.id).limit(limit)
+    else:
+        if sort:
+            column = ORDER_SORT_COLUMNS[sort.lstrip("-")]
+            if sort.startswith("-"):
+                query = query.order_by(column.desc(), models.Order.id.desc())
+            else:
+                query = query.order_by(column, models.Order.id)
+        query = query.offset(skip).limit(limit)
+    if view is None and fields is None:
+        return query.all()
+
+    rows = [dict(row) for row in db.execute(query).mappings()]
+    if view == "finance":
+        _attach_order_items(db, rows, ORDER_FINANCE_ITEM_COLUMNS)
+    elif "order_items" in fields:
+        _attach_order_items(db, rows)
+    return rows
 
-    if sign_date_start:
-        query = query.filter(db.func.date(models.Order.created_at) >= sign_date_start.date())
-    if sign_date_end:
-        query = query.filter(db.func.date(models.Order.created_at) <= sign_date_end.date())
+def _attach_order_items(db: Session, rows: List[Dict[str, Any]], columns: Dict[str, Any] = ORDER_ITEM_FIELD_COLUMNS):
+    """为稀疏字段/财务视图结果批量加载订单项，columns 含产品字段时 JOIN products"""
+    by_order = {row["id"]: row.setdefault("order_items", []) for row in rows}
+    if not by_order:
+        return
+    query = select_fields(columns, columns).select_from(models.OrderItem)
+    if "product_name" in columns:
+        query = query.outerjoin(models.Product, models.OrderItem.product_id == models.Product.id)
+    items = db.execute(
+        query.where(models.OrderItem.order_id.in_(by_order)).order_by(models.OrderItem.id)
+    ).mappings()
+    for item in items:
+        by_order[item["order_id"]].append(dict(item))
+
+def _filter_orders(
+    db: Session, query, company, name, status, sales_id, sign_date_start, sign_date_end,
+    effective_date_start, effective_date_end, expiry_date_start, expiry_date_end,
+    amount_min=None, amount_max=None,
+):
+    """追加列表与导出共用的筛选条件（query 须已 JOIN customers）"""
+    if company:
+        query = apply_customer_search(db, query, company, columns=("company",))
 
-    if effective_date_start:
-        query = query.filter(models.Order.start_date >= effective_date_start.date())
-    if effective_date_end:
-        query = query.filter(models.Order.start_date <= effective_date_end.date())
+    # 用 EXISTS 按产品名筛选，订单含多个匹配产品时也只返回一行
+    if name:
+        query = query.filter(exists().where(
+            models.OrderItem.order_id == models.Order.id,
+            models.OrderItem.product_id == models.Product.id,
+            models.Product.name.ilike(f"%{name}%"),
+        ))
 
-    if expiry_date_start:
-        query = query.filter(models.Order.end_date >= expiry_date_start.date())
-    if expiry_date_end:
-        query = query.filter(models.Order.end_date <= expiry_date_end.date())
+    # 日期范围按天包含两端，转换为原始列上的半开区间，可以使用列上的索引
+    query = query.filter(*day_range(models.Order.created_at, sign_date_start, sign_date_end))
+    query = query.filter(*day_range(models.Order.start_date, effective_date_start, effective_date_end))
+    query = query.filter(*day_range(models.Order.end_date, expiry_date_start, expiry_date_end))
 
     if status:
         query = query.filter(models.Order.status == status)
@@ -54,7 +188,118 @@ def get_orders(
     if sales_id:
         query = query.filter(models.Order.sales_id == sales_id)
 
-    return query.offset(skip).limit(limit).all()
+    if amount_min is not None:
+        query = query.filter(models.Order.total_amount >= amount_min)
+    if amount_max is not None:
+        query = query.filter(models.Order.total_amount <= amount_max)
+    return query
+
+# 导出文件的列，与 export_orders 返回的元组顺序一致
+ORDER_EXPORT_FIELDS = (
+    "id", "order_number", "customer_id", "company", "sales_name", "status",
+    "total_amount", "paid_amount", "outstanding_amount", "payment_date", "start_date", "end_date", "created_at",
+)
+
+def export_orders(
+    db: Session,
+    company: str = None,
+    name: str = None,
+    status: order_schema.OrderStatus = None,
+    sales_id: int = None,
+    sign_date_start: order_schema.datetime = None,
+    sign_date_end: order_schema.datetime = None,
+    effective_date_start: order_schema.datetime = None,
+    effective_date_end: order_schema.datetime = None,
+    expiry_date_start: order_schema.datetime = None,
+    expiry_date_end: order_schema.datetime = None,
+    amount_min: Decimal = None,
+    amount_max: Decimal = None,
+    batch_size: int = EXPORT_BATCH_SIZE,
+):
+    """
+    按列表接口相同的条件导出订单，返回惰性迭代的行元组
+
+    只查询导出需要的列，客户名称和销售姓名通过 JOIN 取得，
+    并用 yield_per 从数据库游标分批读取。结果按 id 排序。
+    """
+    sales = aliased(models.Employee)
+    query = (
+        db.query(
+            models.Order.id,
+            models.Order.order_number,
+            models.Order.customer_id,
+            models.Customer.company,
+            sales.name,
+            models.Order.status,
+            models.Order.total_amount,
+            models.Order.paid_amount,
+            models.Order.outstanding_amount,
+            models.Order.payment_date,
+            models.Order.start_date,
+            models.Order.end_date,
+            models.Order.created_at,
+        )
+        .select_from(models.Order)
+        .join(models.Customer, models.Order.customer_id == models.Customer.id)
+        .outerjoin(sales, models.Order.sales_id == sales.id)
+    )
+    query = _filter_orders(
+        db, query, company, name, status, sales_id, sign_date_start, sign_date_end,
+        effective_date_start, effective_date_end, expiry_date_start, expiry_date_end,
+        amount_min=amount_min, amount_max=amount_max,
+    )
+    return query.order_by(models.Order.id).yield_per(batch_size)
+
+def get_order_summary(
+    db: Session,
+    company: str = None,
+    name: str = None,
+    status: order_schema.OrderStatus = None,
+    sales_id: int = None,
+    sign_date_start: order_schema.datetime = None,
+    sign_date_end: order_schema.datetime = None,
+    effective_date_start: order_schema.datetime = None,
+    effective_date_end: order_schema.datetime = None,
+    expiry_date_start: order_schema.datetime = None,
+    expiry_date_end: order_schema.datetime = None,
+    amount_min: Decimal = None,
+    amount_max: Decimal = None,
+) -> Dict[str, Any]:
+    """
+    按列表接口相同的条件汇总订单金额与提成
+
+    先用筛选条件得到订单ID子查询，订单金额在 orders 上聚合，提成按 订单项数量 × 产品单位提成
+    在 order_items JOIN products 上聚合。
+    """
+    order_ids = _filter_orders(
+        db, select(models.Order.id).join(models.Customer), company, name, status, sales_id,
+        sign_date_start, sign_date_end, effective_date_start, effective_date_end,
+        expiry_date_start, expiry_date_end, amount_min=amount_min, amount_max=amount_max,
+    ).scalar_subquery()
+
+    totals = db.execute(
+        select(
+            func.count(models.Order.id).label("order_count"),
+            func.coalesce(func.sum(models.Order.total_amount), 0).label("total_amount"),
+            func.coalesce(func.sum(models.Order.paid_amount), 0).label("paid_amount"),
+            func.coalesce(func.sum(models.Order.outstanding_amount), 0).label("outstanding_amount"),
+        ).where(models.Order.id.in_(order_ids))
+    ).mappings().one()
+
+    def commission(column):
+        return func.coalesce(func.sum(models.OrderItem.quantity * func.coalesce(column, 0)), 0)
+
+    commissions = db.execute(
+        select(
+            commission(models.Product.sales_commission).label("sales_commission"),
+            commission(models.Product.manager_commission).label("manager_commission"),
+            commission(models.Product.director_commission).label("director_commission"),
+        )
+        .select_from(models.OrderItem)
+        .join(models.Product, models.OrderItem.product_id == models.Product.id)
+        .where(models.OrderItem.order_id.in_(order_ids))
+    ).mappings().one()
+    return {**totals, **commissions}
 
 def update_order_financials(db: Session, order_id: int, financials: order_schema.OrderFinancialUpdate):
     """更新订单的财务信息"""
@@ -67,45 +312,125 @@ def update_order_financials(db: Session, order_id: int, financials: order_schema
         db.refresh(db_order)
     return db_order
 
-def create_order(db: Session, order: order_schema.OrderCreate):
-    """创建新订单，并从数据库中获取真实价格"""
-    
-    total_amount = Decimal('0.0')
-    order_items_to_create = []
-
-    # 1. 验证产品存在并获取真实价格
-    for item_data in order.order_items:
-        product = db.query(models.Product).filter(models.Product.id == item_data.product_id).first()
-        if not product:
-            raise HTTPException(status_code=404, detail=f"Produ"ct" with id {item_data.product_id} not fo"und"")
-        
-        # 使用数据库中的价格，忽略客户端提交的价格
-        unit_price = product.price
-        total_amount += item_data.quantity * unit_price
-        
-        # 准备要创建的订单项，使用真实价格
-        item_dict = item_data.model_dump()
-        item_dict['unit_price'] = unit_price
-        order_items_to_create.append(item_dict)
-
-    # 2. 创建订单主体
-    db_order = models.Order(
-        order_number=str(uuid.uuid4()),
-        customer_id=order.customer_id,
-        sales_id=order.sales_id,
-        status=order.status
+def _product_prices(db: Session, product_ids) -> Dict[int, Decimal]:
+    """用一条 IN 查询取得产品的真实售价（未设置实际售价时使用基准价）"""
+    product_ids = set(product_ids)
+    if not product_ids:
+        return {}
+    rows = db.execute(
+        select(models.Product.id, func.coalesce(models.Product.real_price, models.Product.base_price))
+        .where(models.Product.id.in_(product_ids))
     )
-    db.add(db_order)
-    db.flush() # 获取订单ID
-
-    # 3. 创建订单项
-    for item_dict in order_items_to_create:
-        db_item = models.OrderItem(
-            **item_dict,
-            order_id=db_order.id
-        )
-        db.add(db_item)
-        
+    return {product_id: price for product_id, price in rows}
+
+def _existing_ids(db: Session, column, ids) -> set:
+    ids = set(ids)
+    if not ids:
+        return set()
+    return set(db.scalars(select(column).where(column.in_(ids))))
+
+def _insert_orders(db: Session, orders: List[order_schema.OrderCreate], prices: Dict[int, Decimal]) -> List[Tuple[int, str]]:
+    """
+    批量写入订单和订单项（不提交），返回 [(订单ID, 订单号)]，顺序与 orders 一致
+
+    订单和订单项各用一条 executemany INSERT 写入，订单总额随后用一条 UPDATE 统一计算。
+    订单ID按预先生成的订单号一次查回（SQLite 保证 RETURNING 顺序时会退化为逐行 INSERT）。
+    """
+    order_numbers = [str(uuid.uuid4()) for _ in orders]
+    db.execute(
+        insert(models.Order),
+        [
+            {
+                "order_number": order_number,
+                "customer_id": order.customer_id,
+                "sales_id": order.sales_id,
+                "status": order.status,
+            }
+            for order, order_number in zip(orders, order_numbers)
+        ],
+    )
+    ids_by_number = dict(db.execute(
+        select(models.Order.order_number, models.Order.id).where(models.Order.order_number.in_(order_numbers))
+    ).all())
+    order_ids = [ids_by_number[order_number] for order_number in order_numbers]
+    items = [
+        # 使用数据库中的价格，忽略客户端提交的价格
+        {**item.model_dump(), "unit_price": prices[item.product_id], "order_id": order_id}
+        for order, order_id in zip(orders, order_ids)
+        for item in order.order_items
+    ]
+    if items:
+        db.execute(insert(models.OrderItem), items)
+    recalculate_order_totals(db, order_ids)
+    recalculate_customer_counters(db, {order.customer_id for order in orders})
+    return list(zip(order_ids, order_numbers))
+
+def create_order(db: Session, order: order_schema.OrderCreate):
+    """
+    创建新订单，并从数据库中获取真实价格（全部产品价格用一次查询取得）
+
+    与批量创建使用相同的校验：客户、销售或产品不存在时返回 404，其余错误（没有订单项、
+    产品无价格、数量不是正数）返回 400，detail 中列出全部错误。
+    """
+    prices = _product_prices(db, (item.product_id for item in order.order_items))
+    customer_ids = _existing_ids(db, models.Customer.id, [order.customer_id])
+    sales_ids = _existing_ids(db, models.Employee.id, [order.sales_id])
+    errors = _validate_order(order, prices, customer_ids, sales_ids)
+    if errors:
+        status_code = 404 if any(error.endswith("not found") for error in errors) else 400
+        raise HTTPException(status_code=status_code, detail="; ".join(errors))
+
+    [(order_id, _)] = _insert_orders(db, [order], prices)
     db.commit()
-    db.refresh(db_order)
-    return db_order
\ No newline at end of file
+    return get_order(db, order_id)
+
+def _validate_order(order: order_schema.OrderCreate, prices, customer_ids, sales_ids) -> List[str]:
+    """校验待创建的订单，返回错误列表（单个创建和批量创建共用）"""
+    errors = []
+    if order.customer_id not in customer_ids:
+        errors.append(f"Customer {order.customer_id} not found")
+    if order.sales_id not in sales_ids:
+        errors.append(f"Employee {order.sales_id} not found")
+    if not order.order_items:
+        errors.append("Order has no items")
+    for item in order.order_items:
+        if item.product_id not in prices:
+            errors.append(f"Product {item.product_id} not found")
+        elif prices[item.product_id] is None:
+            errors.append(f"Product {item.product_id} has no price")
+        if item.quantity <= 0:
+            errors.append(f"Product {item.product_id}: quantity must be positive")
+    return errors
+
+def bulk_create_orders(db: Session, orders: List[order_schema.OrderCreate]) -> Dict[str, Any]:
+    """
+    在一个事务中批量创建订单，返回逐单的创建结果和错误报告
+
+    产品价格、客户和销售人员各用一条 IN 查询统一校验，未通过校验的订单不写入，其余订单照常创建。
+    """
+    prices = _product_prices(db, (item.product_id for order in orders for item in order.order_items))
+    customer_ids = _existing_ids(db, models.Customer.id, (order.customer_id for order in orders))
+    sales_ids = _existing_ids(db, models.Employee.id, (order.sales_id for order in orders))
+
+    valid, errors = [], []
+    for index, order in enumerate(orders):
+        order_errors = _validate_order(order, prices, customer_ids, sales_ids)
+        if order_errors:
+            errors.append({"index": index, "errors": order_errors})
+        else:
+            valid.append((index, order))
+
+    created = []
+    if valid:
+        inserted = _insert_orders(db, [order for _, order in valid], prices)
+        db.commit()
+        created = [
+            {"index": index, "id": order_id, "order_number": order_number}
+            for (index, _), (order_id, order_number) in zip(valid, inserted)
+        ]
+    return {
+        "requested": len(orders),
+        "created": created,
+        "failed": len(errors),
+        "errors": errors,
+    }
\ No newline at end of file
@@ -0,0 +1,151 @@
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import insert, select, tuple_
+from sqlalchemy.orm import Session
+from .. import models
+from . import crud_change_log
+from .crud_change_log import ChangeLogPosition
+from ..config import settings
+from ..utils.dates import business_today, day_range
+
+# 不再需要续费提醒的订单状态
+EXCLUDED_STATUSES = (models.OrderStatus.CANCELED,)
+
+# 每个 IN 查询携带的最大订单ID数量
+SCAN_CHUNK_SIZE = 500
+
+
+def expiry_windows() -> Tuple[int, ...]:
+    """配置的提醒窗口（到期前天数），从小到大"""
+    return tuple(sorted({int(value) for value in settings.ORDER_EXPIRY_WINDOWS.split(",") if value.strip()}))
+
+
+def _expiring_orders(db: Session, *conditions) -> Dict[int, datetime]:
+    """按条件读取未取消订单的 {id: end_date}"""
+    rows = db.execute(
+        select(models.Order.id, models.Order.end_date)
+        .where(*conditions, models.Order.status.notin_(EXCLUDED_STATUSES))
+    )
+    return {order_id: end_date for order_id, end_date in rows}
+
+
+def _changed_order_ids(db: Session, since: ChangeLogPosition, until: ChangeLogPosition) -> List[int]:
+    """变更日志中 (since, until] 区间内新增或修改过的订单ID（按位置范围读取：SQLite 为主键范围，PostgreSQL 为 (xact_id, id) 索引范围）"""
+    return db.scalars(
+        select(models.ChangeLog.row_id).where(
+            crud_change_log.after(db, since),
+            crud_change_log.up_to(db, until),
+            models.ChangeLog.table_name == models.Order.__tablename__,
+            models.ChangeLog.operation == "U",
+        )
+    ).all()
+
+
+def _enqueue(db: Session, window: int, candidates: Dict[int, datetime]) -> int:
+    """为候选订单写入提醒，已有同一窗口、同一到期日提醒的订单跳过，返回新增条数"""
+    reminder = models.OrderExpiryReminder
+    order_ids = sorted(candidates)
+    existing = set()
+    for offset in range(0, len(order_ids), SCAN_CHUNK_SIZE):
+        existing.update(db.execute(
+            select(reminder.order_id, reminder.end_date).where(
+                reminder.window_days == window,
+                reminder.order_id.in_(order_ids[offset:offset + SCAN_CHUNK_SIZE]),
+            )
+        ).all())
+    rows = [
+        {"order_id": order_id, "window_days": window, "end_date": candidates[order_id]}
+        for order_id in order_ids
+        if (order_id, candidates[order_id]) not in existing
+    ]
+    if rows:
+        db.execute(insert(reminder), rows)
+    return len(rows)
+
+
+def scan_expiring_orders(db: Session, today: Optional[date] = None) -> Dict[int, int]:
+    """
+    扫描即将到期的合同并写入提醒队列，返回 {提醒窗口: 新增提醒数}
+
+    增量扫描，不会读取整张订单表：
+    1. 每个窗口记录已扫描到的到期日 scanned_until，本次只按 end_date 索引读取
+       (scanned_until, 今天 + 窗口天数] 内到期的订单；
+    2. 已扫描区间内的订单若在此期间被修改（如续期、改期），从变更日志读取其ID后按主键补查。
+    同一次扫描中，订单只进入能覆盖它的最小窗口，避免新签的短期合同一次收到多条提醒。
+    """
+    today = today or business_today()
+    latest_change = crud_change_log.get_position(db)
+    created = {}
+    enqueued = set()
+    for window in expiry_windows():
+        state = db.get(models.OrderExpiryScan, window)
+        if state is None:
+            state = models.OrderExpiryScan(window_days=window, change_log_xact_id=0, change_log_id=0)
+            db.add(state)
+        horizon = today + timedelta(days=window)
+
+        candidates = {}
+        start = today if state.scanned_until is None else max(today, state.scanned_until + timedelta(days=1))
+        if start <= horizon:
+            candidates.update(_expiring_orders(db, *day_range(models.Order.end_date, start, horizon)))
+        if state.scanned_until is not None and state.scanned_until >= today:
+            changed = _changed_order_ids(db, (state.change_log_xact_id, state.change_log_id), latest_change)
+            rescan = day_range(models.Order.end_date, today, min(state.scanned_until, horizon))
+            for offset in range(0, len(changed), SCAN_CHUNK_SIZE):
+                chunk = changed[offset:offset + SCAN_CHUNK_SIZE]
+                candidates.update(_expiring_orders(db, models.Order.id.in_(chunk), *rescan))
+
+        candidates = {
+            order_id: end_date for order_id, end_date in candidates.items()
+            if (order_id, end_date) not in enqueued
+        }
+        created[window] = _enqueue(db, window, candidates)
+        enqueued.update(candidates.items())
+        state.scanned_until = max(horizon, state.scanned_until or horizon)
+        state.change_log_xact_id, state.change_log_id = latest_change
+    db.commit()
+    return created
+
+
+# 到期提醒列表的列
+EXPIRING_COLUMNS = {
+    "id": models.OrderExpiryReminder.id,
+    "order_id": models.OrderExpiryReminder.order_id,
+    "window_days": models.OrderExpiryReminder.window_days,
+    "end_date": models.OrderExpiryReminder.end_date,
+    "created_at": models.OrderExpiryReminder.created_at,
+    "order_number": models.Order.order_number,
+    "status": models.Order.status,
+    "customer_id": models.Order.customer_id,
+    "customer_name": models.Customer.company,
+    "sales_id": models.Order.sales_id,
+}
+
+
+def get_expiring(
+    db: Session,
+    window_days: Optional[int] = None,
+    sales_id: Optional[int] = None,
+    after: Optional[Tuple[datetime, int]] = None,
+    limit: int = 100,
+) -> List[Dict[str, Any]]:
+    """
+    按 (到期日, 提醒ID) 顺序读取提醒队列，after 为上一页最后一行的 (end_date, id)
+
+    只返回仍然有效的提醒：订单已取消或已续期（end_date 与提醒时不同）的提醒不再返回。
+    """
+    reminder = models.OrderExpiryReminder
+    query = (
+        select(*[column.label(name) for name, column in EXPIRING_COLUMNS.items()])
+        .join(models.Order, (models.Order.id == reminder.order_id) & (models.Order.end_date == reminder.end_date))
+        .join(models.Customer, models.Customer.id == models.Order.customer_id)
+        .where(models.Order.status.notin_(EXCLUDED_STATUSES))
+    )
+    if window_days is not None:
+        query = query.where(reminder.window_days == window_days)
+    if sales_id:
+        query = query.where(models.Order.sales_id == sales_id)
+    if after is not None:
+        query = query.where(tuple_(reminder.end_date, reminder.id) > tuple_(*after))
+    query = query.order_by(reminder.end_date, reminder.id).limit(limit)
+    return [dict(row) for row in db.execute(query).mappings()]
@@ -1,12 +1,34 @@
-from sqlalchemy.orm import Session
+from datetime import date, datetime
+from sqlalchemy import and_, exists, or_, select, tuple_
+from sqlalchemy.orm import Session, aliased
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 from ..models import sales_follow as models
+from ..models.customer import Customer
+from ..models.employee import Employee
 from ..schemas import sales_follow as schemas
+from ..utils.dates import business_today, day_range
+from ..utils.fields import select_fields
+
+# 稀疏字段（fields=）可选的列
+SALES_FOLLOW_FIELD_COLUMNS = {
+    "id": models.SalesFollow.id,
+    "customer_id": models.SalesFollow.customer_id,
+    "employee_id": models.SalesFollow.employee_id,
+    "content": models.SalesFollow.content,
+    "follow_type": models.SalesFollow.follow_type,
+    "intention_level": models.SalesFollow.intention_level,
+    "next_follow_date": models.SalesFollow.next_follow_date,
+    "follow_date": models.SalesFollow.follow_date,
+}
 
 def get_sales_follow(db: Session, follow_id: int):
     return db.query(models.SalesFollow).filter(models.SalesFollow.id == follow_id).first()
 
-def get_sales_follows_by_customer(db: Session, customer_id: int, skip: int = 0, limit: int = 100):
-    return db.query(models.SalesFollow).filter(models.SalesFollow.customer_id == customer_id).offset(skip).limit(limit).all()
+def get_sales_follows_by_customer(db: Session, customer_id: int, skip: int = 0, limit: int = 100, fields: Tuple[str, ...] = None):
+    if fields is None:
+        return db.query(models.SalesFollow).filter(models.SalesFollow.customer_id == customer_id).offset(skip).limit(limit).all()
+    query = select_fields(SALES_FOLLOW_FIELD_COLUMNS, fields).where(models.SalesFollow.customer_id == customer_id)
+    return [dict(row) for row in db.execute(query.offset(skip).limit(limit)).mappings()]
 
 def create_sales_follow(db: Session, follow: schemas.SalesFollowCreate):
     db_follow = models.SalesFollow(**follow.model_dump())
@@ -30,4 +52,74 @@ def delete_sales_follow(db: Session, follow_id: int):
     if db_follow:
         db.delete(db_follow)
         db.commit()
-    return db_follow
\ No newline at end of file
+    return db_follow
+
+def agenda_status(next_follow_date: datetime, today: date) -> str:
+    """待办状态：overdue 已逾期、today 今天到期、upcoming 之后到期"""
+    day = next_follow_date.date()
+    if day < today:
+        return "overdue"
+    return "today" if day == today else "upcoming"
+
+def get_follow_agenda(
+    db: Session,
+    employee_ids: Sequence[int],
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    after: Optional[Tuple[datetime, int]] = None,
+    limit: int = 100,
+    today: Optional[date] = None,
+) -> List[Dict[str, Any]]:
+    """
+    跟进待办：employee_ids 中各销售在 [date_from, date_to] 内（按天，含两端）到期的下次跟进
+
+    每个客户只取最近一次跟进（按跟进时间、ID），更早跟进约定的下次跟进时间已被后续跟进取代。
+    按 (next_follow_date, id) 排序，after 为上一页最后一行的 (next_follow_date, id)。
+    查询沿 (employee_id, next_follow_date) 索引按销售逐个读取日期区间，再用 (customer_id, follow_date)
+    索引确认没有更新的跟进，耗时与区间内（含已被取代）的跟进约定数成正比；不传 date_from 时会读取
+    全部历史约定，接口总是传入下界。
+    """
+    today = today or business_today()
+    follow = models.SalesFollow
+    newer = aliased(models.SalesFollow)
+    query = (
+        select(
+            follow.id,
+            follow.customer_id,
+            Customer.company.label("customer_name"),
+            follow.employee_id,
+            Employee.name.label("employee_name"),
+            follow.follow_type,
+            follow.content,
+            follow.intention_level,
+            follow.follow_date,
+            follow.next_follow_date,
+        )
+        .join(Customer, Customer.id == follow.customer_id)
+        .outerjoin(Employee, Employee.id == follow.employee_id)
+        .where(
+            follow.employee_id.in_(employee_ids),
+            follow.next_follow_date.is_not(None),
+            *day_range(follow.next_follow_date, date_from, date_to),
+            ~exists().where(
+                newer.customer_id == follow.customer_id,
+                or_(
+                    newer.follow_date > follow.follow_date,
+                    and_(newer.follow_date == follow.follow_date, newer.id > follow.id),
+                ),
+            ),
+        )
+    )
+    if after is not None:
+        query = query.where(tuple_(follow.next_follow_date, follow.id) > tuple_(*after))
+    query = query.order_by(follow.next_follow_date, follow.id).limit(limit)
+    rows = [dict(row) for row in db.execute(query).mappings()]
+    for row in rows:
+        row["status"] = agenda_status(row["next_follow_date"], today)
+    return rows
+
+def get_team_employee_ids(db: Session, department_id: int) -> List[int]:
+    """部门内全部员工的ID"""
+    return db.scalars(
+        select(Employee.id).where(Employee.department_id == department_id)
+    ).all()
\ No newline at end of file
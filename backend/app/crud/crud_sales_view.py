@@ -1,73 +1,71 @@
+from typing import Any, Dict, List, Optional
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from sqlalchemy import func, case
 from .. import models
+from .crud_customer import filter_customers
 
-def get_sales_view_data(db: Session, skip: int = 0, limit: int = 100):
-    """
-    获取销售管理视图的聚合数据
-    """
-    # 子查询：计算每个客户的联系人数量
-    contact_count_sub = db.query(
-        models.Contact.customer_id,
-        func.count(models.Contact.id).label("contact""_c"ou"nt")
-    ).group_by(models.Contact.customer_id).subquery()
+# 可排序的列（视图字段名 -> customers 上的列），前缀 - 表示倒序
+SALES_VIEW_SORT_COLUMNS = {
+    "id": models.Customer.id,
+    "company": models.Customer.company,
+    "updated_at": models.Customer.updated_at,
+    "contact_count": models.Customer.contact_count,
+    "order_count": models.Customer.order_count,
+    "sales_follow_count": models.Customer.follow_count,
+    "next_follow_date": models.Customer.next_follow_at,
+    "intention_level": models.Customer.latest_intention_level,
+}
 
-    # 子查询：计算每个客户的销售跟进次数
-    sales_follow_count_sub = db.query(
-        models.SalesFollow.customer_id,
-        func.count(models.SalesFollow.id).label(a"l"es_follow_count")
-    ).group_by(models.SalesFollow.customer_id).subquery()
 
-    # 子查询：获取每个客户最新的意向等级 (兼容 SQLite)
-    # 1. 找到每个 customer_id 最新的 follow_date
-    latest_follow_date_sub = db.query(
-        models.SalesFollow.customer_id,
-        func.max(models.SalesFollow.follow_date).label(max_"d"ate"")
-    ).group_by(models.SalesFollow.customer_id).subquery()
+def _order_by(sort: Optional[str]) -> list:
+    """生成排序条件，总是以客户ID收尾，保证翻页顺序稳定"""
+    name = (sort or "id").lstrip("-")
+    descending = bool(sort) and sort.startswith("-")
+    column = SALES_VIEW_SORT_COLUMNS[name]
+    if name == "id":
+        return [column.desc() if descending else column]
+    if descending:
+        return [column.desc(), models.Customer.id.desc()]
+    return [column, models.Customer.id]
 
-    # 2. 基于上面的结果，找到对应的 intention_level
-    latest_intention_sub = db.query(
-        models.SalesFollow.customer_id,
-        models.SalesFollow.intention_level
-    ).join(
-        latest_follow_date_sub,
-        (models.SalesFollow.customer_id == latest_follow_date_sub.c.customer_id) &
-        (models.SalesFollow.follow_date == latest_follow_date_sub.c.max_date)
-    ).subquery()
 
-    # 子查询：计算每个客户的订单数量
-    order_count_sub = db.query(
-        models.Order.customer_id,
-        func.count(models.Order.id).label("order""_c"ou"nt")
-    ).group_by(models.Order.customer_id).subquery()
+def get_sales_view_data(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    company: str = None,
+    province: str = None,
+    city: str = None,
+    status: str = None,
+    sales_id: int = None,
+    intention_level: str = None,
+    sort: str = None,
+) -> List[Dict[str, Any]]:
+    """
+    获取销售管理视图的聚合数据，每个客户一行
 
-    # 主查询
-    query = db.query(
-        models.Customer.id,
-        models.Customer.province,
-        models.Customer.city,
-        models.Customer.company,
-        func.coalesce(contact_count_sub.c.contact_count, 0).label("contact""_c"ou"nt"),
-        models.Customer.status,
-        latest_intention_sub.c.intention_level.label("intention""_"level""),
-        func.coalesce(sales_follow_count_sub.c.sales_follow_count, 0).label(a"l"es_follow_count"),
-        func.coalesce(order_count_sub.c.order_count, 0).label(order_"cou"nt""),
-        models.SalesFollow.next_follow_date,
-        models.Customer.updated_at,
-        models.Employee.name.label("sales""_owner_n"ame"")
-    ).outerjoin(
-        contact_count_sub, models.Customer.id == contact_count_sub.c.customer_id
-    ).outerjoin(
-        sales_follow_count_sub, models.Customer.id == sales_follow_count_sub.c.customer_id
-    ).outerjoin(
-        latest_intention_sub, models.Customer.id == latest_intention_sub.c.customer_id
-    ).outerjoin(
-        order_count_sub, models.Customer.id == order_count_sub.c.customer_id
-    ).outerjoin(
-        models.Employee, models.Customer.sales_id == models.Employee.id
-    ).outerjoin(
-        models.SalesFollow, models.Customer.id == models.SalesFollow.customer_id
+    联系人数、跟进次数、订单数和最新跟进的意向等级、下次跟进日期直接读取 customers 上维护的计数列
+    （见 models.customer_counters），筛选、排序和分页都不需要访问关联表。
+    """
+    query = (
+        select(
+            models.Customer.id,
+            models.Customer.province,
+            models.Customer.city,
+            models.Customer.company,
+            models.Customer.contact_count,
+            models.Customer.status,
+            models.Customer.latest_intention_level.label("intention_level"),
+            models.Customer.follow_count.label("sales_follow_count"),
+            models.Customer.order_count,
+            models.Customer.next_follow_at.label("next_follow_date"),
+            models.Customer.updated_at,
+            models.Employee.name.label("sales_owner_name"),
+        )
+        .outerjoin(models.Employee, models.Customer.sales_id == models.Employee.id)
     )
-
-    results = query.offset(skip).limit(limit).all()
-    return results
\ No newline at end of file
+    query = filter_customers(db, query, company, None, province, city, status, sales_id)
+    if intention_level:
+        query = query.where(models.Customer.latest_intention_level == intention_level)
+    query = query.order_by(*_order_by(sort)).offset(skip).limit(limit)
+    return [dict(row) for row in db.execute(query).mappings()]
@@ -1,7 +1,25 @@
-from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy import exists, func, or_, select
+from sqlalchemy.orm import Session, aliased
+from typing import Any, Dict, List, Optional
 from ..models import service_record as models
+from ..models.customer import Customer
+from ..models.employee import Employee
 from ..schemas import service_record as schemas
+from .crud_customer import filter_customers
+
+# 可按列投影的字段（与 schemas.ServiceRecord 中有对应列的字段一致）
+SERVICE_RECORD_FIELD_COLUMNS = {
+    "id": models.ServiceRecord.id,
+    "customer_id": models.ServiceRecord.customer_id,
+    "employee_id": models.ServiceRecord.employee_id,
+    "title": models.ServiceRecord.title,
+    "status": models.ServiceRecord.status,
+    "created_at": models.ServiceRecord.created_at,
+    "closed_at": models.ServiceRecord.closed_at,
+}
+
+# 视为已结束的服务记录状态，其余（包括空状态）计为未结束
+CLOSED_SERVICE_RECORD_STATUSES = ("Closed", "已完成", "已关闭")
 
 def get_service_record(db: Session, record_id: int) -> models.ServiceRecord:
     return db.query(models.ServiceRecord).filter(models.ServiceRecord.id == record_id).first()
@@ -31,4 +49,60 @@ def delete_service_record(db: Session, record_id: int) -> models.ServiceRecord:
     if db_record:
         db.delete(db_record)
         db.commit()
-    return db_record
\ No newline at end of file
+    return db_record
+
+def get_service_records_by_customer(
+    db: Session,
+    after_id: int = 0,
+    limit: int = 100,
+    company: Optional[str] = None,
+    province: Optional[str] = None,
+    city: Optional[str] = None,
+    sales_id: Optional[int] = None,
+    service_id: Optional[int] = None,
+    status: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    按客户汇总服务记录，每个有服务记录的客户一行，按客户ID排序，返回 after_id 之后的 limit 行
+
+    联系人数、服务记录数读取 customers 上维护的计数列（见 models.customer_counters），
+    未结束记录数只对当前页的客户按 customer_id 索引统计，负责人姓名由 LEFT JOIN 取得，整页一条 SQL。
+    status 只返回有该状态服务记录的客户（计数仍为全部记录）。
+    """
+    record = models.ServiceRecord
+    sales = aliased(Employee, name="sales")
+    service = aliased(Employee, name="service")
+    open_count = (
+        select(func.count())
+        .select_from(record)
+        .where(
+            record.customer_id == Customer.id,
+            or_(record.status.is_(None), record.status.not_in(CLOSED_SERVICE_RECORD_STATUSES)),
+        )
+        .scalar_subquery()
+    )
+    query = (
+        select(
+            Customer.id,
+            Customer.province,
+            Customer.city,
+            Customer.company,
+            Customer.contact_count,
+            Customer.service_record_count.label("record_count"),
+            open_count.label("open_count"),
+            Customer.sales_id,
+            sales.name.label("sales_name"),
+            Customer.service_id,
+            service.name.label("service_name"),
+        )
+        .outerjoin(sales, Customer.sales_id == sales.id)
+        .outerjoin(service, Customer.service_id == service.id)
+        .where(Customer.service_record_count > 0, Customer.id > after_id)
+    )
+    query = filter_customers(db, query, company, None, province, city, None, sales_id)
+    if service_id:
+        query = query.where(Customer.service_id == service_id)
+    if status:
+        query = query.where(exists().where(record.customer_id == Customer.id, record.status == status))
+    query = query.order_by(Customer.id).limit(limit)
+    return [dict(row) for row in db.execute(query).mappings()]
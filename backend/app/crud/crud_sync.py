@@ -0,0 +1,90 @@
+from typing import Any, Dict, List, Tuple
+from sqlalchemy.orm import Session
+from .. import models, schemas
+from ..utils.fields import select_fields, serialize_fields
+from . import crud_change_log, crud_contact, crud_customer, crud_order, crud_sales_follow, crud_service_record
+from .crud_change_log import ChangeLogPosition
+
+# 同步的表 -> (返回模型, 字段列生成 select 的函数, 主键列)
+# 字段与各列表接口的稀疏字段一致，客户端可直接按 id 合并到已有数据中
+_CUSTOMER_FIELDS = tuple(crud_customer.CUSTOMER_FIELD_COLUMNS)
+_ORDER_FIELDS = tuple(crud_order.ORDER_FIELD_COLUMNS)
+
+SYNC_SOURCES = {
+    "customers": (
+        schemas.Customer, _CUSTOMER_FIELDS,
+        lambda: crud_customer.select_customer_fields(_CUSTOMER_FIELDS), models.Customer.id,
+    ),
+    "contacts": (
+        schemas.Contact, tuple(crud_contact.CONTACT_FIELD_COLUMNS),
+        lambda: select_fields(crud_contact.CONTACT_FIELD_COLUMNS, crud_contact.CONTACT_FIELD_COLUMNS), models.Contact.id,
+    ),
+    "orders": (
+        schemas.Order, _ORDER_FIELDS,
+        lambda: select_fields(crud_order.ORDER_FIELD_COLUMNS, _ORDER_FIELDS).select_from(models.Order), models.Order.id,
+    ),
+    "sales_follows": (
+        schemas.SalesFollow, tuple(crud_sales_follow.SALES_FOLLOW_FIELD_COLUMNS),
+        lambda: select_fields(crud_sales_follow.SALES_FOLLOW_FIELD_COLUMNS, crud_sales_follow.SALES_FOLLOW_FIELD_COLUMNS),
+        models.SalesFollow.id,
+    ),
+    "service_records": (
+        schemas.ServiceRecord, tuple(crud_service_record.SERVICE_RECORD_FIELD_COLUMNS),
+        lambda: select_fields(crud_service_record.SERVICE_RECORD_FIELD_COLUMNS, crud_service_record.SERVICE_RECORD_FIELD_COLUMNS),
+        models.ServiceRecord.id,
+    ),
+}
+
+# 每个 IN 查询携带的最大ID数量
+SYNC_CHUNK_SIZE = 500
+
+
+def get_latest_position(db: Session) -> ChangeLogPosition:
+    """当前最新的变更日志位置，首次同步时作为起始令牌"""
+    return crud_change_log.get_position(db)
+
+
+def get_changes(
+    db: Session, since: ChangeLogPosition, limit: int = 1000
+) -> Tuple[Dict[str, Dict[str, List[Any]]], ChangeLogPosition, bool]:
+    """
+    读取位置 since 之后的变更
+
+    返回 (按表分组的 {upserted, deleted}, 新令牌, 是否还有更多)。变更日志中每行只保留最近一次操作，
+    因此同一行不会同时出现在 upserted 和 deleted 中；被修改的行按列投影一次性批量读取。
+    尚未结束的事务写入的变更不返回，令牌也不会越过它们（见 crud_change_log.committed_conditions）。
+    """
+    entries = db.query(
+        models.ChangeLog.xact_id, models.ChangeLog.id, models.ChangeLog.table_name,
+        models.ChangeLog.row_id, models.ChangeLog.operation,
+    ).filter(
+        crud_change_log.after(db, since), *crud_change_log.committed_conditions(db)
+    ).order_by(*crud_change_log.order_by_position(db)).limit(limit + 1).all()
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+    token = (entries[-1].xact_id, entries[-1].id) if entries else tuple(since)
+
+    upserted: Dict[str, List[int]] = {name: [] for name in SYNC_SOURCES}
+    changes = {name: {"upserted": [], "deleted": []} for name in SYNC_SOURCES}
+    for entry in entries:
+        if entry.table_name not in SYNC_SOURCES:
+            continue
+        if entry.operation == "D":
+            changes[entry.table_name]["deleted"].append(entry.row_id)
+        else:
+            upserted[entry.table_name].append(entry.row_id)
+
+    for name, ids in upserted.items():
+        if ids:
+            changes[name]["upserted"] = _load_rows(db, name, ids)
+    return changes, token, has_more
+
+
+def _load_rows(db: Session, name: str, ids: List[int]) -> List[Dict[str, Any]]:
+    """按ID批量读取一张表的行，并按列表接口的字段类型序列化"""
+    schema, fields, build_select, id_column = SYNC_SOURCES[name]
+    rows = []
+    for start in range(0, len(ids), SYNC_CHUNK_SIZE):
+        chunk = ids[start:start + SYNC_CHUNK_SIZE]
+        rows.extend(dict(row) for row in db.execute(build_select().where(id_column.in_(chunk))).mappings())
+    return serialize_fields(schema, fields, rows)
@@ -1,7 +1,18 @@
+import logging
+import threading
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from .database import engine, Base, SessionLocal
 from . import models
 from .api.api_router import api_router
+from .config import settings
+from .crud import crud_order_expiry
+from .models.change_log import check_change_log_support
+
+logger = logging.getLogger(__name__)
+
+# 增量同步依赖数据库触发器，不支持的数据库直接拒绝启动
+check_change_log_support(engine)
 
 # 创建数据库表
 Base.metadata.create_all(bind=engine)
@@ -29,10 +40,37 @@ Base.metadata.create_all(bind=engine)
 # # create_initial_admin()
 
 
+def run_expiry_scanner(stop: threading.Event, interval: int):
+    """后台定期扫描即将到期的合同，写入到期提醒队列"""
+    while not stop.is_set():
+        db = SessionLocal()
+        try:
+            crud_order_expiry.scan_expiring_orders(db)
+        except Exception:
+            logger.exception("Order expiry scan failed")
+        finally:
+            db.close()
+        stop.wait(interval)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 只在显式设置 ORDER_EXPIRY_SCAN_INTERVAL 时启用（每个 worker 各起一个线程，仅适合单 worker 部署）
+    stop = threading.Event()
+    if settings.ORDER_EXPIRY_SCAN_INTERVAL > 0:
+        threading.Thread(
+            target=run_expiry_scanner, args=(stop, settings.ORDER_EXPIRY_SCAN_INTERVAL),
+            name="order-expiry-scanner", daemon=True,
+        ).start()
+    yield
+    stop.set()
+
+
 app = FastAPI(
     title="巨炜科技客户管理系统 API",
     description="一套完整的客户关系管理（CRM）解决方案",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 
@@ -7,6 +7,11 @@ from .product import Product
 from .sales_follow import SalesFollow
 from .service_record import ServiceRecord
 from .activity import AuditLog
+from .table_version import TableVersion
+from .change_log import ChangeLog
+from .order_reminder import OrderExpiryReminder, OrderExpiryScan
+from .customer_status_change import CustomerStatusChange
+from . import customer_counters  # 注册客户计数的维护监听，须在关联模型之后导入
 # This file is intentionally left blank for now.
 # We will use a dynamic import mechanism in the audit script and main application
 # to avoid circular dependencies that can arise from complex model relationships.
@@ -5,13 +5,13 @@ from ..database import Base
 
 class AuditLog(Base):
     """审计日志模型"""
-    __tablename__ = a"ud"it_l""o"gs"
+    __tablename__ = "audit_logs"
     id = Column(Integer, primary_key=True, index=True)
     action = Column(String, nullable=False) # 操作，如 create_customer
     details = Column(Text) # 操作详情
 
     # 关联操作人
-    employee_id = Column(Integer, ForeignKey("employees""."id))
-    employee = relationship(E"mplo"yee"", back_populates=a"ud"it_log""s")
+    employee_id = Column(Integer, ForeignKey("employees.id"))
+    employee = relationship("Employee", back_populates="audit_logs")
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
\ No newline at end of file
@@ -0,0 +1,106 @@
+from sqlalchemy import Column, BigInteger, Integer, String, DateTime, Index, DDL, event
+from sqlalchemy.sql import func
+from ..database import Base
+
+class ChangeLog(Base):
+    """
+    数据变更日志（增量同步用）
+
+    由触发器维护（SQLite 与 PostgreSQL），每个 (表, 行) 只保留最近一次变更：再次变更时旧记录被替换，
+    删除的行留下 operation='D' 的墓碑。id 使用 AUTOINCREMENT（PostgreSQL 为序列）保证单调递增、不会复用。
+
+    读取位置为 (xact_id, id)。SQLite 写入串行提交，xact_id 恒为 0，按 id 顺序即提交顺序；PostgreSQL 上
+    id 在插入时分配，并发事务可能乱序提交，因此 xact_id 记录写入事务的事务号，读取时只返回
+    xact_id 小于当前快照 xmin 的记录（这些事务都已结束），见 crud_change_log。
+    """
+    __tablename__ = "change_log"
+    __table_args__ = (
+        Index("ix_change_log_table_name_row_id", "table_name", "row_id", unique=True),
+        Index("ix_change_log_xact_id_id", "xact_id", "id").ddl_if(dialect="postgresql"),
+        {'sqlite_autoincrement': True, 'extend_existing': True},
+    )
+
+    id = Column(Integer, primary_key=True)
+    table_name = Column(String, nullable=False)
+    row_id = Column(Integer, nullable=False)
+    operation = Column(String(1), nullable=False) # U: 新增或修改, D: 删除
+    changed_at = Column(DateTime(timezone=True), server_default=func.now())
+    xact_id = Column(BigInteger, nullable=False, server_default="0") # 写入事务的事务号，仅 PostgreSQL
+
+
+# 需要增量同步的表
+CHANGE_LOG_TABLES = ("customers", "contacts", "orders", "sales_follows", "service_records")
+
+
+def change_log_trigger_ddl(table_name: str):
+    """为一张表生成插入、更新、删除三个 SQLite 触发器的建立语句"""
+    upsert = (
+        "INSERT OR REPLACE INTO change_log(table_name, row_id, operation, changed_at) "
+        "VALUES ('{table}', {row}.id, '{op}', CURRENT_TIMESTAMP);"
+    )
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS {table_name}_change_log_ai AFTER INSERT ON {table_name} BEGIN "
+        + upsert.format(table=table_name, row="new", op="U") + " END",
+        f"CREATE TRIGGER IF NOT EXISTS {table_name}_change_log_au AFTER UPDATE ON {table_name} BEGIN "
+        + upsert.format(table=table_name, row="new", op="U") + " END",
+        f"CREATE TRIGGER IF NOT EXISTS {table_name}_change_log_ad AFTER DELETE ON {table_name} BEGIN "
+        + upsert.format(table=table_name, row="old", op="D") + " END",
+    ]
+
+
+CHANGE_LOG_DDL = [
+    statement for table_name in CHANGE_LOG_TABLES for statement in change_log_trigger_ddl(table_name)
+]
+
+# PostgreSQL：所有表共用一个触发器函数。序列号在插入时分配而不是在提交时，并发事务可能以乱序提交，
+# 因此同时记下事务号，读取方按 (xact_id, id) 排序并以快照 xmin 为上限，不需要让写入事务排队
+CHANGE_LOG_POSTGRESQL_FUNCTION = """
+CREATE OR REPLACE FUNCTION change_log_record() RETURNS trigger AS $$
+DECLARE
+    changed_id integer;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        changed_id := OLD.id;
+    ELSE
+        changed_id := NEW.id;
+    END IF;
+    DELETE FROM change_log WHERE table_name = TG_TABLE_NAME AND row_id = changed_id;
+    INSERT INTO change_log(table_name, row_id, operation, changed_at, xact_id)
+    VALUES (TG_TABLE_NAME, changed_id, CASE WHEN TG_OP = 'DELETE' THEN 'D' ELSE 'U' END, CURRENT_TIMESTAMP,
+            pg_current_xact_id()::text::bigint);
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+"""
+
+
+def change_log_postgresql_trigger_ddl(table_name: str):
+    """为一张表生成 PostgreSQL 行级触发器的建立语句（可重复执行）"""
+    return [
+        f"DROP TRIGGER IF EXISTS {table_name}_change_log ON {table_name}",
+        f"CREATE TRIGGER {table_name}_change_log AFTER INSERT OR UPDATE OR DELETE ON {table_name} "
+        "FOR EACH ROW EXECUTE FUNCTION change_log_record()",
+    ]
+
+
+CHANGE_LOG_POSTGRESQL_DDL = [CHANGE_LOG_POSTGRESQL_FUNCTION] + [
+    statement for table_name in CHANGE_LOG_TABLES for statement in change_log_postgresql_trigger_ddl(table_name)
+]
+
+# 支持变更日志触发器的数据库，其他数据库上增量同步和到期扫描的续期检测都会静默失效
+CHANGE_LOG_DIALECTS = ("sqlite", "postgresql")
+
+
+def check_change_log_support(engine) -> None:
+    """启动时检查数据库是否支持变更日志触发器"""
+    if engine.dialect.name not in CHANGE_LOG_DIALECTS:
+        raise RuntimeError(
+            f"change_log triggers are only maintained on {', '.join(CHANGE_LOG_DIALECTS)}, not {engine.dialect.name}"
+        )
+
+
+# 触发器引用多张业务表，须在全部表建好之后创建
+for _statement in CHANGE_LOG_DDL:
+    event.listen(Base.metadata, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+for _statement in CHANGE_LOG_POSTGRESQL_DDL:
+    event.listen(Base.metadata, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
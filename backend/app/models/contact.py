@@ -4,7 +4,7 @@ from ..database import Base
 
 class Contact(Base):
     """联系人模型"""
-    __tablename__ = "contac"ts""
+    __tablename__ = "contacts"
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
     position = Column(String) # 职位
@@ -14,5 +14,5 @@ class Contact(Base):
     notes = Column(Text) # 备注
 
     # 关联客户
-    customer_id = Column(Integer, ForeignKey(c"ustome"rs"."id), nullable=False)
-    customer = relationship(C"usto"mer"", back_populates="contac"ts"")
\ No newline at end of file
+    customer_id = Column(Integer, ForeignKey("customers.id"), nullable=False, index=True)
+    customer = relationship("Customer", back_populates="contacts")
\ No newline at end of file
@@ -1,5 +1,5 @@
 import enum
-from sqlalchemy import Column, Integer, String, Enum, ForeignKey, Text, DateTime, Boolean
+from sqlalchemy import Column, Integer, String, Enum, ForeignKey, Text, DateTime, Boolean, Index, DDL, event
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from ..database import Base
@@ -15,32 +15,98 @@ class CustomerStatus(str, enum.Enum):
 class Customer(Base):
     """客户模型"""
     __tablename__ = "customers"
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        Index("ix_customers_province_city", "province", "city"),
+        Index("ix_customers_sales_id_status", "sales_id", "status"),
+        Index("ix_customers_next_follow_at", "next_follow_at"),
+        Index("ix_customers_latest_intention_level", "latest_intention_level"),
+        {'extend_existing': True},
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     company = Column(String, nullable=False, index=True)  # 客户单位名称
     industry = Column(String)  # 行业类别
     province = Column(String)  # 省份
-    city = Column(String)  # 城市
+    city = Column(String, index=True)  # 城市
     address = Column(String)  # 详细地址
     website = Column(String)  # 公司网站
     scale = Column(String)  # 公司规模
-    status = Column(Enum(CustomerStatus), nullable=False, default=CustomerStatus.LEAD)
+    status = Column(Enum(CustomerStatus), nullable=False, default=CustomerStatus.LEAD, index=True)
     notes = Column(Text)  # 客户备注
 
     # 关联销售负责人
     sales_id = Column(Integer, ForeignKey("employees.id"))
-    # sales = relationship("Employee", foreign_keys=[sales_id], back_populates="sales_customers")
+    sales = relationship("Employee", foreign_keys=[sales_id], back_populates="sales_customers")
 
     # 关联客服负责人
-    service_id = Column(Integer, ForeignKey("employees.id"))
-    # service = relationship("Employee", foreign_keys=[service_id], back_populates="service_customers")
+    service_id = Column(Integer, ForeignKey("employees.id"), index=True)
+    service = relationship("Employee", foreign_keys=[service_id], back_populates="service_customers")
 
     # 关联联系人
-    # contacts = relationship("Contact", back_populates="customer", cascade="all, delete-orphan")
-    # sales_follows = relationship("SalesFollow", back_populates="customer", cascade="all, delete-orphan")
-    # orders = relationship("Order", back_populates="customer", cascade="all, delete-orphan")
-    # service_records = relationship("ServiceRecord", back_populates="customer", cascade="all, delete-orphan")
+    contacts = relationship("Contact", back_populates="customer", cascade="all, delete-orphan")
+    sales_follows = relationship("SalesFollow", back_populates="customer", cascade="all, delete-orphan")
+    # 订单和服务记录是财务/售后历史，不随客户级联删除（有这些记录的客户不能删除）
+    orders = relationship("Order", back_populates="customer")
+    service_records = relationship("ServiceRecord", back_populates="customer")
+    status_changes = relationship("CustomerStatusChange", back_populates="customer", cascade="all, delete-orphan")
+
+    # 关联记录计数与最新跟进摘要，由 customer_counters 在关联记录写入的同一事务中维护，不要直接赋值
+    contact_count = Column(Integer, nullable=False, default=0, server_default="0")
+    follow_count = Column(Integer, nullable=False, default=0, server_default="0")
+    order_count = Column(Integer, nullable=False, default=0, server_default="0")
+    service_record_count = Column(Integer, nullable=False, default=0, server_default="0")
+    last_follow_at = Column(DateTime, nullable=True)  # 最近一次跟进时间
+    next_follow_at = Column(DateTime, nullable=True)  # 最近一次跟进约定的下次跟进时间
+    latest_intention_level = Column(String, nullable=True)  # 最近一次跟进的意向等级
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    @property
+    def sales_name(self):
+        """销售负责人姓名（列表查询时 sales 已预加载）"""
+        return self.sales.name if self.sales else None
+
+    @property
+    def service_name(self):
+        """客服负责人姓名（列表查询时 service 已预加载）"""
+        return self.service.name if self.service else None
+
+
+
+# 客户全文检索索引（仅 SQLite）
+# customers_fts 是以 customers 为外部内容表的 FTS5 虚拟表，由下面的触发器保持同步。
+# trigram 分词器按连续三个字符切分，中文公司名无需分词词典即可做子串匹配。
+CUSTOMER_FTS_COLUMNS = ("company", "industry", "address", "notes")
+
+CUSTOMER_FTS_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS customers_fts USING fts5(
+        company, industry, address, notes,
+        content='customers', content_rowid='id', tokenize='trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS customers_fts_ai AFTER INSERT ON customers BEGIN
+        INSERT INTO customers_fts(rowid, company, industry, address, notes)
+        VALUES (new.id, new.company, new.industry, new.address, new.notes);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS customers_fts_ad AFTER DELETE ON customers BEGIN
+        INSERT INTO customers_fts(customers_fts, rowid, company, industry, address, notes)
+        VALUES ('delete', old.id, old.company, old.industry, old.address, old.notes);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS customers_fts_au AFTER UPDATE OF company, industry, address, notes ON customers BEGIN
+        INSERT INTO customers_fts(customers_fts, rowid, company, industry, address, notes)
+        VALUES ('delete', old.id, old.company, old.industry, old.address, old.notes);
+        INSERT INTO customers_fts(rowid, company, industry, address, notes)
+        VALUES (new.id, new.company, new.industry, new.address, new.notes);
+    END
+    """,
+]
+
+for _statement in CUSTOMER_FTS_DDL:
+    event.listen(Customer.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
@@ -0,0 +1,137 @@
+from typing import Any, Dict, Iterable, List
+from sqlalchemy import event, func, select, update
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import get_history, set_committed_value
+from sqlalchemy.orm.util import identity_key
+from .contact import Contact
+from .customer import Customer
+from .order import Order
+from .sales_follow import SalesFollow
+from .service_record import ServiceRecord
+from .table_version import bump_table_versions
+
+# 各关联模型中影响客户计数/跟进摘要的属性，这些属性变化时需要重新计算所属客户
+COUNTED_ATTRIBUTES = {
+    Contact: ("customer_id",),
+    SalesFollow: ("customer_id", "follow_date", "next_follow_date", "intention_level"),
+    Order: ("customer_id",),
+    ServiceRecord: ("customer_id",),
+}
+
+# 每条 UPDATE / 对账查询处理的最大客户数量
+COUNTER_CHUNK_SIZE = 500
+
+
+def _count(model):
+    return select(func.count()).select_from(model).where(model.customer_id == Customer.id).scalar_subquery()
+
+
+def _latest_follow(column):
+    """最近一次跟进（按跟进时间、ID 倒序）的某一列"""
+    return (
+        select(column)
+        .where(SalesFollow.customer_id == Customer.id)
+        .order_by(SalesFollow.follow_date.desc(), SalesFollow.id.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+
+
+def counter_values() -> Dict[str, Any]:
+    """客户计数列 -> 按关联表重新计算的表达式（引用 customers.id，用于 UPDATE 或 SELECT）"""
+    return {
+        "contact_count": _count(Contact),
+        "follow_count": _count(SalesFollow),
+        "order_count": _count(Order),
+        "service_record_count": _count(ServiceRecord),
+        "last_follow_at": select(func.max(SalesFollow.follow_date)).where(SalesFollow.customer_id == Customer.id).scalar_subquery(),
+        "next_follow_at": _latest_follow(SalesFollow.next_follow_date),
+        "latest_intention_level": _latest_follow(SalesFollow.intention_level),
+    }
+
+
+COUNTER_COLUMNS = tuple(counter_values())
+
+
+def recalculate_customer_counters(session: Session, customer_ids: Iterable[int]) -> None:
+    """
+    按关联表重新计算客户的计数与最新跟进摘要
+
+    在当前事务中按客户分批执行 UPDATE（只读取这些客户的关联记录，走各表的 customer_id 索引），
+    并同步会话中已加载客户对象的对应属性。customers.updated_at 保持不变。
+    通过 session.execute 批量写入联系人、跟进、订单或服务记录后需手动调用。
+
+    UPDATE 前先按 ID 顺序 SELECT ... FOR UPDATE 锁定这些客户：PostgreSQL READ COMMITTED 下，
+    UPDATE 等到行锁后只重新检查目标行，子查询仍使用语句开始时的快照，会漏掉刚提交的关联记录；
+    先加锁后，UPDATE 在锁释放后才开始，读取的是最新提交的数据。SQLite 写事务串行，不需要加锁。
+    """
+    customer_ids = sorted({customer_id for customer_id in customer_ids if customer_id is not None})
+    if not customer_ids:
+        return
+    connection = session.connection()
+    for offset in range(0, len(customer_ids), COUNTER_CHUNK_SIZE):
+        chunk = customer_ids[offset:offset + COUNTER_CHUNK_SIZE]
+        connection.execute(select(Customer.id).where(Customer.id.in_(chunk)).order_by(Customer.id).with_for_update())
+        connection.execute(
+            update(Customer.__table__)
+            .where(Customer.id.in_(chunk))
+            .values(**counter_values(), updated_at=Customer.updated_at)
+        )
+        rows = connection.execute(
+            select(Customer.id, *[getattr(Customer, name) for name in COUNTER_COLUMNS]).where(Customer.id.in_(chunk))
+        )
+        for row in rows:
+            customer = session.identity_map.get(identity_key(Customer, row.id))
+            if customer is not None:
+                for name in COUNTER_COLUMNS:
+                    set_committed_value(customer, name, getattr(row, name))
+    bump_table_versions(session, [Customer.__tablename__])
+
+
+def find_counter_drift(session: Session, customer_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+    """对比客户已保存的计数与重新计算的结果，返回 {客户ID: {列: (已保存, 应为)}}，只包含不一致的客户"""
+    expected = counter_values()
+    drift = {}
+    for offset in range(0, len(customer_ids), COUNTER_CHUNK_SIZE):
+        chunk = customer_ids[offset:offset + COUNTER_CHUNK_SIZE]
+        rows = session.execute(
+            select(
+                Customer.id,
+                *[getattr(Customer, name).label(name) for name in COUNTER_COLUMNS],
+                *[expected[name].label(f"expected_{name}") for name in COUNTER_COLUMNS],
+            ).where(Customer.id.in_(chunk))
+        )
+        for row in rows:
+            columns = {
+                name: (getattr(row, name), getattr(row, f"expected_{name}"))
+                for name in COUNTER_COLUMNS
+                if getattr(row, name) != getattr(row, f"expected_{name}")
+            }
+            if columns:
+                drift[row.id] = columns
+    return drift
+
+
+def _load_previous_customer(target, value, oldvalue, initiator):
+    return value
+
+
+# active_history 让修改 customer_id 前先加载旧值（属性已过期时也是如此），
+# 这样 flush 后的历史中能拿到原客户，原客户的计数也会被重新计算
+for _model in COUNTED_ATTRIBUTES:
+    event.listen(_model.customer_id, "set", _load_previous_customer, active_history=True, retval=True)
+
+
+@event.listens_for(Session, "after_flush")
+def _sync_customer_counters(session, flush_context):
+    """联系人、跟进、订单、服务记录增删或改变所属客户（跟进还包括时间、意向）时，在同一事务中更新客户计数"""
+    customer_ids = set()
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        attributes = COUNTED_ATTRIBUTES.get(type(obj))
+        if attributes is None:
+            continue
+        if obj in session.dirty and not any(get_history(obj, name).has_changes() for name in attributes):
+            continue
+        customer_ids.add(obj.customer_id)
+        customer_ids.update(get_history(obj, "customer_id").deleted)
+    recalculate_customer_counters(session, customer_ids)
@@ -0,0 +1,30 @@
+from sqlalchemy import Column, Integer, Enum, ForeignKey, DateTime, Index
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from ..database import Base
+from .customer import CustomerStatus
+
+class CustomerStatusChange(Base):
+    """
+    客户状态变更历史
+
+    客户创建（from_status 为空）和每次修改状态时各写入一行，供销售漏斗统计使用。
+    sales_id 为变更时客户的销售负责人，stage_seconds 为客户在 from_status 阶段停留的秒数。
+    """
+    __tablename__ = "customer_status_changes"
+    __table_args__ = (
+        Index("ix_customer_status_changes_customer_id_changed_at", "customer_id", "changed_at"),
+        Index("ix_customer_status_changes_changed_at", "changed_at"),
+        Index("ix_customer_status_changes_sales_id_changed_at", "sales_id", "changed_at"),
+        {'extend_existing': True},
+    )
+
+    id = Column(Integer, primary_key=True)
+    customer_id = Column(Integer, ForeignKey("customers.id"), nullable=False)
+    from_status = Column(Enum(CustomerStatus), nullable=True)
+    to_status = Column(Enum(CustomerStatus), nullable=False)
+    sales_id = Column(Integer, ForeignKey("employees.id"), nullable=True)
+    stage_seconds = Column(Integer, nullable=True)
+    changed_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    customer = relationship("Customer", back_populates="status_changes")
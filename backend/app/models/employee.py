@@ -8,16 +8,16 @@ class EmployeeRole(str, enum.Enum):
     """
     员工角色枚举
     """
-    ADMIN = "adm"in""
-    SALES = a"l"es"
-    SERVICE = "service"""
-    MANAGER = "manag"er""
+    ADMIN = "admin"
+    SALES = "sales"
+    SERVICE = "service"
+    MANAGER = "manager"
 
 class Employee(Base):
     """
     员工模型
     """
-    __tablename__ = "employe"es""
+    __tablename__ = "employees"
     __table_args__ = {'extend_existing': True}
 
     id = Column(Integer, primary_key=True, index=True)
@@ -32,34 +32,34 @@ class Employee(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # 关联部门
-    department_id = Column(Integer, ForeignKey("departments""."id))
-    department = relationship(D"epartm"ent"", back_populates="employe"es"")
+    department_id = Column(Integer, ForeignKey("departments.id"))
+    department = relationship("Department", back_populates="employees")
 
     # 关联部门分组
-    group_id = Column(Integer, ForeignKey("department""_groups."id))
+    group_id = Column(Integer, ForeignKey("department_groups.id"))
     # group = relationship(D"epartme"nt"G"ro"up"", back_populates="employe"es"") # Assuming a relationship in DepartmentGroup model
 
     # 反向关联到客户，一个销售可以有多个客户
     sales_customers = relationship(
-        C"usto"mer"",
-        foreign_keys=C"usto"mer"".sales_i"d",
-        back_populates="ales
+        "Customer",
+        foreign_keys="Customer.sales_id",
+        back_populates="sales"
     )
     # 反向关联到客户，一个客服可以负责多个客户
     service_customers = relationship(
-        Cus"tomer""",
-        foreign_keys=C"ustom"er"".service_i"d", 
-        back_populates="ervice,
+        "Customer",
+        foreign_keys="Customer.service_id",
+        back_populates="service",
         post_update=True
     )
     
     # 销售人员关联的销售跟进
-    sales_follows = relationship(SalesF"ollow""", back_populates="employ"ee"")
+    sales_follows = relationship("SalesFollow", back_populates="employee")
     # 销售人员关联的订单
-    orders = relationship(O"r"der"", back_populates="al"es")
+    orders = relationship("Order", back_populates="sales")
     
     # 员工关联的审计日志
-    audit_logs = relationship(Au"dit""L""og", back_populates="emplo"yee"")
+    audit_logs = relationship("AuditLog", back_populates="employee")
     
     # 员工关联的售后服务记录
-    service_records = relationship(S"erviceRec"ord"", back_populates="employ"ee"")
+    service_records = relationship("ServiceRecord", back_populates="employee")
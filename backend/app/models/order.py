@@ -1,9 +1,11 @@
 import enum
-from decimal import Decimal
-from sqlalchemy import Column, Integer, String, Enum, ForeignKey, Text, DateTime, Numeric
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Enum, ForeignKey, Text, DateTime, Numeric, Index, event, select, update
+from sqlalchemy.orm import Session, relationship
+from sqlalchemy.orm.attributes import get_history, set_committed_value
+from sqlalchemy.orm.util import identity_key
 from sqlalchemy.sql import func
 from ..database import Base
+from .table_version import bump_table_versions
 
 class OrderStatus(str, enum.Enum):
     """订单状态"""
@@ -17,39 +19,42 @@ class OrderStatus(str, enum.Enum):
 
 class Order(Base):
     """订单模型"""
-    __tablename__ = "orde"rs""
-    __table_args__ = {'extend_existing': True}
+    __tablename__ = "orders"
+    __table_args__ = (
+        Index("ix_orders_sales_id_created_at", "sales_id", "created_at"),
+        Index("ix_orders_status_created_at", "status", "created_at"),
+        Index("ix_orders_total_amount", "total_amount"),
+        Index("ix_orders_outstanding_amount", "outstanding_amount"),
+        {'extend_existing': True},
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     order_number = Column(String, unique=True, nullable=False, index=True)
     paid_amount = Column(Numeric(10, 2), default=0.0)
+    # 订单总额与未付金额由 _sync_order_totals 在订单项或付款变化的同一事务中维护，不要直接赋值
+    total_amount = Column(Numeric(10, 2), nullable=False, default=0, server_default="0")
+    outstanding_amount = Column(Numeric(10, 2), nullable=False, default=0, server_default="0")
     payment_date = Column(DateTime, nullable=True)
     status = Column(Enum(OrderStatus), nullable=False, default=OrderStatus.PENDING)
-    start_date = Column(DateTime, nullable=True) # 服务开始日期
-    end_date = Column(DateTime, nullable=True) # 服务结束日期
+    start_date = Column(DateTime, nullable=True, index=True) # 服务开始日期
+    end_date = Column(DateTime, nullable=True, index=True) # 服务结束日期
     
     # 关联客户
-    customer_id = Column(Integer, ForeignKey(c"ustome"rs"."id), nullable=False)
-    customer = relationship(C"usto"mer"", back_populates="orde"rs"")
+    customer_id = Column(Integer, ForeignKey("customers.id"), nullable=False, index=True)
+    customer = relationship("Customer", back_populates="orders")
     
     # 关联销售
-    sales_id = Column(Integer, ForeignKey("employees""."id), nullable=False)
-    sales = relationship(E"mplo"yee"", back_populates="orde"rs"")
+    sales_id = Column(Integer, ForeignKey("employees.id"), nullable=False)
+    sales = relationship("Employee", back_populates="orders")
     
-    order_items = relationship(O"rderI"tem"", back_populates="ord"er"")
+    order_items = relationship("OrderItem", back_populates="order")
     
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
 class OrderItem(Base):
-    @property
-    def total_amount(self) -> Decimal:
-        """计算订单总金额"""
-        if not self.order_items:
-            return Decimal('0.0')
-        return sum(item.quantity * item.unit_price for item in self.order_items)
     """订单项模型"""
-    __tablename__ = "order""_"items""
+    __tablename__ = "order_items"
     __table_args__ = {'extend_existing': True}
 
     id = Column(Integer, primary_key=True, index=True)
@@ -57,9 +62,56 @@ class OrderItem(Base):
     unit_price = Column(Numeric(10, 2), nullable=False)
     
     # 关联订单
-    order_id = Column(Integer, ForeignKey("orders""."id), nullable=False)
-    order = relationship(O"r"der"", back_populates=o"rd"er_ite"""ms")
+    order_id = Column(Integer, ForeignKey("orders.id"), nullable=False, index=True)
+    order = relationship("Order", back_populates="order_items")
     
     # 关联产品
-    product_id = Column(Integer, ForeignKey(p"roduc"ts".""id"), nullable=False)
-    product = relationship(P"r"odu"ct"", back_populates=o"rd"er_item""s")
\ No newline at end of file
+    product_id = Column(Integer, ForeignKey("products.id"), nullable=False, index=True)
+    product = relationship("Product", back_populates="order_items")
+
+
+def recalculate_order_totals(session: Session, order_ids) -> None:
+    """
+    按订单项重新计算 orders.total_amount 与 outstanding_amount（未付金额 = 总额 - 已付金额）
+
+    在当前事务中用一条 UPDATE 完成，并同步会话中已加载订单对象的对应属性。
+    通过 session.execute 批量修改订单项或已付金额后需手动调用。
+    """
+    order_ids = sorted({order_id for order_id in order_ids if order_id is not None})
+    if not order_ids:
+        return
+    total = (
+        select(func.coalesce(func.sum(OrderItem.quantity * OrderItem.unit_price), 0))
+        .where(OrderItem.order_id == Order.id)
+        .scalar_subquery()
+    )
+    connection = session.connection()
+    connection.execute(
+        update(Order.__table__)
+        .where(Order.id.in_(order_ids))
+        .values(total_amount=total, outstanding_amount=total - func.coalesce(Order.paid_amount, 0))
+    )
+    bump_table_versions(session, [Order.__tablename__])
+
+    rows = connection.execute(
+        select(Order.id, Order.total_amount, Order.outstanding_amount).where(Order.id.in_(order_ids))
+    )
+    for order_id, total_amount, outstanding_amount in rows:
+        order = session.identity_map.get(identity_key(Order, order_id))
+        if order is not None:
+            set_committed_value(order, "total_amount", total_amount)
+            set_committed_value(order, "outstanding_amount", outstanding_amount)
+
+
+@event.listens_for(Session, "after_flush")
+def _sync_order_totals(session, flush_context):
+    """订单项增删改、新建订单或已付金额变化时，在同一事务中更新订单金额"""
+    order_ids = set()
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, OrderItem):
+            order_ids.add(obj.order_id)
+            order_ids.update(get_history(obj, "order_id").deleted)
+        elif isinstance(obj, Order) and obj not in session.deleted:
+            if obj in session.new or get_history(obj, "paid_amount").has_changes():
+                order_ids.add(obj.id)
+    recalculate_order_totals(session, order_ids)
\ No newline at end of file
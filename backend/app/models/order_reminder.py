@@ -0,0 +1,44 @@
+from sqlalchemy import Column, BigInteger, Integer, Date, DateTime, ForeignKey, Index, UniqueConstraint
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from ..database import Base
+
+class OrderExpiryReminder(Base):
+    """
+    合同到期提醒队列
+
+    由到期扫描任务写入，每个订单在每个提醒窗口（如到期前 30/15/7 天）对同一到期日只生成一条；
+    合同续期（end_date 改变）后会按新的到期日重新提醒。
+    """
+    __tablename__ = "order_expiry_reminders"
+    __table_args__ = (
+        UniqueConstraint("order_id", "window_days", "end_date", name="uq_order_expiry_reminders_order_window_end"),
+        Index("ix_order_expiry_reminders_end_date_id", "end_date", "id"),
+        Index("ix_order_expiry_reminders_window_end_date_id", "window_days", "end_date", "id"),
+        {'extend_existing': True},
+    )
+
+    id = Column(Integer, primary_key=True)
+    order_id = Column(Integer, ForeignKey("orders.id"), nullable=False)
+    window_days = Column(Integer, nullable=False) # 提醒窗口（到期前天数）
+    end_date = Column(DateTime, nullable=False) # 生成提醒时订单的服务结束日期
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    order = relationship("Order")
+
+
+class OrderExpiryScan(Base):
+    """
+    到期扫描进度（每个提醒窗口一行）
+
+    scanned_until 之前（含当天）到期的订单已扫描过，下次只按 end_date 索引读取新进入窗口的日期；
+    (change_log_xact_id, change_log_id) 为已处理的变更日志位置，用于补充扫描期间被修改了服务结束日期的订单。
+    """
+    __tablename__ = "order_expiry_scans"
+    __table_args__ = {'extend_existing': True}
+
+    window_days = Column(Integer, primary_key=True)
+    scanned_until = Column(Date, nullable=True)
+    change_log_id = Column(Integer, nullable=False, default=0)
+    change_log_xact_id = Column(BigInteger, nullable=False, default=0, server_default="0")
+    scanned_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
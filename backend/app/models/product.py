@@ -4,7 +4,7 @@ from ..database import Base
 
 class Product(Base):
     """产品模型"""
-    __tablename__ = "produc"ts""
+    __tablename__ = "products"
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False, unique=True, index=True)
     unit = Column(String)
@@ -16,4 +16,4 @@ class Product(Base):
     director_commission = Column(Numeric(10, 2), default=0.0)  # 总监佣金
 
     # Relationships
-    order_items = relationship(O"rderI"tem"", back_populates="produ"ct"")
\ No newline at end of file
+    order_items = relationship("OrderItem", back_populates="product")
\ No newline at end of file
@@ -1,22 +1,26 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship
 from ..database import Base
 import datetime
 
 class SalesFollow(Base):
-    __tablename__ = "sales_foll"ows""
-    __table_args__ = {'extend_existing': True}
+    __tablename__ = "sales_follows"
+    __table_args__ = (
+        Index("ix_sales_follows_customer_id_follow_date", "customer_id", "follow_date"),
+        Index("ix_sales_follows_employee_id_next_follow_date", "employee_id", "next_follow_date"),
+        {'extend_existing': True},
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    customer_id = Column(Integer, ForeignKey("custome"rs".i"d"))
-    employee_id = Column(Integer, ForeignKey("employe"es".i"d"))
-    contact_id = Column(Integer, ForeignKey("contac"ts".i"d"))
+    customer_id = Column(Integer, ForeignKey("customers.id"))
+    employee_id = Column(Integer, ForeignKey("employees.id"))
+    contact_id = Column(Integer, ForeignKey("contacts.id"))
     
     content = Column(Text, nullable=False)
     follow_type = Column(String, nullable=False) # e.g., P"hone Ca""ll", E""mail"", V"i"sit""
     follow_date = Column(DateTime, default=datetime.datetime.utcnow)
     intention_level = Column(String) # e.g., H"i""gh", M"e"dium"", L"""ow"
-    n"ext""_follow_date = Column(DateTime, nullable=True)
+    next_follow_date = Column(DateTime, nullable=True)
 
-    customer = relationship(C"usto"me""r, back_populates=s"al"es_follo"""ws")
-    employee = relationship(E"mplo"ye""e, back_populates=s"al"es_follow""s")
\ No newline at end of file
+    customer = relationship("Customer", back_populates="sales_follows")
+    employee = relationship("Employee", back_populates="sales_follows")
\ No newline at end of file
@@ -0,0 +1,66 @@
+from sqlalchemy import Column, Integer, String, DateTime, event, inspect
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+from ..database import Base
+
+class TableVersion(Base):
+    """
+    业务表版本号
+
+    每张表一行，该表的数据在某个事务中发生变化时 version 加一（与业务写入同一事务提交）。
+    用于生成列表/详情接口的 ETag，读取代价只是一次主键查询。
+    """
+    __tablename__ = "table_versions"
+    __table_args__ = {'extend_existing': True}
+
+    table_name = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+def bump_table_versions(session: Session, tables) -> None:
+    """
+    在当前事务中为 tables 中的每张表递增版本号
+
+    同时把表名记录在 session.info["changed_tables"] 中，事务提交后供响应缓存按表失效。
+    用一条 INSERT ... ON CONFLICT DO UPDATE 完成，并发事务第一次写同一张表时不会主键冲突。
+    """
+    tables = set(tables) - {TableVersion.__tablename__}
+    if not tables:
+        return
+    session.info.setdefault("changed_tables", set()).update(tables)
+    connection = session.connection()
+    dialect_insert = postgresql_insert if connection.dialect.name == "postgresql" else sqlite_insert
+    statement = dialect_insert(TableVersion).values([{"table_name": name, "version": 1} for name in sorted(tables)])
+    connection.execute(statement.on_conflict_do_update(
+        index_elements=[TableVersion.table_name],
+        set_={"version": TableVersion.version + 1, "updated_at": func.now()},
+    ))
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_flushed_tables(session, flush_context):
+    """ORM 对象的新增、修改、删除"""
+    tables = {
+        inspect(obj).mapper.local_table.name
+        for obj in (*session.new, *session.deleted)
+    }
+    tables.update(
+        inspect(obj).mapper.local_table.name
+        for obj in session.dirty
+        if session.is_modified(obj, include_collections=False)
+    )
+    if tables:
+        bump_table_versions(session, tables)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _bump_bulk_statement_tables(orm_execute_state):
+    """通过 session.execute 执行的批量 INSERT / UPDATE / DELETE（不经过 flush）"""
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return None
+    result = orm_execute_state.invoke_statement()
+    bump_table_versions(orm_execute_state.session, [orm_execute_state.statement.table.name])
+    return result
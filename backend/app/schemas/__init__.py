@@ -1,8 +1,10 @@
 from .token import Token, TokenData
 from .employee import Employee, EmployeeCreate, EmployeeUpdate
-from .customer import Customer, CustomerCreate, CustomerUpdate
+from .customer import Customer, CustomerCreate, CustomerUpdate, CustomerPage, CustomerSuggestion, CustomerImportResult, CustomerAssignSales, CustomerAssignService, CustomerAssignResult, CustomerFacets, CustomerFacetValue
 from .contact import Contact, ContactCreate, ContactUpdate
 from .product import Product, ProductCreate, ProductUpdate
-from .order import Order, OrderCreate, OrderItem, OrderItemCreate, OrderFinancialUpdate
-from .sales_follow import SalesFollow, SalesFollowCreate, SalesFollowUpdate
-from .service_record import ServiceRecord, ServiceRecordCreate, ServiceRecordUpdate
\ No newline at end of file
+from .order import Order, OrderCreate, OrderItem, OrderItemCreate, OrderFinancialUpdate, OrderPage, OrderBulkCreate, OrderBulkResult, OrderSummary, OrderFinanceRow, OrderExpiryReminder, OrderExpiringPage
+from .sales_follow import SalesFollow, SalesFollowCreate, SalesFollowUpdate, SalesFollowAgendaItem, SalesFollowAgendaPage
+from .service_record import ServiceRecord, ServiceRecordCreate, ServiceRecordUpdate, ServiceRecordCustomerSummary, ServiceRecordCustomerSummaryPage
+from .sync import SyncChanges, SyncTableChanges
+from .analytics import Funnel, FunnelPeriod, FunnelStage, FunnelStageTotal
\ No newline at end of file
@@ -0,0 +1,32 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from ..models.customer import CustomerStatus
+
+class FunnelStage(BaseModel):
+    """某周期内一个状态的进出统计"""
+    status: CustomerStatus
+    entered: int  # 进入该状态的客户数（含新建）
+    exited: int  # 离开该状态的客户数
+    advanced: int  # 离开时推进到漏斗后续阶段的客户数
+    conversion_rate: Optional[float] = None  # advanced / exited
+    avg_days_in_stage: Optional[float] = None  # 离开的客户在该状态平均停留天数
+
+class FunnelPeriod(BaseModel):
+    period: str
+    sales_id: Optional[int] = None
+    sales_name: Optional[str] = None
+    stages: List[FunnelStage]
+    won: int
+    lost: int
+    conversion_rate: Optional[float] = None  # 成交 / (成交 + 流失)
+
+class FunnelStageTotal(BaseModel):
+    """当前处于某状态的客户数"""
+    status: CustomerStatus
+    customers: int
+
+class Funnel(BaseModel):
+    """销售漏斗统计"""
+    period: str
+    stages: List[FunnelStageTotal]
+    periods: List[FunnelPeriod]
@@ -1,5 +1,6 @@
+from datetime import datetime
 from pydantic import BaseModel, ConfigDict
-from typing import Optional, List
+from typing import Optional, List, Union
 from ..models.customer import CustomerStatus
 from .contact import Contact, ContactCreateForCustomer
 
@@ -39,5 +40,64 @@ class Customer(CustomerBase):
     sales_name: Optional[str] = None # Calculated in the endpoint
     service_name: Optional[str] = None # Calculated in the endpoint
     contacts: List[Contact] = []
-    
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    # 关联记录计数与最新跟进摘要（随关联记录写入自动维护）
+    contact_count: int = 0
+    follow_count: int = 0
+    order_count: int = 0
+    service_record_count: int = 0
+    last_follow_at: Optional[datetime] = None
+    next_follow_at: Optional[datetime] = None
+    latest_intention_level: Optional[str] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+# 客户单位联想结果
+class CustomerSuggestion(BaseModel):
+    id: int
+    company: str
+
+# 批量导入结果
+class CustomerImportError(BaseModel):
+    row: int # 文件中的行号（表头为第 1 行）
+    errors: List[str]
+
+class CustomerImportResult(BaseModel):
+    total_rows: int
+    imported: int
+    failed: int
+    errors: List[CustomerImportError] = []
+    errors_truncated: bool = False
+    aborted: Optional[str] = None # 文件读取中断的原因
+    elapsed_seconds: float
+    rows_per_second: float
+
+# 批量分配负责人
+class CustomerAssignSales(BaseModel):
+    customer_ids: List[int]
+    sales_id: Optional[int] = None # 为空表示取消分配
+
+class CustomerAssignService(BaseModel):
+    customer_ids: List[int]
+    service_id: Optional[int] = None # 为空表示取消分配
+
+class CustomerAssignResult(BaseModel):
+    requested: int # 请求中去重后的客户数
+    updated: int # 实际更新的客户数
+
+# 游标分页返回模型
+class CustomerPage(BaseModel):
+    items: List[Customer]
+    next_cursor: Optional[str] = None # 为空表示已经是最后一页
+
+# 筛选项分面统计
+class CustomerFacetValue(BaseModel):
+    value: Union[int, str] # 筛选时使用的值（销售负责人为员工ID）
+    label: Optional[str] = None # 显示名，为空时显示 value
+    count: int
+
+class CustomerFacets(BaseModel):
+    industry: List[CustomerFacetValue] = []
+    province: List[CustomerFacetValue] = []
+    city: List[CustomerFacetValue] = []
+    status: List[CustomerFacetValue] = []
+    sales: List[CustomerFacetValue] = []
\ No newline at end of file
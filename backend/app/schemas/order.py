@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, List
 from decimal import Decimal
 from datetime import datetime
@@ -36,13 +36,96 @@ class Order(OrderBase):
     id: int
     order_number: str
     paid_amount: Optional[Decimal] = None
-    total_amount: Decimal
+    total_amount: Decimal # 订单总额（订单项金额之和）
+    outstanding_amount: Decimal # 未付金额（总额 - 已付金额）
     payment_date: Optional[datetime] = None
     order_items: List[OrderItem] = []
     
     class Config:
         from_attributes = True
 
+# 批量创建订单
+class OrderBulkCreate(BaseModel):
+    orders: List[OrderCreate] = Field(..., max_length=1000)
+
+class OrderBulkCreated(BaseModel):
+    index: int # 在请求 orders 中的位置
+    id: int
+    order_number: str
+
+class OrderBulkError(BaseModel):
+    index: int # 在请求 orders 中的位置
+    errors: List[str]
+
+class OrderBulkResult(BaseModel):
+    requested: int
+    created: List[OrderBulkCreated] = []
+    failed: int
+    errors: List[OrderBulkError] = []
+
+# 财务视图（view=finance）的扁平订单行
+class OrderFinanceItem(BaseModel):
+    id: int
+    order_id: int
+    product_id: int
+    product_name: Optional[str] = None
+    unit: Optional[str] = None
+    base_price: Optional[Decimal] = None # 产品定价
+    unit_price: Decimal # 实际售价
+    quantity: int
+    sales_commission: Optional[Decimal] = None # 单位提成
+    manager_commission: Optional[Decimal] = None
+    director_commission: Optional[Decimal] = None
+
+class OrderFinanceRow(BaseModel):
+    id: int
+    order_number: str
+    customer_id: int
+    company: str
+    sales_id: int
+    sales_name: Optional[str] = None
+    status: OrderStatus
+    total_amount: Decimal
+    paid_amount: Optional[Decimal] = None
+    outstanding_amount: Decimal
+    payment_date: Optional[datetime] = None
+    start_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None
+    created_at: Optional[datetime] = None
+    order_items: List[OrderFinanceItem] = []
+
+# 订单金额与提成汇总
+class OrderSummary(BaseModel):
+    order_count: int
+    total_amount: Decimal
+    paid_amount: Decimal
+    outstanding_amount: Decimal
+    sales_commission: Decimal
+    manager_commission: Decimal
+    director_commission: Decimal
+
+# 游标分页返回模型
+class OrderPage(BaseModel):
+    items: List[Order]
+    next_cursor: Optional[str] = None
+
+# 合同到期提醒
+class OrderExpiryReminder(BaseModel):
+    id: int
+    order_id: int
+    window_days: int # 提醒窗口（到期前天数）
+    end_date: datetime
+    created_at: Optional[datetime] = None
+    order_number: str
+    status: OrderStatus
+    customer_id: int
+    customer_name: Optional[str] = None
+    sales_id: int
+
+class OrderExpiringPage(BaseModel):
+    items: List[OrderExpiryReminder]
+    next_cursor: Optional[str] = None
+
 # For updating financial info
 class OrderFinancialUpdate(BaseModel):
     status: OrderStatus
@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional
+from typing import List, Literal, Optional
 
 class SalesFollowBase(BaseModel):
     content: str
@@ -22,4 +22,22 @@ class SalesFollow(SalesFollowBase):
     follow_date: datetime
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+# 跟进待办
+class SalesFollowAgendaItem(BaseModel):
+    id: int
+    customer_id: int
+    customer_name: Optional[str] = None
+    employee_id: int
+    employee_name: Optional[str] = None
+    follow_type: str
+    content: str
+    intention_level: Optional[str] = None
+    follow_date: datetime
+    next_follow_date: datetime
+    status: Literal["overdue", "today", "upcoming"] # 已逾期 / 今天 / 之后
+
+class SalesFollowAgendaPage(BaseModel):
+    items: List[SalesFollowAgendaItem]
+    next_cursor: Optional[str] = None
\ No newline at end of file
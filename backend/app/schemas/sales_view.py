@@ -15,7 +15,7 @@ class SalesView(BaseModel):
     intention_level: Optional[str] = None
     sales_follow_count: int
     order_count: int
-    next_follow_date: Optional[datetime.date] = None
+    next_follow_date: Optional[datetime.datetime] = None
     sales_owner_name: Optional[str] = None
     updated_at: Optional[datetime.datetime] = None
 
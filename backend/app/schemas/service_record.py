@@ -1,11 +1,11 @@
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 class ServiceRecordBase(BaseModel):
     title: str
     description: Optional[str] = None
-    status: Optional[str] = "O"pen""
+    status: Optional[str] = "Open"
 class ServiceRecordCreate(ServiceRecordBase):
     customer_id: int
     employee_id: int # The employee who is assigned to this record
@@ -24,4 +24,22 @@ class ServiceRecord(ServiceRecordBase):
     closed_at: Optional[datetime] = None
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+# 按客户汇总的服务记录（售后服务页面每个客户一行）
+class ServiceRecordCustomerSummary(BaseModel):
+    id: int # 客户ID
+    province: Optional[str] = None
+    city: Optional[str] = None
+    company: str
+    contact_count: int
+    record_count: int
+    open_count: int # 未结束的服务记录数
+    sales_id: Optional[int] = None
+    sales_name: Optional[str] = None
+    service_id: Optional[int] = None
+    service_name: Optional[str] = None
+
+class ServiceRecordCustomerSummaryPage(BaseModel):
+    items: List[ServiceRecordCustomerSummary]
+    next_cursor: Optional[str] = None # 为空表示已经是最后一页
@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+from typing import Any, Dict, List
+
+# 单张表的增量变更
+class SyncTableChanges(BaseModel):
+    upserted: List[Dict[str, Any]] = [] # 新增或修改后的完整行（字段与列表接口一致）
+    deleted: List[int] = [] # 已删除行的ID（墓碑）
+
+# 增量同步结果
+class SyncChanges(BaseModel):
+    token: str # 下次请求时作为 since 传回
+    has_more: bool = False # 为 True 时应立即用新令牌继续拉取
+    changes: Dict[str, SyncTableChanges] = {}
@@ -0,0 +1,66 @@
+import hashlib
+from datetime import timezone
+from email.utils import format_datetime
+from typing import Optional, Tuple
+from fastapi import Depends, HTTPException, Request, Response
+from sqlalchemy.orm import Session
+from ..database import get_db
+from ..models.table_version import TableVersion
+
+
+def table_etag(db: Session, tables: Tuple[str, ...]) -> Tuple[str, Optional[str]]:
+    """
+    根据相关表的版本号生成弱 ETag 和 Last-Modified
+
+    只做一次 table_versions 主键查询，不触碰业务表。表从未被修改过时版本视为 0。
+    """
+    rows = {
+        name: (version, updated_at)
+        for name, version, updated_at in db.query(
+            TableVersion.table_name, TableVersion.version, TableVersion.updated_at
+        ).filter(TableVersion.table_name.in_(tables))
+    }
+    tag = ";".join(f"{name}:{rows.get(name, (0, None))[0]}" for name in tables)
+    etag = 'W/"%s"' % hashlib.sha1(tag.encode()).hexdigest()[:20]
+
+    modified = [updated_at for _, updated_at in rows.values() if updated_at is not None]
+    if not modified:
+        return etag, None
+    latest = max(modified)
+    if latest.tzinfo is None:  # SQLite 的 CURRENT_TIMESTAMP 为不带时区的 UTC 时间
+        latest = latest.replace(tzinfo=timezone.utc)
+    return etag, format_datetime(latest, usegmt=True)
+
+
+def _etag_matches(header: Optional[str], etag: str) -> bool:
+    """If-None-Match 比较采用弱比较，W/ 前缀不影响匹配"""
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    return any(
+        (candidate[2:] if candidate.startswith("W/") else candidate) == opaque
+        for candidate in (part.strip() for part in header.split(","))
+    )
+
+
+def conditional_get(*tables: str):
+    """
+    条件 GET 依赖：为响应加上 ETag，请求的 If-None-Match 命中时直接返回 304
+
+    tables 为响应依赖的全部表（各接口模块的 TABLES），任一表的版本号变化时 ETag 随之变化。
+    在路由的 dependencies 中使用，例如 dependencies=[conditional_get("customers")]。
+    304 在查询业务数据之前返回，不执行列表查询也不做序列化。
+    只按 If-None-Match 判断；Last-Modified 仅精确到秒，只作参考。
+    """
+    def dependency(request: Request, response: Response, db: Session = Depends(get_db)):
+        etag, last_modified = table_etag(db, tables)
+        headers = {"ETag": etag}
+        if last_modified:
+            headers["Last-Modified"] = last_modified
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            raise HTTPException(status_code=304, headers=headers)
+        response.headers.update(headers)
+
+    return Depends(dependency)
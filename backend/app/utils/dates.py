@@ -0,0 +1,121 @@
+from datetime import date, datetime, time, timedelta, timezone
+from typing import List, Optional, Tuple, Union
+from zoneinfo import ZoneInfo
+from sqlalchemy import DateTime, String, bindparam, case, func
+from sqlalchemy.types import TypeDecorator
+from ..config import settings
+
+
+class _RangeBound(TypeDecorator):
+    """
+    日期区间边界参数
+
+    SQLite 以文本保存时间并按字符串比较：CURRENT_TIMESTAMP 写入的值不带微秒，
+    而默认的 DATETIME 参数会带上 ".000000"，导致恰好在零点的记录被错误地排除。
+    边界总是整秒，因此在 SQLite 上按 "YYYY-MM-DD HH:MM:SS" 绑定；其他数据库使用原生时间类型。
+    """
+    impl = DateTime
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "sqlite":
+            return dialect.type_descriptor(String())
+        return dialect.type_descriptor(self.impl_instance)
+
+    def process_bind_param(self, value, dialect):
+        if value is not None and dialect.name == "sqlite":
+            return value.strftime("%Y-%m-%d %H:%M:%S")
+        return value
+
+
+def _day_start(day: date, column) -> datetime:
+    """
+    某天零点
+
+    带时区的列（如 created_at，由数据库按 UTC 写入）把 BUSINESS_TIMEZONE 的零点换算为 UTC；
+    不带时区的列（如 start_date/end_date）保存的就是业务日期，直接使用当天零点。
+    """
+    start = datetime.combine(day, time.min)
+    if getattr(column.type, "timezone", False):
+        return start.replace(tzinfo=ZoneInfo(settings.BUSINESS_TIMEZONE)).astimezone(timezone.utc)
+    return start
+
+
+def business_today() -> date:
+    """BUSINESS_TIMEZONE 下的今天"""
+    return datetime.now(ZoneInfo(settings.BUSINESS_TIMEZONE)).date()
+
+
+def utc_offset_segments(start: datetime, end: datetime) -> List[Tuple[Optional[datetime], int]]:
+    """
+    BUSINESS_TIMEZONE 在 start~end（UTC，不带时区）之间的 UTC 偏移分段
+
+    返回 [(分段结束时刻, 偏移秒数), ...]，最后一段的结束时刻为 None。逐天检查偏移，
+    偏移变化时按秒二分找出切换时刻（夏令时切换总在整秒）。
+    """
+    zone = ZoneInfo(settings.BUSINESS_TIMEZONE)
+
+    def offset(seconds: int) -> int:
+        return int(datetime.fromtimestamp(seconds, zone).utcoffset().total_seconds())
+
+    moment = int(start.replace(tzinfo=timezone.utc).timestamp())
+    last = int(end.replace(tzinfo=timezone.utc).timestamp())
+    current = offset(moment)
+    segments = []
+    while moment < last:
+        step = min(moment + 86400, last)
+        if offset(step) != current:
+            low, high = moment, step
+            while high - low > 1:
+                middle = (low + high) // 2
+                if offset(middle) == current:
+                    low = middle
+                else:
+                    high = middle
+            segments.append((datetime.fromtimestamp(high, timezone.utc).replace(tzinfo=None), current))
+            current = offset(high)
+        moment = step
+    segments.append((None, current))
+    return segments
+
+
+def business_datetime(column, dialect_name: str, start: Optional[datetime] = None, end: Optional[datetime] = None):
+    """
+    把按 UTC 保存的带时区时间列换算为 BUSINESS_TIMEZONE 的本地时间
+
+    PostgreSQL 用 AT TIME ZONE 逐行换算；SQLite 只支持固定偏移，按 start~end（列值的范围）内
+    的 UTC 偏移分段用 CASE 选择每行对应的偏移，夏令时前后的记录各自按当时的偏移换算。
+    """
+    if dialect_name == "postgresql":
+        return func.timezone(settings.BUSINESS_TIMEZONE, column)
+    if start is None or end is None:
+        segments = [(None, int(datetime.now(ZoneInfo(settings.BUSINESS_TIMEZONE)).utcoffset().total_seconds()))]
+    else:
+        segments = utc_offset_segments(start, end)
+    *changes, (_, last) = segments
+    local = func.datetime(column, f"{last} seconds")
+    if not changes:
+        return local
+    return case(
+        *[
+            (column < bindparam(None, until, type_=_RangeBound), func.datetime(column, f"{offset} seconds"))
+            for until, offset in changes
+        ],
+        else_=local,
+    )
+
+
+def day_range(column, start: Optional[Union[date, datetime]], end: Optional[Union[date, datetime]]) -> List:
+    """
+    按天筛选的半开区间条件：start 当天零点 <= column < end 次日零点
+
+    条件直接作用于原始列，可以使用该列上的索引；start/end 为 datetime 时只取日期部分。
+    """
+    conditions = []
+    if start:
+        day = start.date() if isinstance(start, datetime) else start
+        conditions.append(column >= bindparam(None, _day_start(day, column), type_=_RangeBound))
+    if end:
+        day = end.date() if isinstance(end, datetime) else end
+        conditions.append(column < bindparam(None, _day_start(day + timedelta(days=1), column), type_=_RangeBound))
+    return conditions
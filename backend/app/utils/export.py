@@ -0,0 +1,75 @@
+import csv
+import enum
+import io
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Iterable, Iterator, Sequence
+from fastapi.responses import StreamingResponse
+from .fastjson import dumps
+
+# 每次向客户端写出的行数：在系统调用次数与响应延迟之间折中
+EXPORT_CHUNK_ROWS = 500
+
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def _plain(value: Any) -> Any:
+    """将枚举、日期、金额转换为可写入 CSV/JSON 的普通值"""
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def iter_csv(fields: Sequence[str], rows: Iterable[Sequence[Any]]) -> Iterator[bytes]:
+    """逐块生成 CSV 字节流，带 BOM 以便 Excel 正确识别中文"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    yield ("\ufeff" + buffer.getvalue()).encode("utf-8")
+    buffer.seek(0)
+    buffer.truncate()
+
+    count = 0
+    for row in rows:
+        writer.writerow([_plain(value) for value in row])
+        count += 1
+        if count % EXPORT_CHUNK_ROWS == 0:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def iter_ndjson(fields: Sequence[str], rows: Iterable[Sequence[Any]]) -> Iterator[bytes]:
+    """逐块生成 NDJSON 字节流，每行一个 JSON 对象（枚举、日期、金额由 dumps 直接编码）"""
+    lines = []
+    for row in rows:
+        lines.append(dumps(dict(zip(fields, row))))
+        if len(lines) >= EXPORT_CHUNK_ROWS:
+            yield b"\n".join(lines) + b"\n"
+            lines = []
+    if lines:
+        yield b"\n".join(lines) + b"\n"
+
+
+def export_response(fields: Sequence[str], rows: Iterable[Sequence[Any]], format: str, filename: str) -> StreamingResponse:
+    """
+    构造流式导出响应
+
+    rows 应为惰性迭代器（通常是 yield_per 的查询结果），响应边读边写，
+    服务器内存占用与导出行数无关，表头在查询执行前就已发送。
+    """
+    generate = iter_ndjson if format == "ndjson" else iter_csv
+    return StreamingResponse(
+        generate(fields, rows),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{format}"'},
+    )
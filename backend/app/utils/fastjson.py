@@ -0,0 +1,45 @@
+import enum
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # 未安装 orjson 时退回标准库 json
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    """orjson/json 不能直接编码的类型：Decimal 输出为字符串，与 pydantic 的 JSON 模式一致"""
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(value: Any) -> bytes:
+    """
+    将普通 Python 数据直接编码为 UTF-8 JSON 字节
+
+    orjson 原生支持 datetime/date/枚举，不需要先转换成中间字典；中文不转义。
+    """
+    if orjson is not None:
+        return orjson.dumps(value, default=_default)
+    return json.dumps(value, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    基于 orjson 的 JSON 响应
+
+    只用于没有 response_model 的接口（如统计、聚合结果）；带 response_model 的接口由 FastAPI
+    直接用 pydantic 的 dump_json 序列化，指定自定义响应类反而会退回较慢的 Python 字典路径。
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,87 @@
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type
+from fastapi import HTTPException, Response
+from pydantic import BaseModel, TypeAdapter, create_model
+from sqlalchemy import select
+
+_NO_PAGE = object()
+
+
+def parse_fields(fields: Optional[str], available: Iterable[str]) -> Optional[Tuple[str, ...]]:
+    """
+    解析 fields=a,b,c 查询参数
+
+    未传 fields 时返回 None（调用方按原方式返回完整对象）；否则校验字段名并返回去重后的元组，
+    id 总是包含在内（游标分页和前端定位行都依赖它）。
+    """
+    if fields is None:
+        return None
+    requested = [name.strip() for name in fields.split(",") if name.strip()]
+    available = set(available)
+    unknown = [name for name in requested if name not in available]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return tuple(dict.fromkeys(["id", *requested]))
+
+
+def select_fields(columns: Dict[str, Any], fields: Iterable[str]):
+    """只选择 fields 中有对应列的字段，生成列投影的 Core select()"""
+    return select(*[columns[name].label(name) for name in fields if name in columns])
+
+
+@lru_cache(maxsize=256)
+def _projection_model(schema: Type[BaseModel], fields: Tuple[str, ...]) -> Type[BaseModel]:
+    """按字段子集派生响应模型，字段类型与完整模型一致，因此序列化结果也一致"""
+    return create_model(
+        f"{schema.__name__}Fields",
+        **{name: (schema.model_fields[name].annotation, schema.model_fields[name]) for name in fields},
+    )
+
+
+@lru_cache(maxsize=256)
+def _projection_adapter(schema: Type[BaseModel], fields: Tuple[str, ...]) -> TypeAdapter:
+    return TypeAdapter(List[_projection_model(schema, fields)])
+
+
+@lru_cache(maxsize=256)
+def _projection_page_adapter(schema: Type[BaseModel], fields: Tuple[str, ...]) -> TypeAdapter:
+    """游标分页的 {items, next_cursor} 结构"""
+    page = create_model(
+        f"{schema.__name__}FieldsPage",
+        items=(List[_projection_model(schema, fields)], ...),
+        next_cursor=(Optional[str], None),
+    )
+    return TypeAdapter(page)
+
+
+def serialize_fields(schema: Type[BaseModel], fields: Tuple[str, ...], rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """按 schema 中对应字段的类型把投影结果转换为可直接输出的 JSON 数据"""
+    adapter = _projection_adapter(schema, fields)
+    return adapter.dump_python(adapter.validate_python(rows), mode="json")
+
+
+def projection_response(
+    schema: Type[BaseModel],
+    fields: Tuple[str, ...],
+    rows: List[Dict[str, Any]],
+    next_cursor=_NO_PAGE,
+    response: Optional[Response] = None,
+) -> Response:
+    """
+    返回只包含 fields 的列表响应
+
+    传入 next_cursor 时返回与游标分页一致的 {items, next_cursor} 结构。
+    行数据校验一次后由预编译的 TypeAdapter 直接输出 JSON 字节，不经过中间字典和 json.dumps。
+    直接返回 Response 时 FastAPI 不会合并依赖注入的 response 上的头，
+    传入该 response 可保留依赖（如 conditional_get 的 ETag / Last-Modified）设置的响应头。
+    """
+    if next_cursor is _NO_PAGE:
+        adapter = _projection_adapter(schema, fields)
+        content = adapter.dump_json(adapter.validate_python(rows))
+    else:
+        adapter = _projection_page_adapter(schema, fields)
+        content = adapter.dump_json(adapter.validate_python({"items": rows, "next_cursor": next_cursor}))
+    headers = None
+    if response is not None:
+        headers = {k: v for k, v in response.headers.items() if k != "content-length"}
+    return Response(content, media_type="application/json", headers=headers)
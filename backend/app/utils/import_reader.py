@@ -0,0 +1,95 @@
+import codecs
+import csv
+import re
+from typing import Any, BinaryIO, Dict, Iterator, Optional
+
+try:
+    from openpyxl import load_workbook
+except ImportError:  # 未安装 openpyxl 时仅支持 CSV
+    load_workbook = None
+
+# 中文表头到字段名的映射，英文字段名可直接使用
+HEADER_ALIASES = {
+    "客户单位": "company",
+    "行业类别": "industry",
+    "省份": "province",
+    "城市": "city",
+    "详细地址": "address",
+    "公司网站": "website",
+    "公司规模": "scale",
+    "客户状态": "status",
+    "联系人": "contact_name",
+    "联系电话": "contact_phone",
+    "是否关键人": "contact_is_key_person",
+}
+
+# contact_name / contact_phone_2 / 联系人2 等列组成第 N 个联系人
+CONTACT_COLUMN = re.compile(r"^contact_(name|phone|is_key_person)(?:_?(\d+))?$")
+
+TRUE_VALUES = {"1", "true", "yes", "y", "是"}
+
+
+def normalize_header(header: Optional[str]) -> str:
+    header = (header or "").strip()
+    match = re.match(r"^(联系人|联系电话|是否关键人)(\d+)$", header)
+    if match:
+        return f"{HEADER_ALIASES[match.group(1)]}_{match.group(2)}"
+    return HEADER_ALIASES.get(header, header.lower())
+
+
+def build_customer_row(values: Dict[str, Any]) -> Dict[str, Any]:
+    """将一行扁平的表格数据转换为 CustomerCreate 可接受的结构"""
+    row: Dict[str, Any] = {}
+    contacts: Dict[int, Dict[str, Any]] = {}
+    for key, value in values.items():
+        if isinstance(value, str):
+            value = value.strip()
+        if value in (None, ""):
+            continue
+        match = CONTACT_COLUMN.match(key)
+        if match:
+            field, number = match.group(1), int(match.group(2) or 1)
+            if field == "is_key_person":
+                value = str(value).strip().lower() in TRUE_VALUES
+            elif field == "phone":
+                value = str(value)
+            contacts.setdefault(number, {})[field] = value
+        elif key:
+            row[key] = value
+    row["contacts"] = [contacts[number] for number in sorted(contacts)]
+    return row
+
+
+def iter_csv_rows(file: BinaryIO) -> Iterator[Dict[str, Any]]:
+    """逐行读取 CSV（UTF-8，可带 BOM），不会一次性载入整个文件"""
+    reader = csv.reader(codecs.getreader("utf-8-sig")(file))
+    headers = [normalize_header(h) for h in next(reader, [])]
+    for values in reader:
+        if not any(v.strip() for v in values):
+            continue
+        yield build_customer_row(dict(zip(headers, values)))
+
+
+def iter_xlsx_rows(file: BinaryIO) -> Iterator[Dict[str, Any]]:
+    """以只读流式模式逐行读取 XLSX 的第一个工作表"""
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        headers = [normalize_header(str(h) if h is not None else "") for h in next(rows, ())]
+        for values in rows:
+            if all(v in (None, "") for v in values):
+                continue
+            yield build_customer_row(dict(zip(headers, values)))
+    finally:
+        workbook.close()
+
+
+def iter_import_rows(file: BinaryIO, filename: str) -> Iterator[Dict[str, Any]]:
+    """根据文件扩展名选择解析器"""
+    if filename.lower().endswith((".xlsx", ".xlsm")):
+        if load_workbook is None:
+            raise ValueError("XLSX import requires openpyxl")
+        return iter_xlsx_rows(file)
+    if filename.lower().endswith(".csv"):
+        return iter_csv_rows(file)
+    raise ValueError("Unsupported file type, expected .csv or .xlsx")
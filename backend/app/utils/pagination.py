@@ -0,0 +1,64 @@
+import base64
+import json
+from typing import Any, Optional, Tuple
+from fastapi import HTTPException
+
+# 游标分页每页的最大条数；offset 分页不受限制，保持旧客户端的行为
+MAX_CURSOR_LIMIT = 1000
+
+
+def encode_cursor(*values: Any) -> str:
+    """将排序键编码为不透明的游标字符串"""
+    raw = json.dumps(list(values), separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[Any, ...]]:
+    """解析游标字符串，空游标表示从第一页开始"""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(values, list) or not values:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return tuple(values)
+
+
+def cursor_to_after_id(cursor: Optional[str]) -> Optional[int]:
+    """
+    将列表接口的 cursor 参数转换为 after_id
+
+    未传 cursor 返回 None（使用 offset 分页）；空字符串表示游标模式的第一页。
+    """
+    if cursor is None:
+        return None
+    last_key = decode_cursor(cursor)
+    if last_key is None:
+        return 0
+    try:
+        return int(last_key[0])
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def check_cursor_limit(limit: int) -> None:
+    """游标分页要求 1 <= limit <= MAX_CURSOR_LIMIT（limit 为 0 时无法生成下一页游标）"""
+    if not 1 <= limit <= MAX_CURSOR_LIMIT:
+        raise HTTPException(
+            status_code=422, detail=f"limit must be between 1 and {MAX_CURSOR_LIMIT} with cursor pagination"
+        )
+
+
+def split_page(rows: list, limit: int, key) -> Tuple[list, Optional[str]]:
+    """
+    拆分多取一行的查询结果，返回当前页数据和下一页游标。
+
+    调用方应查询 limit + 1 行，多出的一行仅用于判断是否还有下一页。
+    """
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(*key(rows[-1]))
@@ -0,0 +1,271 @@
+import hashlib
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Optional, Set, Tuple
+from urllib.parse import parse_qsl
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from ..config import settings
+from .conditional import _etag_matches
+
+try:
+    import redis
+except ImportError:  # 未安装 redis 时只能使用进程内缓存
+    redis = None
+
+
+@dataclass
+class CachedResponse:
+    """缓存的响应（只缓存状态码 200、带完整响应体的响应）"""
+    body: bytes
+    headers: Dict[str, str]
+    media_type: Optional[str] = None
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + sum(len(k) + len(v) for k, v in self.headers.items())
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0  # 因容量或过期被淘汰
+    invalidations: int = 0  # 因表数据变化被删除
+
+
+class MemoryCacheBackend:
+    """
+    进程内 LRU 缓存，带 TTL 和总字节数上限
+
+    每个标签（表名）有一个版本号，缓存键中包含相关标签的当前版本；表被写入后版本加一，
+    旧条目随即不可达并被立即删除。请求执行期间发生的写入也不会让旧数据写回缓存。
+    """
+
+    def __init__(self, max_bytes: int, default_ttl: float):
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[CachedResponse, float, Tuple[str, ...]]]" = OrderedDict()
+        self._tag_keys: Dict[str, Set[str]] = {}
+        self._tag_versions: Dict[str, int] = {}
+        self._bytes = 0
+
+    def tag_versions(self, tags: Tuple[str, ...]) -> Tuple[int, ...]:
+        with self._lock:
+            return tuple(self._tag_versions.get(tag, 0) for tag in tags)
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                self.stats.misses += 1
+                return None
+            entry, expires_at, _ = item
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                self.stats.evictions += 1
+                self.stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return entry
+
+    def set(self, key: str, entry: CachedResponse, tags: Tuple[str, ...], ttl: Optional[float] = None) -> None:
+        size = entry.size
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (entry, time.monotonic() + (ttl or self.default_ttl), tags)
+            self._bytes += size
+            for tag in tags:
+                self._tag_keys.setdefault(tag, set()).add(key)
+            while self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.stats.evictions += 1
+
+    def invalidate(self, tags: Iterable[str]) -> None:
+        with self._lock:
+            for tag in tags:
+                self._tag_versions[tag] = self._tag_versions.get(tag, 0) + 1
+                for key in list(self._tag_keys.pop(tag, ())):
+                    if key in self._entries:
+                        self._remove(key)
+                        self.stats.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tag_keys.clear()
+            self._bytes = 0
+
+    def info(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._bytes, "max_bytes": self.max_bytes}
+
+    def _remove(self, key: str) -> None:
+        entry, _, tags = self._entries.pop(key)
+        self._bytes -= entry.size
+        for tag in tags:
+            keys = self._tag_keys.get(tag)
+            if keys is not None:
+                keys.discard(key)
+
+
+class RedisCacheBackend:
+    """
+    基于 Redis 的共享缓存，适用于多 worker 部署
+
+    标签版本号保存在 Redis 中，任一 worker 写入后所有 worker 立即失效。内存上限由 Redis 的
+    maxmemory / allkeys-lru 配置控制，这里只维护本进程的命中统计。
+    """
+
+    def __init__(self, url: str, default_ttl: float, prefix: str = "sellsys:cache"):
+        if redis is None:
+            raise RuntimeError("RESPONSE_CACHE_REDIS_URL requires the redis package")
+        self.client = redis.Redis.from_url(url)
+        self.default_ttl = default_ttl
+        self.prefix = prefix
+        self.stats = CacheStats()
+
+    def tag_versions(self, tags: Tuple[str, ...]) -> Tuple[int, ...]:
+        values = self.client.mget([f"{self.prefix}:tag:{tag}" for tag in tags])
+        return tuple(int(value or 0) for value in values)
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        raw = self.client.get(f"{self.prefix}:entry:{key}")
+        if raw is None:
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        return pickle.loads(raw)
+
+    def set(self, key: str, entry: CachedResponse, tags: Tuple[str, ...], ttl: Optional[float] = None) -> None:
+        self.client.set(f"{self.prefix}:entry:{key}", pickle.dumps(entry), ex=int(ttl or self.default_ttl))
+
+    def invalidate(self, tags: Iterable[str]) -> None:
+        pipeline = self.client.pipeline()
+        for tag in tags:
+            pipeline.incr(f"{self.prefix}:tag:{tag}")
+        pipeline.execute()
+        self.stats.invalidations += 1
+
+    def clear(self) -> None:
+        for key in self.client.scan_iter(f"{self.prefix}:*"):
+            self.client.delete(key)
+
+    def info(self) -> Dict[str, int]:
+        return {}
+
+
+class ResponseCache:
+    """响应缓存入口，后端可在启动时通过 configure 替换"""
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def configure(self, backend) -> None:
+        self.backend = backend
+
+    def key(self, request: Request, tags: Tuple[str, ...]) -> str:
+        """缓存键：路径 + 排序后的查询参数 + 相关标签的当前版本"""
+        params = sorted((k, v) for k, v in parse_qsl(request.url.query, keep_blank_values=False))
+        versions = self.backend.tag_versions(tags)
+        raw = repr((request.url.path, params, tags, versions))
+        return hashlib.sha1(raw.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        return self.backend.get(key)
+
+    def set(self, key: str, entry: CachedResponse, tags: Tuple[str, ...], ttl: Optional[float] = None) -> None:
+        self.backend.set(key, entry, tags, ttl)
+
+    def invalidate(self, tags: Iterable[str]) -> None:
+        tags = set(tags)
+        if tags:
+            self.backend.invalidate(tags)
+
+    def stats(self) -> Dict[str, int]:
+        stats = self.backend.stats
+        return {
+            "hits": stats.hits,
+            "misses": stats.misses,
+            "evictions": stats.evictions,
+            "invalidations": stats.invalidations,
+            **self.backend.info(),
+        }
+
+
+def _default_backend():
+    if settings.RESPONSE_CACHE_REDIS_URL:
+        return RedisCacheBackend(settings.RESPONSE_CACHE_REDIS_URL, settings.RESPONSE_CACHE_TTL)
+    return MemoryCacheBackend(settings.RESPONSE_CACHE_MAX_BYTES, settings.RESPONSE_CACHE_TTL)
+
+
+response_cache = ResponseCache(_default_backend())
+
+
+def cache_response(*tags: str, ttl: Optional[float] = None) -> Callable:
+    """
+    标记 GET 接口的响应可缓存，tags 为响应所依赖的表名，任一表在事务中被修改时缓存随之失效
+
+    需要路由器使用 CachedRoute，例如 APIRouter(route_class=CachedRoute)。
+    """
+    def decorator(endpoint):
+        endpoint.cache_tags = tuple(tags)
+        endpoint.cache_ttl = ttl
+        return endpoint
+    return decorator
+
+
+class CachedRoute(APIRoute):
+    """对带 cache_response 标记的 GET 接口先查缓存，未命中时执行接口并缓存 200 响应"""
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        tags = getattr(self.endpoint, "cache_tags", None)
+        if not tags:
+            return handler
+        ttl = getattr(self.endpoint, "cache_ttl", None)
+
+        async def cached_handler(request: Request) -> Response:
+            if request.method != "GET":
+                return await handler(request)
+            key = response_cache.key(request, tags)
+            entry = response_cache.get(key)
+            if entry is not None:
+                etag = entry.headers.get("etag")
+                if etag and _etag_matches(request.headers.get("if-none-match"), etag):
+                    return Response(status_code=304, headers={"ETag": etag})
+                return Response(entry.body, headers=entry.headers, media_type=entry.media_type)
+
+            response = await handler(request)
+            body = getattr(response, "body", None)
+            if response.status_code == 200 and body is not None:
+                headers = {k: v for k, v in response.headers.items() if k != "content-length"}
+                response_cache.set(key, CachedResponse(body, headers, response.media_type), tags, ttl)
+            return response
+
+        return cached_handler
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_tables(session):
+    """事务提交后按被写入的表失效缓存（表名由 table_version 的写入监听记录）"""
+    tables = session.info.pop("changed_tables", None)
+    if tables:
+        response_cache.invalidate(tables)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back_tables(session):
+    session.info.pop("changed_tables", None)
+
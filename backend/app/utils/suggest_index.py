@@ -0,0 +1,147 @@
+import threading
+from bisect import bisect_left, insort
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    from pypinyin import lazy_pinyin
+except ImportError:  # 未安装 pypinyin 时只按名称前缀匹配
+    lazy_pinyin = None
+
+
+@lru_cache(maxsize=None)
+def _char_pinyin(char: str) -> str:
+    """单字拼音（按字缓存，避免对每个公司名做整句分词，首次加载数万条时仍然很快）"""
+    return "".join(lazy_pinyin(char)).replace(" ", "")
+
+
+def company_keys(company: str) -> List[str]:
+    """
+    生成公司名的检索键：名称本身、全拼和拼音首字母（均为小写）
+
+    例如 "巨炜科技" -> ["巨炜科技", "juweikeji", "jwkj"]
+    """
+    name = company.strip().lower()
+    if not name:
+        return []
+    keys = [name]
+    if lazy_pinyin is not None:
+        syllables = [syllable for syllable in map(_char_pinyin, name) if syllable]
+        full = "".join(syllables)
+        initials = "".join(syllable[0] for syllable in syllables)
+        keys.extend(key for key in (full, initials) if key and key not in keys)
+    return keys
+
+
+class CompanySuggestIndex:
+    """
+    客户单位名称的内存前缀索引
+
+    所有检索键保存在一个按 (键, 客户ID) 排序的数组中，前缀查询通过二分查找
+    定位区间后顺序读取，复杂度为 O(log n + 结果数)。新增、改名、删除客户时
+    增量维护，无需重建。首次查询时从数据库整体加载一次。
+
+    change_id 为索引已包含的变更日志位置 (xact_id, id)，调用方据此读取之后的客户变更并用 catch_up 追赶，
+    使其他 worker、脚本或批量导入的写入也能反映到本进程的索引中。
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._entries: List[Tuple[str, int]] = []
+        self._companies: Dict[int, str] = {}
+        self._loaded = False
+        self._change_id = (0, 0)
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    @property
+    def change_id(self) -> Tuple[int, int]:
+        return self._change_id
+
+    def load(self, rows, change_id: Tuple[int, int] = (0, 0)) -> None:
+        """用 (客户ID, 公司名) 序列整体重建索引，change_id 为读取这些行之前的变更日志位置"""
+        entries = []
+        companies = {}
+        for customer_id, company in rows:
+            if not company:
+                continue
+            companies[customer_id] = company
+            entries.extend((key, customer_id) for key in company_keys(company))
+        entries.sort()
+        with self._lock:
+            self._entries = entries
+            self._companies = companies
+            self._loaded = True
+            self._change_id = change_id
+
+    def invalidate(self) -> None:
+        """丢弃索引，下次查询时重新加载（批量写入后使用，避免逐条插入排序数组）"""
+        with self._lock:
+            self._entries = []
+            self._companies = {}
+            self._loaded = False
+            self._change_id = (0, 0)
+
+    def upsert(self, customer_id: int, company: Optional[str]) -> None:
+        """新增客户或客户改名后更新索引"""
+        with self._lock:
+            if not self._loaded:
+                return
+            if self._companies.get(customer_id) == company:
+                return
+            self._remove_locked(customer_id)
+            if company:
+                self._companies[customer_id] = company
+                for key in company_keys(company):
+                    insort(self._entries, (key, customer_id))
+
+    def catch_up(self, rows: Iterable[Tuple[int, Optional[str]]], removed: Iterable[int], change_id: Tuple[int, int]) -> None:
+        """应用变更日志中 change_id 之前的客户变更：rows 为新增或修改的 (客户ID, 公司名)，removed 为已删除的客户ID"""
+        with self._lock:
+            if not self._loaded:
+                return
+            for customer_id, company in rows:
+                self.upsert(customer_id, company)
+            for customer_id in removed:
+                self._remove_locked(customer_id)
+            self._change_id = max(self._change_id, change_id)
+
+    def remove(self, customer_id: int) -> None:
+        """删除客户后从索引中移除"""
+        with self._lock:
+            if self._loaded:
+                self._remove_locked(customer_id)
+
+    def _remove_locked(self, customer_id: int) -> None:
+        company = self._companies.pop(customer_id, None)
+        if company is None:
+            return
+        for key in company_keys(company):
+            position = bisect_left(self._entries, (key, customer_id))
+            if position < len(self._entries) and self._entries[position] == (key, customer_id):
+                del self._entries[position]
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[Tuple[int, str]]:
+        """返回名称、全拼或拼音首字母以 prefix 开头的前 limit 个客户 (ID, 公司名)"""
+        prefix = prefix.strip().lower()
+        if not prefix or limit <= 0:
+            return []
+        results = []
+        seen = set()
+        with self._lock:
+            position = bisect_left(self._entries, (prefix, -1))
+            while position < len(self._entries) and len(results) < limit:
+                key, customer_id = self._entries[position]
+                if not key.startswith(prefix):
+                    break
+                if customer_id not in seen:
+                    seen.add(customer_id)
+                    results.append((customer_id, self._companies[customer_id]))
+                position += 1
+        return results
+
+
+# 进程内单例；多进程部署时每个 worker 各自维护一份，查询前按变更日志追赶其他进程的写入
+customer_suggest_index = CompanySuggestIndex()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+订单日期筛选基准测试
+
+在临时 SQLite 文件中生成大量订单（默认 100 万），比较签订日期筛选的两种写法：
+1. 旧写法：date(created_at) BETWEEN 起 AND 止 —— 对列套函数，无法使用 created_at 索引
+2. 新写法：created_at >= 起始日零点 AND created_at < 结束日次日零点（utils.dates.day_range）
+
+分别输出 EXPLAIN QUERY PLAN 和 count / 首页查询的 p50/p99 延迟。
+
+用法: python scripts/benchmark_date_filters.py [--orders 1000000] [--days 7] [--repeat 20]
+"""
+import argparse
+import datetime
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import create_engine, func, insert, select
+from app import models
+from app.database import Base
+from app.models.change_log import CHANGE_LOG_TABLES
+from app.utils.dates import day_range
+
+BATCH_SIZE = 50000
+
+
+def seed(conn, orders: int):
+    """生成 orders 个订单，签订时间均匀分布在最近三年内"""
+    # 变更日志触发器会让每次插入多写一行，生成数据时先删除
+    for table_name in CHANGE_LOG_TABLES:
+        for suffix in ("ai", "au", "ad"):
+            conn.exec_driver_sql(f"DROP TRIGGER IF EXISTS {table_name}_change_log_{suffix}")
+    sales_id = conn.execute(insert(models.Employee).values(username="bench", hashed_password="x")).inserted_primary_key[0]
+    customer_id = conn.execute(insert(models.Customer).values(company="基准客户", sales_id=sales_id)).inserted_primary_key[0]
+
+    rng = random.Random(42)
+    end = datetime.datetime(2025, 12, 31)
+    span = 3 * 365 * 24 * 3600
+    for offset in range(0, orders, BATCH_SIZE):
+        conn.execute(insert(models.Order), [
+            {
+                "order_number": f"BENCH-{i:07d}",
+                "customer_id": customer_id,
+                "sales_id": sales_id,
+                "created_at": end - datetime.timedelta(seconds=rng.randrange(span)),
+            }
+            for i in range(offset, min(offset + BATCH_SIZE, orders))
+        ])
+
+
+def percentiles(samples: List[float]) -> str:
+    samples = sorted(samples)
+    p50 = statistics.median(samples)
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+    return f"p50={p50 * 1000:8.2f}ms  p99={p99 * 1000:8.2f}ms"
+
+
+def measure(func, repeat: int) -> List[float]:
+    func()  # 预热
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description='订单日期筛选基准测试')
+    parser.add_argument('--orders', type=int, default=1000000, help='订单数')
+    parser.add_argument('--days', type=int, default=7, help='筛选的天数')
+    parser.add_argument('--repeat', type=int, default=20, help='每项重复次数')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{directory}/benchmark.db")
+        Base.metadata.create_all(bind=engine)
+        started = time.perf_counter()
+        with engine.begin() as conn:
+            seed(conn, args.orders)
+        print(f"生成 {args.orders} 个订单：{time.perf_counter() - started:.1f}s")
+
+        end_day = datetime.date(2025, 6, 30)
+        start_day = end_day - datetime.timedelta(days=args.days - 1)
+        created_at = models.Order.created_at
+        predicates = {
+            "date(created_at)": [func.date(created_at) >= start_day.isoformat(), func.date(created_at) <= end_day.isoformat()],
+            "半开区间": day_range(created_at, start_day, end_day),
+        }
+
+        with engine.connect() as conn:
+            for name, conditions in predicates.items():
+                count_query = select(func.count()).select_from(models.Order).where(*conditions)
+                page_query = select(models.Order.id, models.Order.order_number).where(*conditions).order_by(models.Order.id).limit(100)
+                compiled = count_query.compile(engine)
+                plan = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", tuple(compiled.params.values())).fetchall()
+                matched = conn.execute(count_query).scalar()
+
+                print(f"{name}（{start_day} ~ {end_day}，命中 {matched} 行）")
+                print(f"  计划: {'; '.join(row[-1] for row in plan)}")
+                print(f"  {'count':<12}{percentiles(measure(lambda: conn.execute(count_query).scalar(), args.repeat))}")
+                print(f"  {'首页 100 行':<12}{percentiles(measure(lambda: conn.execute(page_query).all(), args.repeat))}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+销售管理视图基准测试
+
+在临时 SQLite 文件中生成客户（默认 10 万）及每个客户的跟进记录（默认 20 条）、联系人和订单，比较：
+1. 旧查询：四个 GROUP BY 子查询 + 再次 JOIN 全部跟进记录（每个客户返回多行，分页按跟进记录计数）
+2. 新查询：crud_sales_view.get_sales_view_data（读取 customers 上维护的计数列，每个客户一行）
+
+分别测量首页、深分页、按下次跟进日期排序、按意向等级筛选的 p50/p99 延迟。
+
+用法: python scripts/benchmark_sales_view.py [--customers 100000] [--follows 20] [--repeat 5]
+"""
+import argparse
+import datetime
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import create_engine, func, insert, update
+from sqlalchemy.orm import sessionmaker
+from app import models
+from app.crud import crud_sales_view
+from app.database import Base
+from app.models.change_log import CHANGE_LOG_TABLES
+from app.models.customer_counters import counter_values
+
+BATCH_SIZE = 50000
+INTENTION_LEVELS = ("高", "中", "低")
+
+
+def seed(conn, customers: int, follows: int):
+    """生成客户，每个客户 follows 条跟进、1 个联系人、1 个订单"""
+    # 变更日志触发器会让每次插入多写一行，生成数据时先删除
+    for table_name in CHANGE_LOG_TABLES:
+        for suffix in ("ai", "au", "ad"):
+            conn.exec_driver_sql(f"DROP TRIGGER IF EXISTS {table_name}_change_log_{suffix}")
+    sales_id = conn.execute(insert(models.Employee).values(username="bench", name="销售甲", hashed_password="x")).inserted_primary_key[0]
+    rng = random.Random(42)
+    start = datetime.datetime(2024, 1, 1)
+
+    def batches(rows):
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) == BATCH_SIZE:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    for batch in batches(
+        {"id": i, "company": f"基准客户{i}", "province": "广东", "city": "深圳", "status": models.CustomerStatus.LEAD, "sales_id": sales_id}
+        for i in range(1, customers + 1)
+    ):
+        conn.execute(insert(models.Customer), batch)
+        conn.execute(insert(models.Contact), [{"name": f"联系人{row['id']}", "phone": "13800000000", "customer_id": row["id"]} for row in batch])
+        conn.execute(insert(models.Order), [{"order_number": f"BENCH-{row['id']:07d}", "customer_id": row["id"], "sales_id": sales_id} for row in batch])
+    for batch in batches(
+        {
+            "customer_id": customer_id, "employee_id": sales_id, "content": "跟进", "follow_type": "电话",
+            "follow_date": start + datetime.timedelta(days=rng.randrange(365)),
+            "intention_level": rng.choice(INTENTION_LEVELS),
+            "next_follow_date": start + datetime.timedelta(days=365 + rng.randrange(60)),
+        }
+        for customer_id in range(1, customers + 1) for _ in range(follows)
+    ):
+        conn.execute(insert(models.SalesFollow), batch)
+    # 批量写入不经过 ORM，计数列用一条 UPDATE 统一回填
+    conn.execute(update(models.Customer.__table__).values(**counter_values()))
+
+
+def legacy_sales_view(db, skip: int = 0, limit: int = 100):
+    """重写前的查询（保留原逻辑，用于对比）"""
+    contact_count_sub = db.query(
+        models.Contact.customer_id, func.count(models.Contact.id).label("contact_count")
+    ).group_by(models.Contact.customer_id).subquery()
+    sales_follow_count_sub = db.query(
+        models.SalesFollow.customer_id, func.count(models.SalesFollow.id).label("sales_follow_count")
+    ).group_by(models.SalesFollow.customer_id).subquery()
+    latest_follow_date_sub = db.query(
+        models.SalesFollow.customer_id, func.max(models.SalesFollow.follow_date).label("max_date")
+    ).group_by(models.SalesFollow.customer_id).subquery()
+    latest_intention_sub = db.query(
+        models.SalesFollow.customer_id, models.SalesFollow.intention_level
+    ).join(
+        latest_follow_date_sub,
+        (models.SalesFollow.customer_id == latest_follow_date_sub.c.customer_id) &
+        (models.SalesFollow.follow_date == latest_follow_date_sub.c.max_date)
+    ).subquery()
+    order_count_sub = db.query(
+        models.Order.customer_id, func.count(models.Order.id).label("order_count")
+    ).group_by(models.Order.customer_id).subquery()
+    query = db.query(
+        models.Customer.id,
+        models.Customer.company,
+        func.coalesce(contact_count_sub.c.contact_count, 0).label("contact_count"),
+        latest_intention_sub.c.intention_level.label("intention_level"),
+        func.coalesce(sales_follow_count_sub.c.sales_follow_count, 0).label("sales_follow_count"),
+        func.coalesce(order_count_sub.c.order_count, 0).label("order_count"),
+        models.SalesFollow.next_follow_date,
+        models.Employee.name.label("sales_owner_name"),
+    ).outerjoin(
+        contact_count_sub, models.Customer.id == contact_count_sub.c.customer_id
+    ).outerjoin(
+        sales_follow_count_sub, models.Customer.id == sales_follow_count_sub.c.customer_id
+    ).outerjoin(
+        latest_intention_sub, models.Customer.id == latest_intention_sub.c.customer_id
+    ).outerjoin(
+        order_count_sub, models.Customer.id == order_count_sub.c.customer_id
+    ).outerjoin(
+        models.Employee, models.Customer.sales_id == models.Employee.id
+    ).outerjoin(
+        models.SalesFollow, models.Customer.id == models.SalesFollow.customer_id
+    )
+    return query.offset(skip).limit(limit).all()
+
+
+def percentiles(samples: List[float]) -> str:
+    samples = sorted(samples)
+    p50 = statistics.median(samples)
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+    return f"p50={p50 * 1000:9.2f}ms  p99={p99 * 1000:9.2f}ms"
+
+
+def measure(func, repeat: int) -> List[float]:
+    func()  # 预热
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description='销售管理视图基准测试')
+    parser.add_argument('--customers', type=int, default=100000, help='客户数')
+    parser.add_argument('--follows', type=int, default=20, help='每个客户的跟进记录数')
+    parser.add_argument('--repeat', type=int, default=5, help='每项重复次数')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{directory}/benchmark.db")
+        Base.metadata.create_all(bind=engine)
+        started = time.perf_counter()
+        with engine.begin() as conn:
+            seed(conn, args.customers, args.follows)
+        print(f"生成 {args.customers} 个客户、{args.customers * args.follows} 条跟进：{time.perf_counter() - started:.1f}s")
+
+        db = sessionmaker(bind=engine)()
+        deep = args.customers // 2
+        legacy_rows = legacy_sales_view(db, limit=100)
+        print(f"旧查询首页 100 行覆盖 {len({row.id for row in legacy_rows})} 个客户（新查询为 100 个）")
+        cases = [
+            ("旧查询 首页", lambda: legacy_sales_view(db, limit=100)),
+            ("旧查询 深分页", lambda: legacy_sales_view(db, skip=deep, limit=100)),
+            ("新查询 首页", lambda: crud_sales_view.get_sales_view_data(db, limit=100)),
+            ("新查询 深分页", lambda: crud_sales_view.get_sales_view_data(db, skip=deep, limit=100)),
+            ("新查询 按下次跟进排序", lambda: crud_sales_view.get_sales_view_data(db, sort="-next_follow_date", limit=100)),
+            ("新查询 按意向等级筛选", lambda: crud_sales_view.get_sales_view_data(db, intention_level="高", limit=100)),
+        ]
+        for name, func in cases:
+            print(f"  {name:<20}{percentiles(measure(func, args.repeat))}")
+        db.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
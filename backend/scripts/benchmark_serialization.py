@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+列表接口序列化基准测试
+
+在内存 SQLite 中生成客户和订单数据，比较 1000 行一页时：
+1. 仅序列化阶段：旧路径（pydantic 转 JSON 字典 + json.dumps）与快速路径（TypeAdapter.dump_json 直接输出字节）
+2. 完整 HTTP 请求：完整对象、fields= 稀疏字段 两种响应的 p50/p99 延迟
+
+用法: python scripts/benchmark_serialization.py [--rows 1000] [--repeat 50]
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from decimal import Decimal
+from pathlib import Path
+from typing import List
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app import models, schemas
+from app.api.api_router import api_router
+from app.crud import crud_customer, crud_order
+from app.database import Base, get_db
+from app.utils.fields import _projection_adapter
+
+
+def seed(db, rows: int):
+    """生成 rows 个客户（各 2 个联系人）和 rows 个订单（各 2 个订单项）"""
+    sales = models.Employee(username="bench", hashed_password="x", name="销售甲")
+    db.add(sales)
+    products = [models.Product(name=f"产品{i}", real_price=Decimal("99.50")) for i in range(10)]
+    db.add_all(products)
+    db.flush()
+    for i in range(rows):
+        customer = models.Customer(
+            company=f"基准客户{i}", industry="软件", province="广东", city="深圳",
+            address=f"科技园{i}号", sales_id=sales.id,
+        )
+        customer.contacts = [
+            models.Contact(name=f"联系人{i}-{n}", phone=f"1380000{i:04d}") for n in range(2)
+        ]
+        db.add(customer)
+        db.flush()
+        order = models.Order(order_number=f"BENCH-{i:06d}", customer_id=customer.id, sales_id=sales.id, paid_amount=Decimal("10.00"))
+        order.order_items = [
+            models.OrderItem(product_id=products[n].id, quantity=n + 1, unit_price=Decimal("99.50")) for n in range(2)
+        ]
+        db.add(order)
+    db.commit()
+
+
+def percentiles(samples: List[float]) -> str:
+    samples = sorted(samples)
+    p50 = statistics.median(samples)
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+    return f"p50={p50 * 1000:8.2f}ms  p99={p99 * 1000:8.2f}ms"
+
+
+def measure(func, repeat: int) -> List[float]:
+    func()  # 预热（编译 TypeAdapter、填充语句缓存）
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description='列表接口序列化基准测试')
+    parser.add_argument('--rows', type=int, default=1000, help='每页行数')
+    parser.add_argument('--repeat', type=int, default=50, help='每项重复次数')
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    db = SessionLocal()
+    seed(db, args.rows)
+
+    print(f"序列化阶段（{args.rows} 行）")
+    customers = crud_customer.get_customers(db, limit=args.rows)
+    customer_adapter = TypeAdapter(List[schemas.Customer])
+    customer_models = customer_adapter.validate_python(customers)
+    order_fields = tuple(crud_order.ORDER_FIELDS)
+    orders = crud_order.get_orders(db, limit=args.rows, fields=order_fields)
+    order_adapter = _projection_adapter(schemas.Order, order_fields)
+    order_models = order_adapter.validate_python(orders)
+    cases = [
+        ("客户 json.dumps", lambda: json.dumps(customer_adapter.dump_python(customer_models, mode="json"), ensure_ascii=False).encode()),
+        ("客户 dump_json", lambda: customer_adapter.dump_json(customer_models)),
+        ("订单 json.dumps", lambda: json.dumps(order_adapter.dump_python(order_models, mode="json"), ensure_ascii=False).encode()),
+        ("订单 dump_json", lambda: order_adapter.dump_json(order_models)),
+    ]
+    for name, func in cases:
+        print(f"  {name:<24}{percentiles(measure(func, args.repeat))}")
+
+    app = FastAPI()
+    app.include_router(api_router, prefix="/api")
+
+    def override_db():
+        session = SessionLocal()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    app.dependency_overrides[get_db] = override_db
+    client = TestClient(app)
+
+    print(f"HTTP 请求（{args.rows} 行）")
+    requests = [
+        ("客户 完整对象", f"/api/customers/?limit={args.rows}"),
+        ("客户 fields=", f"/api/customers/?limit={args.rows}&fields=company,status,sales_name,contacts"),
+        ("订单 fields=", f"/api/orders/?limit={args.rows}&fields={','.join(order_fields)}"),
+    ]
+    for name, url in requests:
+        def request():
+            response = client.get(url)
+            response.raise_for_status()
+        print(f"  {name:<24}{percentiles(measure(request, args.repeat))}")
+
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
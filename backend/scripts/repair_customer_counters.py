@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+客户计数对账与修复
+
+按关联表重新统计每个客户的联系人、跟进、订单、服务记录数及最新跟进摘要，
+报告与 customers 上保存的值不一致的客户并修正。可定期执行以发现漏维护的写入路径。
+
+用法: python scripts/repair_customer_counters.py [--dry-run] [--batch-size 5000]
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.crud import crud_customer
+from app.database import SessionLocal
+
+
+def main():
+    parser = argparse.ArgumentParser(description='客户计数对账与修复')
+    parser.add_argument('--dry-run', action='store_true', help='只报告不一致，不修改数据')
+    parser.add_argument('--batch-size', type=int, default=crud_customer.COUNTER_REPAIR_BATCH_SIZE, help='每批检查的客户数')
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        report = crud_customer.repair_customer_counters(db, dry_run=args.dry_run, batch_size=args.batch_size)
+    finally:
+        db.close()
+
+    print(f"检查 {report['checked']} 个客户，不一致 {report['drifted']} 个，已修复 {report['repaired']} 个")
+    for name, count in sorted(report["columns"].items()):
+        print(f"  {name}: {count}")
+    if report["samples"]:
+        print(json.dumps(report["samples"], ensure_ascii=False, indent=2, default=str))
+    return 1 if report["drifted"] and args.dry_run else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
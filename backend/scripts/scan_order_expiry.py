@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+合同到期扫描
+
+扫描即将到期（见 ORDER_EXPIRY_WINDOWS）的合同并写入提醒队列，供 cron 等定时执行。
+每次只读取新进入提醒窗口的订单和最近修改过的订单，可以频繁运行。
+
+用法: python scripts/scan_order_expiry.py
+"""
+import sys
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.crud import crud_order_expiry
+from app.database import SessionLocal
+
+
+def main():
+    db = SessionLocal()
+    try:
+        created = crud_order_expiry.scan_expiring_orders(db)
+    finally:
+        db.close()
+    for window, count in created.items():
+        print(f"到期前 {window} 天：新增 {count} 条提醒")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+import re
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.database import Base
+from app import models
+
+
+@pytest.fixture
+def engine():
+    """每个测试使用独立的内存数据库"""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+# "SCAN customers" 表示全表扫描；走索引时为 "SEARCH ... USING INDEX"，
+# 全文检索表的 "SCAN customers_fts VIRTUAL TABLE INDEX" 是 FTS 索引查询，不算全表扫描
+FULL_SCAN = re.compile(r"^SCAN (\w+)\b(?! VIRTUAL TABLE INDEX)")
+
+
+@pytest.fixture
+def capture_statements(engine):
+    """capture_statements(call, kind="SELECT")：执行 CRUD 调用并记录其发出的全部 SELECT（或 kind 指定的语句）及参数"""
+    def capture(call, kind="SELECT"):
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith(kind):
+                statements.append((statement, parameters))
+
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            call()
+        finally:
+            event.remove(engine, "before_cursor_execute", before_cursor_execute)
+        return statements
+    return capture
+
+
+@pytest.fixture
+def full_scans(engine):
+    """full_scans(statements)：对每条 SQL 执行 EXPLAIN QUERY PLAN，返回出现全表扫描的计划行"""
+    def scans(statements):
+        found = []
+        with engine.connect() as conn:
+            for statement, parameters in statements:
+                plan = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+                found.extend((statement, row[-1]) for row in plan if FULL_SCAN.match(row[-1]))
+        return found
+    return scans
+
+
+@pytest.fixture
+def sales(db):
+    """销售人员张三，多数测试数据的负责人"""
+    employee = models.Employee(username="sales", name="张三", hashed_password="x", email="sales@sellsys.com")
+    db.add(employee)
+    db.commit()
+    return employee
+
+
+@pytest.fixture
+def customer(db):
+    """客户A（没有负责人）"""
+    customer = models.Customer(company="客户A")
+    db.add(customer)
+    db.commit()
+    return customer
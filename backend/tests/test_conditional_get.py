@@ -0,0 +1,100 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app import models
+from app.api.endpoints import customers, orders
+from app.database import get_db
+from app.utils.conditional import conditional_get, table_etag
+
+
+@pytest.fixture
+def client(db):
+    app = FastAPI()
+    calls = []
+
+    @app.get("/customers", dependencies=[conditional_get("customers")])
+    def list_customers():
+        calls.append(1)
+        return [c.company for c in db.query(models.Customer)]
+
+    app.dependency_overrides[get_db] = lambda: db
+    client = TestClient(app)
+    client.calls = calls
+    return client
+
+
+def test_not_modified_skips_handler(client, db):
+    db.add(models.Customer(company="客户A"))
+    db.commit()
+
+    first = client.get("/customers")
+    second = client.get("/customers", headers={"If-None-Match": first.headers["ETag"]})
+
+    assert first.status_code == 200
+    assert second.status_code == 304
+    assert second.content == b""
+    assert len(client.calls) == 1
+
+
+def test_etag_changes_after_orm_and_bulk_writes(db):
+    db.add(models.Customer(company="客户A"))
+    db.commit()
+    before, _ = table_etag(db, ("customers",))
+
+    db.get(models.Customer, 1).city = "深圳"
+    db.commit()
+    after_update, _ = table_etag(db, ("customers",))
+
+    from app.crud import crud_customer
+    crud_customer.bulk_assign_customers(db, [1], field="sales_id", employee_id=None)
+    after_bulk, _ = table_etag(db, ("customers",))
+
+    assert len({before, after_update, after_bulk}) == 3
+
+
+def test_rolled_back_write_keeps_etag(db):
+    db.add(models.Customer(company="客户A"))
+    db.commit()
+    before, _ = table_etag(db, ("customers",))
+
+    db.add(models.Customer(company="客户B"))
+    db.flush()
+    db.rollback()
+
+    assert table_etag(db, ("customers",))[0] == before
+
+
+def test_bump_table_versions_inserts_then_increments(db):
+    from app.models.table_version import TableVersion, bump_table_versions
+
+    bump_table_versions(db, {"customers", "orders"})
+    bump_table_versions(db, {"customers"})
+    db.commit()
+
+    assert dict(db.query(TableVersion.table_name, TableVersion.version)) == {"customers": 2, "orders": 1}
+
+
+
+@pytest.fixture
+def api(db):
+    app = FastAPI()
+    app.include_router(customers.router, prefix="/api/customers")
+    app.include_router(orders.router, prefix="/api/orders")
+    app.dependency_overrides[get_db] = lambda: db
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("url", [
+    "/api/orders/?view=finance",
+    "/api/orders/?fields=order_number&cursor=",
+    "/api/customers/?fields=company",
+])
+def test_projection_responses_keep_etag(api, db, url):
+    db.add(models.Customer(company="客户A"))
+    db.commit()
+
+    first = api.get(url)
+    second = api.get(url, headers={"If-None-Match": first.headers["ETag"]})
+
+    assert first.status_code == 200 and "Last-Modified" in first.headers
+    assert second.status_code == 304
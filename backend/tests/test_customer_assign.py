@@ -0,0 +1,44 @@
+import json
+from sqlalchemy import event
+from app import models
+from app.crud import crud_customer
+
+
+def seed(db, count):
+    db.add_all([models.Customer(company=f"客户{i}") for i in range(count)])
+    db.commit()
+
+
+def test_bulk_assign_updates_in_chunks(engine, db, sales):
+    seed(db, 1200)
+    ids = [customer_id for (customer_id,) in db.query(models.Customer.id)]
+
+    updates = []
+    listener = lambda conn, cursor, statement, *args: updates.append(statement) if statement.startswith("UPDATE customers") else None
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        updated = crud_customer.bulk_assign_customers(db, ids + [ids[0]], field="sales_id", employee_id=sales.id)
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert updated == 1200
+    assert len(updates) == 3  # 1200 个ID按 500 分块
+    assert db.query(models.Customer).filter(models.Customer.sales_id == sales.id).count() == 1200
+
+
+def test_bulk_assign_writes_single_audit_entry(db, sales):
+    seed(db, 10)
+    ids = [customer_id for (customer_id,) in db.query(models.Customer.id)]
+
+    updated = crud_customer.bulk_assign_customers(db, ids + [9999], field="service_id", employee_id=sales.id)
+
+    assert updated == 10
+    logs = db.query(models.AuditLog).all()
+    assert len(logs) == 1
+    assert logs[0].action == "bulk_assign_service_id"
+    assert json.loads(logs[0].details)["updated"] == 10
+
+
+def test_bulk_assign_empty_selection_is_noop(db):
+    assert crud_customer.bulk_assign_customers(db, [], field="sales_id", employee_id=1) == 0
+    assert db.query(models.AuditLog).count() == 0
@@ -0,0 +1,96 @@
+import datetime
+from app import models
+from app.crud import crud_customer, crud_order
+from app.schemas import OrderCreate
+
+DAY = datetime.datetime(2025, 5, 1)
+
+
+def seed(db):
+    customers = [models.Customer(company="客户A"), models.Customer(company="客户B")]
+    db.add_all(customers)
+    db.commit()
+    return customers
+
+
+def follow(customer, employee, day, level, next_day=None):
+    return models.SalesFollow(
+        customer_id=customer.id, employee_id=employee.id, content="跟进", follow_type="电话",
+        follow_date=day, intention_level=level, next_follow_date=next_day,
+    )
+
+
+def counters(customer):
+    return (customer.contact_count, customer.follow_count, customer.order_count, customer.service_record_count)
+
+
+def test_counters_follow_orm_writes_in_same_transaction(db, sales):
+    a, b = seed(db)
+    contact = models.Contact(name="联系人", phone="13800000000", customer_id=a.id)
+    db.add_all([
+        contact,
+        follow(a, sales, DAY - datetime.timedelta(days=1), "低"),
+        follow(a, sales, DAY, "中"),
+        follow(a, sales, DAY, "高", DAY + datetime.timedelta(days=7)),
+        models.Order(order_number="SO-1", customer_id=a.id, sales_id=sales.id),
+        models.ServiceRecord(customer_id=a.id, title="安装"),
+    ])
+    db.flush()
+
+    assert counters(a) == (1, 3, 1, 1)
+    assert (a.last_follow_at, a.next_follow_at, a.latest_intention_level) == (DAY, DAY + datetime.timedelta(days=7), "高")
+    db.commit()
+
+    contact.customer_id = b.id
+    db.commit()
+    assert (a.contact_count, b.contact_count) == (0, 1)
+
+    latest = db.query(models.SalesFollow).filter_by(intention_level="高").one()
+    db.delete(latest)
+    db.commit()
+    assert (a.follow_count, a.latest_intention_level, a.next_follow_at) == (2, "中", None)
+
+
+def test_counter_updates_keep_customer_updated_at(db):
+    a, _ = seed(db)
+    updated_at = a.updated_at
+
+    db.add(models.Contact(name="联系人", phone="13800000000", customer_id=a.id))
+    db.commit()
+
+    assert a.contact_count == 1
+    assert a.updated_at == updated_at
+
+
+def test_bulk_order_insert_updates_order_count(db, sales):
+    a, b = seed(db)
+    product = models.Product(name="产品", real_price=10)
+    db.add(product)
+    db.commit()
+    orders = [
+        OrderCreate(customer_id=customer.id, sales_id=sales.id, order_items=[{"product_id": product.id, "quantity": 1}])
+        for customer in (a, a, b)
+    ]
+
+    crud_order.bulk_create_orders(db, orders)
+
+    db.expire_all()
+    assert (a.order_count, b.order_count) == (2, 1)
+
+
+def test_repair_reports_and_fixes_drift(db, sales):
+    a, b = seed(db)
+    db.add(follow(b, sales, DAY, "高"))
+    db.commit()
+    db.execute(models.Customer.__table__.update().where(models.Customer.id == b.id).values(follow_count=5, latest_intention_level=None))
+    db.commit()
+
+    report = crud_customer.repair_customer_counters(db, dry_run=True, batch_size=1)
+    assert (report["checked"], report["drifted"], report["repaired"]) == (2, 1, 0)
+    assert report["columns"] == {"follow_count": 1, "latest_intention_level": 1}
+    assert report["samples"][0]["columns"]["follow_count"] == {"stored": 5, "expected": 1}
+
+    assert crud_customer.repair_customer_counters(db)["repaired"] == 1
+    db.expire_all()
+    assert (b.follow_count, b.latest_intention_level) == (1, "高")
+    assert crud_customer.repair_customer_counters(db)["drifted"] == 0
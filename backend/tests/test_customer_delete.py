@@ -0,0 +1,54 @@
+from decimal import Decimal
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app import models
+from app.api.endpoints import customers
+from app.database import get_db
+
+
+@pytest.fixture
+def client(db):
+    app = FastAPI()
+    app.include_router(customers.router, prefix="/api/customers")
+    app.dependency_overrides[get_db] = lambda: db
+    return TestClient(app)
+
+
+def seed(db, customer):
+    product = models.Product(name="产品", real_price=Decimal("10.00"))
+    customer.contacts = [models.Contact(name="联系人", phone="13800000000")]
+    db.add(product)
+    db.commit()
+    return product
+
+
+def test_delete_customer_with_orders_is_rejected(client, db, sales, customer):
+    product = seed(db, customer)
+    order = models.Order(order_number="SO-1", customer_id=customer.id, sales_id=sales.id)
+    order.order_items = [models.OrderItem(product_id=product.id, quantity=1, unit_price=Decimal("10.00"))]
+    db.add(order)
+    db.commit()
+
+    response = client.delete(f"/api/customers/{customer.id}")
+
+    assert response.status_code == 409
+    assert db.query(models.Order).count() == 1 and db.query(models.OrderItem).count() == 1
+    assert db.get(models.Customer, customer.id) is not None
+
+
+def test_delete_customer_with_service_records_is_rejected(client, db, sales, customer):
+    seed(db, customer)
+    db.add(models.ServiceRecord(customer_id=customer.id, employee_id=sales.id, title="报修"))
+    db.commit()
+
+    assert client.delete(f"/api/customers/{customer.id}").status_code == 409
+    assert db.query(models.ServiceRecord).one().customer_id == customer.id
+
+
+def test_delete_customer_without_history_removes_contacts(client, db, customer):
+    seed(db, customer)
+
+    assert client.delete(f"/api/customers/{customer.id}").status_code == 200
+    assert db.query(models.Customer).count() == 0 and db.query(models.Contact).count() == 0
+    assert client.delete(f"/api/customers/{customer.id}").status_code == 404
@@ -0,0 +1,62 @@
+from app import models
+from app.crud import crud_customer
+from app.models.customer import CustomerStatus
+from app.schemas import CustomerFacets
+
+
+def _seed(db):
+    alice = models.Employee(username="alice", hashed_password="x", name="销售甲")
+    bob = models.Employee(username="bob", hashed_password="x", name="销售乙")
+    db.add_all([alice, bob])
+    db.flush()
+    db.add_all([
+        models.Customer(company="客户1", province="广东", city="深圳", industry="软件", sales_id=alice.id),
+        models.Customer(company="客户2", province="广东", city="广州", industry="软件", sales_id=alice.id),
+        models.Customer(company="客户3", province="浙江", city="杭州", industry="制造", sales_id=bob.id,
+                        status=CustomerStatus.LEAD),
+        models.Customer(company="客户4", province=None, city=None),
+    ])
+    db.commit()
+    return alice, bob
+
+
+def _counts(facet):
+    return {item["value"]: item["count"] for item in facet}
+
+
+def test_facets_group_by_and_skip_nulls(db):
+    alice, bob = _seed(db)
+
+    facets = crud_customer.get_customer_facets(db)
+
+    assert facets["province"] == [{"value": "广东", "count": 2}, {"value": "浙江", "count": 1}]
+    assert _counts(facets["industry"]) == {"软件": 2, "制造": 1}
+    assert facets["sales"] == [
+        {"value": alice.id, "label": "销售甲", "count": 2},
+        {"value": bob.id, "label": "销售乙", "count": 1},
+    ]
+    assert sum(_counts(facets["status"]).values()) == 4
+
+
+def test_facets_apply_other_filters_but_not_their_own(db):
+    alice, _ = _seed(db)
+
+    facets = crud_customer.get_customer_facets(db, province="广东", sales_id=alice.id)
+
+    # 已选中的省份仍列出全部省份（受销售负责人筛选）
+    assert _counts(facets["province"]) == {"广东": 2}
+    assert _counts(facets["city"]) == {"深圳": 1, "广州": 1}
+    # 销售负责人分面只受省份筛选
+    assert _counts(facets["sales"]) == {alice.id: 2}
+
+    facets = crud_customer.get_customer_facets(db, province="浙江")
+    assert _counts(facets["province"]) == {"广东": 2, "浙江": 1}
+    assert _counts(facets["industry"]) == {"制造": 1}
+
+
+def test_facets_validate_against_schema(db):
+    _seed(db)
+
+    facets = CustomerFacets.model_validate(crud_customer.get_customer_facets(db))
+
+    assert {item.value for item in facets.status} <= {status.value for status in CustomerStatus}
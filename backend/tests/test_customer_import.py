@@ -0,0 +1,59 @@
+import io
+import pytest
+from app import models
+from app.crud import crud_customer
+from app.utils.import_reader import iter_csv_rows, iter_import_rows
+
+CSV = """客户单位,行业类别,省份,城市,客户状态,联系人,联系电话,联系人2,联系电话2
+深圳巨炜科技,软件,广东,深圳,潜在客户,张三,13800000001,李四,13800000002
+,物流,广东,广州,潜在客户,王五,13800000003,,
+北京星辰软件,软件,北京,北京,成交客户,,,,
+上海晨曦信息,咨询,上海,上海,未知状态,,,,
+广州华南物流,物流,广东,广州,已联系,赵六,,,
+"""
+
+
+def csv_file(text):
+    return io.BytesIO(("\ufeff" + text).encode("utf-8"))
+
+
+def test_import_reports_invalid_rows_and_inserts_the_rest(db):
+    result = crud_customer.bulk_import_customers(db, iter_csv_rows(csv_file(CSV)), batch_size=2)
+
+    assert result["total_rows"] == 5
+    assert result["imported"] == 2
+    assert result["failed"] == 3
+    assert [error["row"] for error in result["errors"]] == [3, 5, 6]
+    assert any(message.startswith("company") for message in result["errors"][0]["errors"])
+
+    customers = {c.company: c for c in db.query(models.Customer).all()}
+    assert set(customers) == {"深圳巨炜科技", "北京星辰软件"}
+    assert customers["北京星辰软件"].status == models.CustomerStatus.WON
+    assert sorted(c.name for c in customers["深圳巨炜科技"].contacts) == ["张三", "李四"]
+
+
+def test_import_writes_each_batch_with_one_statement_per_table(db, capture_statements):
+    text = "客户单位,客户状态,联系人,联系电话\n" + "".join(f"测试公司{i},潜在客户,联系人{i},13800000000\n" for i in range(300))
+    statements = capture_statements(
+        lambda: crud_customer.bulk_import_customers(db, iter_csv_rows(csv_file(text))), kind="INSERT"
+    )
+
+    tables = [statement.split()[2] for statement, _ in statements]
+    assert tables.count("customers") == 1
+    assert tables.count("contacts") == 1
+    assert tables.count("customer_status_changes") == 1
+    customers = db.query(models.Customer).order_by(models.Customer.id).all()
+    assert [c.company for c in customers] == [f"测试公司{i}" for i in range(300)]
+    assert [c.contacts[0].name for c in customers[:3]] == ["联系人0", "联系人1", "联系人2"]
+    assert all(c.contact_count == 1 for c in customers)
+
+
+def test_imported_customers_are_searchable(db):
+    crud_customer.bulk_import_customers(db, iter_csv_rows(csv_file(CSV)))
+
+    assert [c.company for c in crud_customer.get_customers(db, q="巨炜科技")] == ["深圳巨炜科技"]
+
+
+def test_import_rejects_unknown_file_type():
+    with pytest.raises(ValueError):
+        iter_import_rows(io.BytesIO(b""), "customers.txt")
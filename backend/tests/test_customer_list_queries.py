@@ -0,0 +1,100 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from app import models, schemas
+from app.api.endpoints import customers, orders
+from app.crud import crud_customer
+from app.database import get_db
+
+
+def seed_customers(db, sales, count):
+    service = models.Employee(username="service", hashed_password="x", name="李四", email="service@sellsys.com")
+    db.add(service)
+    db.flush()
+    for i in range(count):
+        customer = models.Customer(company=f"客户{i}", sales_id=sales.id, service_id=service.id)
+        customer.contacts = [
+            models.Contact(name=f"联系人{i}-{j}", phone="13800000000") for j in range(2)
+        ]
+        db.add(customer)
+    db.commit()
+    db.expunge_all()
+
+
+def count_list_statements(engine, db, **kwargs):
+    """统计读取并序列化一页客户数据所执行的 SQL 条数"""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        customers = crud_customer.get_customers(db, **kwargs)
+        rows = [schemas.Customer.model_validate(c).model_dump() for c in customers]
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    db.expunge_all()
+    return rows, len(statements)
+
+
+@pytest.mark.parametrize("limit", [1, 10, 100])
+def test_customer_list_statement_count_is_constant(engine, db, sales, limit):
+    seed_customers(db, sales, 100)
+
+    rows, statement_count = count_list_statements(engine, db, limit=limit)
+
+    assert len(rows) == limit
+    # 主查询（JOIN 销售/客服）+ 联系人批量加载
+    assert statement_count == 2
+
+
+def test_customer_list_fills_owner_names(engine, db, sales):
+    seed_customers(db, sales, 3)
+
+    rows, _ = count_list_statements(engine, db, limit=3)
+
+    for row in rows:
+        assert row["sales_name"] == "张三"
+        assert row["service_name"] == "李四"
+        assert len(row["contacts"]) == 2
+
+
+def test_customer_list_cursor_mode_statement_count(engine, db, sales):
+    seed_customers(db, sales, 50)
+
+    first, first_count = count_list_statements(engine, db, limit=20, after_id=0)
+    second, second_count = count_list_statements(engine, db, limit=20, after_id=first[-1]["id"])
+
+    assert first_count == second_count == 2
+    assert second[0]["id"] > first[-1]["id"]
+
+
+
+def list_client(db):
+    app = FastAPI()
+    app.include_router(customers.router, prefix="/api/customers")
+    app.include_router(orders.router, prefix="/api/orders")
+    app.dependency_overrides[get_db] = lambda: db
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("url", ["/api/customers/", "/api/orders/"])
+@pytest.mark.parametrize("limit", [0, -1, 1001])
+def test_cursor_limit_is_validated(db, sales, url, limit):
+    seed_customers(db, sales, 2)
+
+    response = list_client(db).get(url, params={"limit": limit, "cursor": ""})
+
+    assert response.status_code == 422
+
+
+@pytest.mark.parametrize("url", ["/api/customers/", "/api/orders/"])
+def test_offset_limit_is_not_capped(db, sales, url):
+    seed_customers(db, sales, 2)
+
+    response = list_client(db).get(url, params={"skip": 0, "limit": 5000})
+
+    assert response.status_code == 200
+    assert isinstance(response.json(), list)
@@ -0,0 +1,56 @@
+from app import models
+from app.crud import crud_customer
+
+
+def seed(db):
+    db.add_all([
+        models.Customer(company="深圳巨炜科技有限公司", industry="软件", address="深圳市南山区"),
+        models.Customer(company="广州华南物流集团", industry="物流", notes="深圳巨炜科技推荐"),
+        models.Customer(company="北京星辰软件有限公司", industry="软件开发"),
+    ])
+    db.commit()
+
+
+def companies(customers):
+    return [c.company for c in customers]
+
+
+def test_search_matches_chinese_substring_ranked_by_company(db):
+    seed(db)
+
+    result = crud_customer.get_customers(db, q="巨炜科技")
+
+    # 公司名命中排在备注命中之前
+    assert companies(result) == ["深圳巨炜科技有限公司", "广州华南物流集团"]
+
+
+def test_search_short_terms_fall_back_to_like(db):
+    seed(db)
+
+    assert companies(crud_customer.get_customers(db, q="物流")) == ["广州华南物流集团"]
+    assert companies(crud_customer.get_customers(db, q="软件 北京")) == ["北京星辰软件有限公司"]
+
+
+def test_search_index_follows_updates_and_deletes(db):
+    seed(db)
+    customer = crud_customer.get_customers(db, q="星辰软件")[0]
+
+    customer.company = "北京晨曦信息有限公司"
+    db.commit()
+    assert crud_customer.get_customers(db, q="星辰软件") == []
+    assert companies(crud_customer.get_customers(db, q="晨曦信息")) == ["北京晨曦信息有限公司"]
+
+    crud_customer.delete_customer(db, customer.id)
+    assert crud_customer.get_customers(db, q="晨曦信息") == []
+
+
+def test_company_filter_is_limited_to_company_column(db):
+    seed(db)
+
+    assert companies(crud_customer.get_customers(db, company="巨炜科技")) == ["深圳巨炜科技有限公司"]
+
+
+def test_search_escapes_query_syntax(db):
+    seed(db)
+
+    assert crud_customer.get_customers(db, q='巨炜" OR "科技') == []
@@ -0,0 +1,80 @@
+import pytest
+from sqlalchemy import delete, insert, update
+from app import models, schemas
+from app.crud import crud_customer
+from app.utils import suggest_index
+from app.utils.suggest_index import CompanySuggestIndex
+
+
+@pytest.fixture(autouse=True)
+def fresh_index(monkeypatch):
+    index = CompanySuggestIndex()
+    monkeypatch.setattr(crud_customer, "customer_suggest_index", index)
+    return index
+
+
+def test_suggest_by_name_prefix(db):
+    db.add_all([models.Customer(company=name) for name in ["巨炜科技", "巨人网络", "华为技术"]])
+    db.commit()
+
+    result = crud_customer.suggest_customers(db, prefix="巨")
+
+    assert sorted(r["company"] for r in result) == ["巨人网络", "巨炜科技"]
+
+
+def test_suggest_respects_limit(db):
+    db.add_all([models.Customer(company=f"测试公司{i}") for i in range(20)])
+    db.commit()
+
+    assert len(crud_customer.suggest_customers(db, prefix="测试", limit=5)) == 5
+
+
+@pytest.mark.skipif(suggest_index.lazy_pinyin is None, reason="pypinyin 未安装")
+def test_suggest_by_pinyin(db):
+    db.add(models.Customer(company="巨炜科技"))
+    db.commit()
+
+    assert [r["company"] for r in crud_customer.suggest_customers(db, prefix="jwkj")] == ["巨炜科技"]
+    assert [r["company"] for r in crud_customer.suggest_customers(db, prefix="JuWei")] == ["巨炜科技"]
+
+
+def test_suggest_index_follows_writes(db):
+    crud_customer.suggest_customers(db, prefix="任意")  # 触发首次加载
+
+    created = crud_customer.create_customer(db, schemas.CustomerCreate(company="星辰软件"))
+    assert [r["id"] for r in crud_customer.suggest_customers(db, prefix="星辰")] == [created.id]
+
+    crud_customer.update_customer(db, created.id, schemas.CustomerUpdate(company="晨曦信息"))
+    assert crud_customer.suggest_customers(db, prefix="星辰") == []
+    assert [r["id"] for r in crud_customer.suggest_customers(db, prefix="晨曦")] == [created.id]
+
+    crud_customer.delete_customer(db, created.id)
+    assert crud_customer.suggest_customers(db, prefix="晨曦") == []
+
+
+def test_suggest_index_catches_up_with_writes_from_other_processes(db):
+    crud_customer.suggest_customers(db, prefix="任意")
+
+    # 不经过 crud_customer 的写入（其他 worker、脚本）只体现在变更日志中
+    db.execute(insert(models.Customer).values(company="星辰软件"))
+    db.execute(insert(models.Customer).values(company="晨曦信息"))
+    db.commit()
+    assert [r["company"] for r in crud_customer.suggest_customers(db, prefix="星辰")] == ["星辰软件"]
+
+    db.execute(update(models.Customer).where(models.Customer.company == "星辰软件").values(company="北辰科技"))
+    db.execute(delete(models.Customer).where(models.Customer.company == "晨曦信息"))
+    db.commit()
+    assert crud_customer.suggest_customers(db, prefix="星辰") == []
+    assert crud_customer.suggest_customers(db, prefix="晨曦") == []
+    assert [r["company"] for r in crud_customer.suggest_customers(db, prefix="北辰")] == ["北辰科技"]
+
+
+def test_suggest_index_reloads_after_large_backlog(db, monkeypatch, fresh_index):
+    monkeypatch.setattr(crud_customer, "SUGGEST_CATCH_UP_LIMIT", 2)
+    crud_customer.suggest_customers(db, prefix="任意")
+
+    db.execute(insert(models.Customer), [{"company": f"测试公司{i}"} for i in range(5)])
+    db.commit()
+
+    assert len(crud_customer.suggest_customers(db, prefix="测试")) == 5
+    assert fresh_index.change_id == (0, db.query(models.ChangeLog.id).order_by(models.ChangeLog.id.desc()).limit(1).scalar())
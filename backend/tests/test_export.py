@@ -0,0 +1,50 @@
+import csv
+import io
+import json
+from app import models
+from app.crud import crud_customer, crud_order
+from app.utils import export
+from app.utils.export import iter_csv, iter_ndjson
+
+
+def seed(db, sales):
+    customers = [
+        models.Customer(company=f"客户{i}", city="深圳" if i % 2 else "广州", sales_id=sales.id)
+        for i in range(6)
+    ]
+    db.add_all(customers)
+    db.flush()
+    db.add(models.Order(order_number="SO-1", customer_id=customers[1].id, sales_id=sales.id, paid_amount=10))
+    db.commit()
+
+
+def test_customer_csv_export_applies_filters(db, sales):
+    seed(db, sales)
+
+    body = b"".join(iter_csv(crud_customer.CUSTOMER_EXPORT_FIELDS, crud_customer.export_customers(db, city="深圳")))
+
+    rows = list(csv.DictReader(io.StringIO(body.decode("utf-8-sig"))))
+    assert [row["company"] for row in rows] == ["客户1", "客户3", "客户5"]
+    assert rows[0]["sales_name"] == "张三"
+    assert rows[0]["status"] == models.CustomerStatus.LEAD.value
+
+
+def test_export_is_chunked(db, sales, monkeypatch):
+    seed(db, sales)
+    monkeypatch.setattr(export, "EXPORT_CHUNK_ROWS", 2)
+
+    chunks = list(iter_csv(crud_customer.CUSTOMER_EXPORT_FIELDS, crud_customer.export_customers(db, batch_size=2)))
+
+    assert len(chunks) == 4  # 表头 + 3 块各 2 行
+
+
+def test_order_ndjson_export(db, sales):
+    seed(db, sales)
+
+    body = b"".join(iter_ndjson(crud_order.ORDER_EXPORT_FIELDS, crud_order.export_orders(db, company="客户1")))
+
+    lines = [json.loads(line) for line in body.decode("utf-8").splitlines()]
+    assert len(lines) == 1
+    assert lines[0]["order_number"] == "SO-1"
+    assert lines[0]["company"] == "客户1"
+    assert lines[0]["paid_amount"] == "10.00"
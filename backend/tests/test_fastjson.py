@@ -0,0 +1,31 @@
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from app.models.customer import CustomerStatus
+from app.utils.fastjson import FastJSONResponse, dumps
+
+
+def test_dumps_matches_pydantic_json_mode():
+    value = {
+        "company": "客户A",
+        "status": CustomerStatus.LEAD,
+        "amount": Decimal("12.50"),
+        "day": date(2024, 1, 2),
+        "at": datetime(2024, 1, 2, 3, 4, 5),
+    }
+
+    assert json.loads(dumps(value)) == {
+        "company": "客户A",
+        "status": CustomerStatus.LEAD.value,
+        "amount": "12.50",
+        "day": "2024-01-02",
+        "at": "2024-01-02T03:04:05",
+    }
+    assert "客户A".encode("utf-8") in dumps(value)
+
+
+def test_fast_json_response_renders_bytes():
+    response = FastJSONResponse({"hits": 1})
+
+    assert response.body == b'{"hits":1}'
+    assert response.media_type == "application/json"
@@ -0,0 +1,82 @@
+from decimal import Decimal
+import pytest
+from fastapi import HTTPException
+from app import models
+from app.crud import crud_order
+from app.schemas import OrderCreate
+
+
+def seed(db):
+    products = [models.Product(name=f"产品{i}", real_price=Decimal(i + 1)) for i in range(60)]
+    products.append(models.Product(name="无实价产品", base_price=Decimal("7.00")))
+    db.add_all(products)
+    db.commit()
+    return products
+
+
+def order_payload(employee, customer, products, quantity=2):
+    return OrderCreate(
+        customer_id=customer.id,
+        sales_id=employee.id,
+        order_items=[{"product_id": product.id, "quantity": quantity} for product in products],
+    )
+
+
+def test_create_order_uses_one_price_query(capture_statements, db, sales, customer):
+    products = seed(db)
+    payload = order_payload(sales, customer, products)
+
+    statements = capture_statements(lambda: crud_order.create_order(db, payload))
+
+    product_queries = [s for s, _ in statements if "FROM products" in s]
+    assert len(product_queries) == 1
+    order = db.query(models.Order).one()
+    assert len(order.order_items) == 61
+    assert order.total_amount == sum(Decimal(i + 1) * 2 for i in range(60)) + Decimal("14.00")
+
+
+def test_create_order_reports_missing_products(db, sales, customer):
+    products = seed(db)
+    payload = order_payload(sales, customer, products[:1])
+    payload.order_items.append(payload.order_items[0].model_copy(update={"product_id": 999}))
+
+    with pytest.raises(HTTPException) as exc:
+        crud_order.create_order(db, payload)
+
+    assert exc.value.status_code == 404
+    assert db.query(models.Order).count() == 0
+
+
+@pytest.mark.parametrize("update, status_code", [
+    ({"customer_id": 999}, 404),
+    ({"sales_id": 999}, 404),
+    ({"order_items": []}, 400),
+    ({"quantity": 0}, 400),
+])
+def test_create_order_validates_like_bulk_create(db, sales, customer, update, status_code):
+    products = seed(db)
+    payload = order_payload(sales, customer, products[:2], quantity=update.pop("quantity", 2)).model_copy(update=update)
+
+    with pytest.raises(HTTPException) as exc:
+        crud_order.create_order(db, payload)
+
+    assert exc.value.status_code == status_code
+    assert crud_order.bulk_create_orders(db, [payload])["failed"] == 1
+    assert db.query(models.Order).count() == 0
+
+
+def test_bulk_create_reports_errors_per_order(db, sales, customer):
+    products = seed(db)
+    orders = [order_payload(sales, customer, products[:3]) for _ in range(5)]
+    orders[1] = orders[1].model_copy(update={"customer_id": 999})
+    orders[3].order_items[0].quantity = 0
+
+    result = crud_order.bulk_create_orders(db, orders)
+
+    assert result["requested"] == 5
+    assert [created["index"] for created in result["created"]] == [0, 2, 4]
+    assert [error["index"] for error in result["errors"]] == [1, 3]
+    assert result["errors"][0]["errors"] == ["Customer 999 not found"]
+    created = db.get(models.Order, result["created"][2]["id"])
+    assert created.order_number == result["created"][2]["order_number"]
+    assert created.total_amount == Decimal("12.00")
@@ -0,0 +1,53 @@
+import datetime
+import pytest
+from app import models
+from app.config import settings
+from app.crud import crud_order
+
+
+pytestmark = pytest.mark.usefixtures("sales", "customer")
+
+
+def add_order(db, number, **values):
+    """为 sales / customer fixture 创建的销售和客户A添加一个订单"""
+    customer = db.query(models.Customer).one()
+    employee = db.query(models.Employee).one()
+    db.add(models.Order(order_number=number, customer_id=customer.id, sales_id=employee.id, **values))
+    db.commit()
+
+
+def numbers(db, **filters):
+    return sorted(row.order_number for row in crud_order.get_orders(db, **filters))
+
+
+def test_date_range_includes_whole_end_day(db):
+    add_order(db, "SO-1", start_date=datetime.datetime(2025, 3, 1), end_date=datetime.datetime(2025, 3, 31, 18, 30))
+    add_order(db, "SO-2", start_date=datetime.datetime(2025, 3, 31, 23, 59, 59), end_date=datetime.datetime(2025, 4, 1))
+
+    march = dict(effective_date_start=datetime.date(2025, 3, 1), effective_date_end=datetime.date(2025, 3, 31))
+    assert numbers(db, **march) == ["SO-1", "SO-2"]
+    assert numbers(db, expiry_date_start=datetime.date(2025, 3, 1), expiry_date_end=datetime.date(2025, 3, 31)) == ["SO-1"]
+    assert numbers(db, expiry_date_start=datetime.date(2025, 4, 1)) == ["SO-2"]
+
+
+def test_sign_date_accepts_datetimes_and_server_default_timestamps(db):
+    add_order(db, "SO-1")
+    today = db.query(models.Order).one().created_at.date()
+
+    assert numbers(db, sign_date_start=today, sign_date_end=today) == ["SO-1"]
+    assert numbers(db, sign_date_end=datetime.datetime.combine(today, datetime.time(23, 59))) == ["SO-1"]
+    assert numbers(db, sign_date_end=today - datetime.timedelta(days=1)) == []
+
+
+def test_sign_date_boundaries_follow_business_timezone(db, monkeypatch):
+    # 2025-03-01 零点（UTC+8）为 UTC 2025-02-28 16:00，两笔订单在 UTC 下同属 2 月 28 日
+    add_order(db, "SO-BEFORE", created_at=datetime.datetime(2025, 2, 28, 15, 59, 59))
+    add_order(db, "SO-MIDNIGHT", created_at=datetime.datetime(2025, 2, 28, 16, 0, 0))
+    march_first = dict(sign_date_start=datetime.date(2025, 3, 1), sign_date_end=datetime.date(2025, 3, 1))
+
+    monkeypatch.setattr(settings, "BUSINESS_TIMEZONE", "UTC")
+    assert numbers(db, **march_first) == []
+
+    monkeypatch.setattr(settings, "BUSINESS_TIMEZONE", "Asia/Shanghai")
+    assert numbers(db, **march_first) == ["SO-MIDNIGHT"]
+    assert numbers(db, sign_date_end=datetime.date(2025, 2, 28)) == ["SO-BEFORE"]
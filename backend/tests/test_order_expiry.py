@@ -0,0 +1,80 @@
+import datetime
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app import models
+from app.api.endpoints import orders
+from app.crud import crud_order_expiry
+from app.database import get_db
+
+TODAY = datetime.date(2025, 6, 1)
+
+
+def seed(db, sales, customer, days_left):
+    """按到期前天数生成客户A的订单，返回 {天数: 订单}"""
+    created = {}
+    for days in days_left:
+        order = models.Order(
+            order_number=f"SO-{days}", customer_id=customer.id, sales_id=sales.id,
+            end_date=datetime.datetime.combine(TODAY + datetime.timedelta(days=days), datetime.time(18, 0)),
+        )
+        db.add(order)
+        created[days] = order
+    db.commit()
+    return created
+
+
+def reminders(db):
+    return sorted(
+        (r.order.order_number, r.window_days) for r in db.query(models.OrderExpiryReminder)
+    )
+
+
+def test_scan_uses_tightest_window_and_deduplicates(db, sales, customer):
+    seed(db, sales, customer, [-1, 3, 10, 20, 40])
+
+    assert crud_order_expiry.scan_expiring_orders(db, today=TODAY) == {7: 1, 15: 1, 30: 1}
+    assert reminders(db) == [("SO-10", 15), ("SO-20", 30), ("SO-3", 7)]
+
+    assert crud_order_expiry.scan_expiring_orders(db, today=TODAY) == {7: 0, 15: 0, 30: 0}
+    # 10 天后：SO-20 进入 15 天窗口，SO-40 进入 30 天窗口
+    later = TODAY + datetime.timedelta(days=10)
+    assert crud_order_expiry.scan_expiring_orders(db, today=later) == {7: 1, 15: 1, 30: 1}
+    assert ("SO-10", 7) in reminders(db) and ("SO-20", 15) in reminders(db) and ("SO-40", 30) in reminders(db)
+
+
+def test_scan_reads_only_new_dates_and_changed_orders(capture_statements, full_scans, db, sales, customer):
+    orders_by_days = seed(db, sales, customer, [5, 25])
+    crud_order_expiry.scan_expiring_orders(db, today=TODAY)
+
+    # 续期到已扫描区间内的新日期：由变更日志补查，不重新扫描区间
+    orders_by_days[25].end_date = datetime.datetime.combine(TODAY + datetime.timedelta(days=12), datetime.time())
+    db.commit()
+    statements = capture_statements(lambda: crud_order_expiry.scan_expiring_orders(db, today=TODAY))
+
+    assert ("SO-25", 15) in reminders(db)
+    assert full_scans(statements) == []
+
+
+@pytest.fixture
+def client(db):
+    app = FastAPI()
+    app.include_router(orders.router, prefix="/api/orders")
+    app.dependency_overrides[get_db] = lambda: db
+    return TestClient(app)
+
+
+def test_expiring_keyset_pagination_hides_stale_reminders(client, db, sales, customer):
+    orders_by_days = seed(db, sales, customer, [1, 2, 3, 4, 5])
+    crud_order_expiry.scan_expiring_orders(db, today=TODAY)
+    orders_by_days[5].status = models.OrderStatus.CANCELED
+    db.commit()
+
+    first = client.get("/api/orders/expiring", params={"limit": 2}).json()
+    second = client.get("/api/orders/expiring", params={"limit": 2, "cursor": first["next_cursor"]}).json()
+
+    assert [item["order_number"] for item in first["items"]] == ["SO-1", "SO-2"]
+    assert [item["order_number"] for item in second["items"]] == ["SO-3", "SO-4"]
+    assert second["next_cursor"] is None
+    assert client.get("/api/orders/expiring", params={"window_days": 30}).json()["items"] == []
+    assert client.get("/api/orders/expiring", params={"cursor": "bad"}).status_code == 400
@@ -0,0 +1,74 @@
+from decimal import Decimal
+from app import models
+from app.crud import crud_order
+
+
+def seed(db, sales):
+    customers = [models.Customer(company="客户A"), models.Customer(company="客户B")]
+    products = [
+        models.Product(name="标准版", real_price=Decimal("100.00"), sales_commission=Decimal("10.00"),
+                       manager_commission=Decimal("2.00"), director_commission=Decimal("1.00")),
+        models.Product(name="专业版", real_price=Decimal("300.00"), sales_commission=Decimal("30.00")),
+    ]
+    db.add_all([*customers, *products])
+    db.flush()
+    for customer, paid, lines in (
+        (customers[0], Decimal("100.00"), [(products[0], 2), (products[1], 1)]),
+        (customers[1], Decimal("0"), [(products[0], 1)]),
+    ):
+        order = models.Order(order_number=f"SO-{customer.company}", customer_id=customer.id, sales_id=sales.id, paid_amount=paid)
+        order.order_items = [
+            models.OrderItem(product_id=product.id, quantity=quantity, unit_price=product.real_price)
+            for product, quantity in lines
+        ]
+        db.add(order)
+    db.commit()
+
+
+def test_summary_totals_and_commissions(db, sales):
+    seed(db, sales)
+
+    summary = crud_order.get_order_summary(db)
+
+    assert summary["order_count"] == 2
+    assert summary["total_amount"] == Decimal("600.00")
+    assert summary["paid_amount"] == Decimal("100.00")
+    assert summary["outstanding_amount"] == Decimal("500.00")
+    assert summary["sales_commission"] == Decimal("60.00")
+    assert summary["manager_commission"] == Decimal("6.00")
+    assert summary["director_commission"] == Decimal("3.00")
+
+
+def test_summary_applies_list_filters_without_double_counting(db, sales):
+    seed(db, sales)
+
+    by_company = crud_order.get_order_summary(db, company="客户B")
+    by_product = crud_order.get_order_summary(db, name="版")
+
+    assert (by_company["order_count"], by_company["total_amount"]) == (1, Decimal("100.00"))
+    assert (by_product["order_count"], by_product["total_amount"]) == (2, Decimal("600.00"))
+    assert crud_order.get_order_summary(db, amount_min=Decimal("1000"))["order_count"] == 0
+
+
+def test_finance_view_rows_use_two_queries(capture_statements, db, sales):
+    seed(db, sales)
+
+    statements = capture_statements(lambda: crud_order.get_orders(db, view="finance"))
+    rows = crud_order.get_orders(db, view="finance")
+
+    assert len(statements) == 2
+    assert [row["company"] for row in rows] == ["客户A", "客户B"]
+    assert rows[0]["sales_name"] == "张三"
+    item = rows[0]["order_items"][0]
+    assert (item["product_name"], item["sales_commission"], item["quantity"]) == ("标准版", Decimal("10.00"), 2)
+
+
+def test_finance_view_name_filter_returns_each_order_once(db, sales):
+    seed(db, sales)
+
+    rows = crud_order.get_orders(db, view="finance", name="版")
+    fields = crud_order.get_orders(db, fields=("id", "order_items"), name="版", limit=1)
+
+    assert [row["company"] for row in rows] == ["客户A", "客户B"]
+    assert [len(row["order_items"]) for row in rows] == [2, 1]
+    assert len(fields) == 1 and len(fields[0]["order_items"]) == 2
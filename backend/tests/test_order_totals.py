@@ -0,0 +1,73 @@
+from decimal import Decimal
+from sqlalchemy import update
+from app import models
+from app.crud import crud_order
+from app.models.order import recalculate_order_totals
+
+
+def seed(db, sales, customer):
+    products = [models.Product(name=f"产品{i}", real_price=Decimal("10.00")) for i in range(2)]
+    db.add_all(products)
+    db.flush()
+    orders = []
+    for number, quantity in (("SO-1", 1), ("SO-2", 5), ("SO-3", 3)):
+        order = models.Order(order_number=number, customer_id=customer.id, sales_id=sales.id, paid_amount=0)
+        order.order_items = [models.OrderItem(product_id=products[0].id, quantity=quantity, unit_price=Decimal("10.00"))]
+        orders.append(order)
+    db.add_all(orders)
+    db.commit()
+    return orders, products
+
+
+def test_totals_maintained_on_item_and_payment_changes(db, sales, customer):
+    orders, products = seed(db, sales, customer)
+    order = orders[0]
+    assert (order.total_amount, order.outstanding_amount) == (Decimal("10.00"), Decimal("10.00"))
+
+    order.order_items.append(models.OrderItem(product_id=products[1].id, quantity=2, unit_price=Decimal("2.50")))
+    db.commit()
+    assert order.total_amount == Decimal("15.00")
+
+    order.paid_amount = Decimal("12.00")
+    db.commit()
+    assert order.outstanding_amount == Decimal("3.00")
+
+    db.delete(order.order_items[0])
+    db.commit()
+    db.expire_all()
+    assert (order.total_amount, order.outstanding_amount) == (Decimal("5.00"), Decimal("-7.00"))
+
+
+def test_rollback_discards_total_changes(db, sales, customer):
+    orders, products = seed(db, sales, customer)
+
+    db.add(models.OrderItem(order_id=orders[0].id, product_id=products[1].id, quantity=1, unit_price=Decimal("99.00")))
+    db.flush()
+    db.rollback()
+
+    assert db.get(models.Order, orders[0].id).total_amount == Decimal("10.00")
+
+
+def test_recalculate_after_bulk_statement(db, sales, customer):
+    orders, _ = seed(db, sales, customer)
+
+    db.execute(update(models.OrderItem).where(models.OrderItem.order_id == orders[1].id).values(quantity=1))
+    recalculate_order_totals(db, [orders[1].id])
+    db.commit()
+
+    assert orders[1].total_amount == Decimal("10.00")
+
+
+def test_amount_sort_reads_index_order(capture_statements, engine, db, sales, customer):
+    seed(db, sales, customer)
+
+    statements = capture_statements(lambda: crud_order.get_orders(
+        db, sort="-total_amount", fields=("id", "order_number", "total_amount")
+    ))
+
+    with engine.connect() as conn:
+        plan = [row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statements[0][0]}", statements[0][1])]
+    assert any("ix_orders_total_amount" in step for step in plan)
+    assert not any("TEMP B-TREE" in step for step in plan)
+    rows = crud_order.get_orders(db, sort="-total_amount", fields=("id", "order_number"))
+    assert [row["order_number"] for row in rows] == ["SO-2", "SO-3", "SO-1"]
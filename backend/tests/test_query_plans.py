@@ -0,0 +1,53 @@
+import datetime
+import pytest
+from app import models
+from app.crud import crud_contact, crud_customer, crud_order, crud_sales_follow
+
+CRUD_QUERIES = {
+    "customers_by_province": lambda db: crud_customer.get_customers(db, province="广东"),
+    "customers_by_province_city": lambda db: crud_customer.get_customers(db, province="广东", city="深圳"),
+    "customers_by_city": lambda db: crud_customer.get_customers(db, city="深圳"),
+    "customers_by_status": lambda db: crud_customer.get_customers(db, status=models.CustomerStatus.WON),
+    "customers_by_sales": lambda db: crud_customer.get_customers(db, sales_id=1),
+    "customers_by_sales_status": lambda db: crud_customer.get_customers(
+        db, sales_id=1, status=models.CustomerStatus.WON
+    ),
+    "customers_after_id": lambda db: crud_customer.get_customers(db, after_id=10),
+    "customers_search": lambda db: crud_customer.get_customers(db, q="测试客户"),
+    "customers_by_company": lambda db: crud_customer.get_customers(db, company="测试客户"),
+    "contacts_by_customer": lambda db: crud_contact.get_contacts_by_customer(db, customer_id=1),
+    "sales_follows_by_customer": lambda db: crud_sales_follow.get_sales_follows_by_customer(db, customer_id=1),
+    "orders_by_company": lambda db: crud_order.get_orders(db, company="测试客户"),
+    "orders_by_sales": lambda db: crud_order.get_orders(db, sales_id=1),
+    "orders_by_status": lambda db: crud_order.get_orders(db, status=models.OrderStatus.PAID),
+    "orders_by_start_date": lambda db: crud_order.get_orders(
+        db,
+        effective_date_start=datetime.datetime(2025, 1, 1),
+        effective_date_end=datetime.datetime(2025, 12, 31),
+    ),
+    "orders_by_end_date": lambda db: crud_order.get_orders(
+        db,
+        expiry_date_start=datetime.datetime(2025, 1, 1),
+        expiry_date_end=datetime.datetime(2025, 12, 31),
+    ),
+    "orders_by_sign_date": lambda db: crud_order.get_orders(
+        db,
+        sign_date_start=datetime.date(2025, 1, 1),
+        sign_date_end=datetime.date(2025, 12, 31),
+    ),
+    "orders_after_id": lambda db: crud_order.get_orders(db, after_id=10),
+    "orders_by_amount": lambda db: crud_order.get_orders(db, amount_min=100, amount_max=500),
+    "customer_service_records": lambda db: crud_customer.get_customer(db, customer_id=1).service_records,
+    "customer_orders": lambda db: crud_customer.get_customer(db, customer_id=1).orders,
+}
+
+
+@pytest.mark.parametrize("name", sorted(CRUD_QUERIES))
+def test_crud_query_uses_index(capture_statements, full_scans, db, sales, name):
+    db.add(models.Customer(id=1, company="测试客户", sales_id=sales.id))
+    db.commit()
+
+    statements = capture_statements(lambda: CRUD_QUERIES[name](db))
+
+    assert statements
+    assert full_scans(statements) == []
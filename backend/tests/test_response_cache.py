@@ -0,0 +1,107 @@
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+from app import models
+from app.database import get_db
+from app.utils.conditional import conditional_get
+from app.utils.response_cache import (
+    CachedResponse,
+    CachedRoute,
+    MemoryCacheBackend,
+    cache_response,
+    response_cache,
+)
+
+
+@pytest.fixture
+def cache():
+    previous = response_cache.backend
+    backend = MemoryCacheBackend(max_bytes=1024 * 1024, default_ttl=60)
+    response_cache.configure(backend)
+    yield backend
+    response_cache.configure(previous)
+
+
+@pytest.fixture
+def client(db, cache):
+    app = FastAPI()
+    router = APIRouter(route_class=CachedRoute)
+    calls = []
+
+    @router.get("/customers", dependencies=[conditional_get("customers")])
+    @cache_response("customers")
+    def list_customers(city: str = None):
+        calls.append(city)
+        query = db.query(models.Customer)
+        if city:
+            query = query.filter(models.Customer.city == city)
+        return [c.company for c in query]
+
+    app.include_router(router)
+    app.dependency_overrides[get_db] = lambda: db
+    client = TestClient(app)
+    client.calls = calls
+    return client
+
+
+def test_repeated_request_served_from_cache(client, cache):
+    first = client.get("/customers?city=深圳&limit=10")
+    second = client.get("/customers?limit=10&city=深圳")  # 参数顺序不影响缓存键
+
+    assert first.json() == second.json()
+    assert second.headers["ETag"] == first.headers["ETag"]
+    assert len(client.calls) == 1
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+
+def test_cached_etag_answers_conditional_request(client):
+    first = client.get("/customers")
+    second = client.get("/customers", headers={"If-None-Match": first.headers["ETag"]})
+
+    assert second.status_code == 304
+    assert len(client.calls) == 1
+
+
+def test_commit_invalidates_tagged_entries(client, db, cache):
+    assert client.get("/customers").json() == []
+
+    db.add(models.Customer(company="客户A"))
+    db.commit()
+
+    assert client.get("/customers").json() == ["客户A"]
+    assert len(client.calls) == 2
+    assert cache.stats.invalidations == 1
+
+
+def test_rollback_does_not_invalidate(client, db, cache):
+    client.get("/customers")
+
+    db.add(models.Customer(company="客户A"))
+    db.flush()
+    db.rollback()
+
+    client.get("/customers")
+    assert len(client.calls) == 1
+    assert cache.stats.invalidations == 0
+
+
+def test_memory_backend_evicts_least_recently_used():
+    backend = MemoryCacheBackend(max_bytes=250, default_ttl=60)
+    for key in ("a", "b", "c"):
+        backend.set(key, CachedResponse(b"x" * 100, {}), ("customers",))
+
+    assert backend.get("a") is None
+    assert backend.get("c") is not None
+    assert backend.stats.evictions == 1
+    assert backend.info()["bytes"] <= 250
+
+    backend.set("huge", CachedResponse(b"x" * 1000, {}), ("customers",))
+    assert backend.get("huge") is None
+
+
+def test_memory_backend_expires_entries():
+    backend = MemoryCacheBackend(max_bytes=1024, default_ttl=60)
+    backend.set("a", CachedResponse(b"x", {}), ("customers",), ttl=-1)
+
+    assert backend.get("a") is None
+    assert backend.info()["entries"] == 0
@@ -0,0 +1,110 @@
+import datetime
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app import models
+from app.api.endpoints import sales_follows
+from app.config import settings
+from app.crud import crud_sales_follow
+from app.database import get_db
+
+TODAY = datetime.date(2025, 6, 2)
+
+
+def at(days, hour=10):
+    return datetime.datetime.combine(TODAY + datetime.timedelta(days=days), datetime.time(hour))
+
+
+def seed(db):
+    department = models.Department(name="销售一部")
+    db.add(department)
+    db.flush()
+    reps = [models.Employee(username=f"sales{i}", name=f"销售{i}", hashed_password="x", department_id=department.id) for i in range(2)]
+    other = models.Employee(username="other", name="其他", hashed_password="x")
+    db.add_all([*reps, other])
+    db.flush()
+    customers = [models.Customer(company=f"客户{i}") for i in range(5)]
+    db.add_all(customers)
+    db.flush()
+
+    def follow(customer, employee, days_ago, next_days):
+        return models.SalesFollow(
+            customer_id=customer.id, employee_id=employee.id, content="跟进", follow_type="电话",
+            follow_date=at(-days_ago), next_follow_date=at(next_days) if next_days is not None else None,
+        )
+
+    db.add_all([
+        # 客户0：较早的跟进约定已被最近一次跟进取代
+        follow(customers[0], reps[0], 10, -3),
+        follow(customers[0], reps[0], 1, 2),
+        follow(customers[1], reps[0], 5, -1),  # 逾期
+        follow(customers[2], reps[1], 2, 0),  # 今天
+        follow(customers[3], reps[1], 1, None),  # 最近一次没有约定下次跟进
+        follow(customers[4], other, 1, 1),
+    ])
+    db.commit()
+    return department, reps, other
+
+
+def names(rows):
+    return [row["customer_name"] for row in rows]
+
+
+def test_agenda_lists_latest_pending_follow_per_customer(db):
+    _, reps, _ = seed(db)
+
+    rows = crud_sales_follow.get_follow_agenda(db, [rep.id for rep in reps], date_to=TODAY + datetime.timedelta(days=6), today=TODAY)
+
+    assert names(rows) == ["客户1", "客户2", "客户0"]
+    assert [row["status"] for row in rows] == ["overdue", "today", "upcoming"]
+    assert names(crud_sales_follow.get_follow_agenda(db, [reps[0].id], date_from=TODAY, today=TODAY)) == ["客户0"]
+
+
+def test_agenda_query_uses_indexes(capture_statements, full_scans, db):
+    _, reps, _ = seed(db)
+
+    statements = capture_statements(
+        lambda: crud_sales_follow.get_follow_agenda(db, [rep.id for rep in reps], date_from=TODAY, date_to=TODAY, today=TODAY)
+    )
+
+    assert full_scans(statements) == []
+
+
+@pytest.fixture
+def client(db):
+    app = FastAPI()
+    app.include_router(sales_follows.router, prefix="/api/sales-follows")
+    app.dependency_overrides[get_db] = lambda: db
+    return TestClient(app)
+
+
+def test_agenda_endpoint_pages_team_by_keyset(client, db):
+    department, _, other = seed(db)
+    params = {"department_id": department.id, "from": "2000-01-01", "to": "2100-01-01", "limit": 2}
+
+    first = client.get("/api/sales-follows/agenda", params=params).json()
+    second = client.get("/api/sales-follows/agenda", params={**params, "cursor": first["next_cursor"]}).json()
+
+    assert names(first["items"]) == ["客户1", "客户2"]
+    assert names(second["items"]) == ["客户0"] and second["next_cursor"] is None
+    solo = client.get("/api/sales-follows/agenda", params={"employee_id": other.id, "from": "2000-01-01", "to": "2100-01-01"})
+    assert names(solo.json()["items"]) == ["客户4"]
+    assert client.get("/api/sales-follows/agenda").status_code == 400
+
+
+def test_agenda_endpoint_bounds_team_query_without_from(capture_statements, full_scans, client, db, monkeypatch):
+    department, _, _ = seed(db)
+    monkeypatch.setattr(sales_follows, "business_today", lambda: TODAY)
+    monkeypatch.setattr(settings, "FOLLOW_AGENDA_OVERDUE_DAYS", 0)
+    responses = []
+
+    statements = capture_statements(
+        lambda: responses.append(client.get("/api/sales-follows/agenda", params={"department_id": department.id}))
+    )
+
+    assert names(responses[0].json()["items"]) == ["客户2", "客户0"]
+    agenda = [(statement, parameters) for statement, parameters in statements if "next_follow_date" in statement]
+    assert len(agenda) == 1
+    statement = agenda[0][0]
+    assert "sales_follows.next_follow_date >= " in statement and "sales_follows.next_follow_date < " in statement
+    assert full_scans(agenda) == []
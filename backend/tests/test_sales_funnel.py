@@ -0,0 +1,165 @@
+import datetime
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app import models
+from app.api.endpoints import analytics
+from app.crud import crud_analytics, crud_customer
+from app.database import get_db
+from app.models.customer import CustomerStatus
+from app.config import settings
+from app.schemas import CustomerCreate, CustomerUpdate
+from app.utils.response_cache import MemoryCacheBackend, response_cache
+
+LEAD, CONTACTED, PROPOSAL, WON, LOST = CustomerStatus.LEAD, CustomerStatus.CONTACTED, CustomerStatus.PROPOSAL, CustomerStatus.WON, CustomerStatus.LOST
+
+
+def history(db):
+    return [
+        (change.from_status, change.to_status)
+        for change in db.query(models.CustomerStatusChange).order_by(models.CustomerStatusChange.id)
+    ]
+
+
+def test_update_customer_records_status_transitions(db):
+    customer = crud_customer.create_customer(db, CustomerCreate(company="客户A"))
+    crud_customer.update_customer(db, customer.id, CustomerUpdate(city="深圳"))
+    crud_customer.update_customer(db, customer.id, CustomerUpdate(status=CONTACTED))
+    crud_customer.update_customer(db, customer.id, CustomerUpdate(status=CONTACTED, notes="再次确认"))
+
+    assert history(db) == [(None, LEAD), (LEAD, CONTACTED)]
+    change = db.query(models.CustomerStatusChange).filter_by(from_status=LEAD).one()
+    assert change.stage_seconds is not None and change.stage_seconds >= 0
+
+
+def test_import_records_initial_status(db):
+    crud_customer.bulk_import_customers(db, [{"company": "客户A"}, {"company": "客户B", "status": WON.value}])
+
+    assert sorted(history(db), key=lambda pair: pair[1].name) == [(None, LEAD), (None, WON)]
+
+
+def at(day, hour=12):
+    return datetime.datetime(2025, *day, hour)
+
+
+def seed(db):
+    """两名销售在 5、6 月的状态变更，stage_seconds 以天为单位便于核对"""
+    department = models.Department(name="销售一部")
+    db.add(department)
+    db.flush()
+    zhang = models.Employee(username="zhang", name="张三", hashed_password="x", department_id=department.id)
+    li = models.Employee(username="li", name="李四", hashed_password="x")
+    db.add_all([zhang, li])
+    db.flush()
+    customers = [models.Customer(company=f"客户{i}", sales_id=zhang.id if i < 3 else li.id) for i in range(4)]
+    db.add_all(customers)
+    db.flush()
+    day = 86400
+    rows = [
+        (customers[0], None, LEAD, None, (5, 2)),
+        (customers[0], LEAD, CONTACTED, 2 * day, (5, 4)),
+        (customers[0], CONTACTED, WON, 10 * day, (6, 14)),
+        (customers[1], None, LEAD, None, (5, 10)),
+        (customers[1], LEAD, LOST, 4 * day, (5, 14)),
+        (customers[2], None, LEAD, None, (6, 1)),
+        (customers[3], None, LEAD, None, (5, 20)),
+        (customers[3], LEAD, CONTACTED, 6 * day, (5, 26)),
+    ]
+    db.add_all([
+        models.CustomerStatusChange(
+            customer_id=customer.id, from_status=from_status, to_status=to_status,
+            sales_id=customer.sales_id, stage_seconds=seconds, changed_at=at(day_),
+        )
+        for customer, from_status, to_status, seconds, day_ in rows
+    ])
+    for customer, status in zip(customers, (WON, LOST, LEAD, CONTACTED)):
+        customer.status = status
+    db.commit()
+    return department, zhang, li
+
+
+def stages(period):
+    return {stage["status"]: stage for stage in period["stages"]}
+
+
+def test_funnel_groups_transitions_by_month(db):
+    seed(db)
+
+    funnel = crud_analytics.get_funnel(db, period="month")
+
+    assert [p["period"] for p in funnel["periods"]] == ["2025-05", "2025-06"]
+    may, june = funnel["periods"]
+    lead = stages(may)[LEAD]
+    assert (lead["entered"], lead["exited"], lead["advanced"]) == (3, 3, 2)
+    assert lead["conversion_rate"] == pytest.approx(0.6667)
+    assert lead["avg_days_in_stage"] == 4.0
+    assert (may["won"], may["lost"], may["conversion_rate"]) == (0, 1, 0.0)
+    assert (june["won"], june["lost"], june["conversion_rate"]) == (1, 0, 1.0)
+    assert stages(june)[CONTACTED]["avg_days_in_stage"] == 10.0
+    assert {s["status"]: s["customers"] for s in funnel["stages"]} == {LEAD: 1, CONTACTED: 1, PROPOSAL: 0, WON: 1, LOST: 1}
+
+
+def test_funnel_filters_and_groups_by_owner(db):
+    department, zhang, li = seed(db)
+
+    quarter = crud_analytics.get_funnel(db, period="quarter", department_id=department.id)
+    assert [p["period"] for p in quarter["periods"]] == ["2025-Q2"]
+    assert stages(quarter["periods"][0])[LEAD]["entered"] == 3
+
+    owners = crud_analytics.get_funnel(db, by_owner=True, date_from=datetime.date(2025, 5, 1), date_to=datetime.date(2025, 5, 31))
+    assert [(p["period"], p["sales_name"]) for p in owners["periods"]] == [("2025-05", "张三"), ("2025-05", "李四")]
+    assert stages(owners["periods"][1])[CONTACTED]["entered"] == 1
+    assert sum(s["customers"] for s in crud_analytics.get_funnel(db, sales_id=li.id)["stages"]) == 1
+
+
+def add_changes(db, *moments):
+    customer = models.Customer(company="客户A")
+    db.add(customer)
+    db.flush()
+    db.add_all([models.CustomerStatusChange(customer_id=customer.id, to_status=LEAD, changed_at=moment) for moment in moments])
+    db.commit()
+
+
+def test_funnel_weeks_are_iso_weeks(db):
+    # 2024-12-30 属于 2025 年第 1 周，2021-01-03 属于 2020 年第 53 周
+    add_changes(db, datetime.datetime(2024, 12, 30, 12), datetime.datetime(2021, 1, 3, 12), datetime.datetime(2025, 6, 4, 12))
+
+    funnel = crud_analytics.get_funnel(db, period="week")
+
+    assert [p["period"] for p in funnel["periods"]] == ["2020-W53", "2025-W01", "2025-W23"]
+
+
+def test_funnel_periods_use_offset_in_effect_at_change(db, monkeypatch):
+    monkeypatch.setattr(settings, "BUSINESS_TIMEZONE", "America/New_York")
+    # UTC 04:30 在冬令时为前一天 23:30（-5），在夏令时为当天 00:30（-4）
+    add_changes(db, datetime.datetime(2025, 1, 1, 4, 30), datetime.datetime(2025, 7, 1, 4, 30))
+
+    funnel = crud_analytics.get_funnel(db, period="month")
+
+    assert [p["period"] for p in funnel["periods"]] == ["2024-12", "2025-07"]
+
+
+@pytest.fixture
+def client(db):
+    previous = response_cache.backend
+    response_cache.configure(MemoryCacheBackend(max_bytes=1024 * 1024, default_ttl=60))
+    app = FastAPI()
+    app.include_router(analytics.router, prefix="/api/analytics")
+    app.dependency_overrides[get_db] = lambda: db
+    yield TestClient(app)
+    response_cache.configure(previous)
+
+
+def test_funnel_endpoint_caches_until_status_changes(client, db):
+    _, zhang, _ = seed(db)
+    params = {"period": "month", "sales_id": zhang.id}
+
+    first = client.get("/api/analytics/funnel", params=params)
+    assert client.get("/api/analytics/funnel", params=params).json() == first.json()
+    assert response_cache.backend.stats.hits == 1
+
+    customer = db.query(models.Customer).filter_by(company="客户2").one()
+    crud_customer.update_customer(db, customer.id, CustomerUpdate(status=CONTACTED))
+    refreshed = client.get("/api/analytics/funnel", params=params).json()
+    assert {s["status"]: s["customers"] for s in refreshed["stages"]}[CONTACTED.value] == 1
+    assert client.get("/api/analytics/funnel", params={"period": "day"}).status_code == 422
@@ -0,0 +1,86 @@
+import datetime
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app import models
+from app.api.endpoints import sales_view
+from app.crud import crud_sales_view
+from app.database import get_db
+
+DAY = datetime.datetime(2025, 5, 1)
+
+
+def seed(db, sales):
+    """三个客户：A 有三条跟进（两条同一天），B 有一条，C 没有跟进"""
+    customers = [
+        models.Customer(company=name, province="广东", city=city, sales_id=sales.id)
+        for name, city in (("客户A", "深圳"), ("客户B", "广州"), ("客户C", "深圳"))
+    ]
+    db.add_all(customers)
+    db.flush()
+    a, b, _ = customers
+    db.add_all([
+        models.Contact(name="联系人1", phone="13800000001", customer_id=a.id),
+        models.Contact(name="联系人2", phone="13800000002", customer_id=a.id),
+        models.SalesFollow(customer_id=a.id, employee_id=sales.id, content="1", follow_type="电话",
+                           follow_date=DAY - datetime.timedelta(days=3), intention_level="低"),
+        models.SalesFollow(customer_id=a.id, employee_id=sales.id, content="2", follow_type="电话",
+                           follow_date=DAY, intention_level="中"),
+        models.SalesFollow(customer_id=a.id, employee_id=sales.id, content="3", follow_type="拜访",
+                           follow_date=DAY, intention_level="高", next_follow_date=DAY + datetime.timedelta(days=7)),
+        models.SalesFollow(customer_id=b.id, employee_id=sales.id, content="4", follow_type="电话",
+                           follow_date=DAY, intention_level="中", next_follow_date=DAY + datetime.timedelta(days=1)),
+        models.Order(order_number="SO-1", customer_id=b.id, sales_id=sales.id),
+    ])
+    db.commit()
+
+
+def companies(rows):
+    return [row["company"] for row in rows]
+
+
+def test_one_row_per_customer_with_latest_follow(db, sales):
+    seed(db, sales)
+
+    rows = crud_sales_view.get_sales_view_data(db)
+
+    assert companies(rows) == ["客户A", "客户B", "客户C"]
+    a, b, c = rows
+    assert (a["contact_count"], a["sales_follow_count"], a["order_count"]) == (2, 3, 0)
+    assert a["intention_level"] == "高"  # 同一天的两条跟进取ID较大的一条
+    assert a["next_follow_date"] == DAY + datetime.timedelta(days=7)
+    assert (b["sales_follow_count"], b["order_count"], b["sales_owner_name"]) == (1, 1, "张三")
+    assert (c["sales_follow_count"], c["intention_level"]) == (0, None)
+    assert companies(crud_sales_view.get_sales_view_data(db, skip=1, limit=1)) == ["客户B"]
+
+
+def test_filters_and_sorting(db, sales):
+    seed(db, sales)
+
+    assert companies(crud_sales_view.get_sales_view_data(db, city="深圳")) == ["客户A", "客户C"]
+    assert companies(crud_sales_view.get_sales_view_data(db, intention_level="中")) == ["客户B"]
+    assert companies(crud_sales_view.get_sales_view_data(db, sort="-sales_follow_count")) == ["客户A", "客户B", "客户C"]
+    assert companies(crud_sales_view.get_sales_view_data(db, sort="-order_count", limit=1)) == ["客户B"]
+    assert companies(crud_sales_view.get_sales_view_data(db, sort="next_follow_date", skip=1)) == ["客户B", "客户A"]
+
+
+def test_page_reads_only_customers(capture_statements, db, sales):
+    seed(db, sales)
+
+    statements = capture_statements(lambda: crud_sales_view.get_sales_view_data(db, sort="-next_follow_date"))
+
+    assert len(statements) == 1
+    assert "sales_follows" not in statements[0][0]
+
+
+def test_endpoint_validates_sort(db, sales):
+    seed(db, sales)
+    app = FastAPI()
+    app.include_router(sales_view.router, prefix="/api/sales-view")
+    app.dependency_overrides[get_db] = lambda: db
+    client = TestClient(app)
+
+    response = client.get("/api/sales-view/", params={"sort": "-contact_count", "limit": 1})
+
+    assert response.status_code == 200
+    assert companies(response.json()) == ["客户A"]
+    assert client.get("/api/sales-view/", params={"sort": "content"}).status_code == 422
@@ -0,0 +1,80 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+import pytest
+from app import models
+from app.api.endpoints import service_records
+from app.crud import crud_service_record
+from app.database import get_db
+
+
+def seed(db, sales):
+    """客户A 三条记录（一条已关闭）、B 一条、C 没有服务记录"""
+    service = models.Employee(username="service", name="李四", hashed_password="x")
+    db.add(service)
+    db.flush()
+    a, b, c = customers = [
+        models.Customer(company=name, city=city, sales_id=sales.id, service_id=service.id if name != "客户B" else None)
+        for name, city in (("客户A", "深圳"), ("客户B", "广州"), ("客户C", "深圳"))
+    ]
+    db.add_all(customers)
+    db.flush()
+    db.add_all([
+        models.Contact(name="联系人1", phone="13800000001", customer_id=a.id),
+        models.Contact(name="联系人2", phone="13800000002", customer_id=a.id),
+        models.Contact(name="联系人3", phone="13800000003", customer_id=c.id),
+        models.ServiceRecord(customer_id=a.id, employee_id=service.id, title="1", status="待处理"),
+        models.ServiceRecord(customer_id=a.id, employee_id=service.id, title="2", status="处理中"),
+        models.ServiceRecord(customer_id=a.id, employee_id=service.id, title="3", status="已关闭"),
+        models.ServiceRecord(customer_id=b.id, employee_id=service.id, title="4", status="已完成"),
+    ])
+    db.commit()
+    return service
+
+
+def test_one_row_per_customer_with_service_records(db, sales):
+    seed(db, sales)
+
+    rows = crud_service_record.get_service_records_by_customer(db)
+
+    assert [(r["company"], r["contact_count"], r["record_count"], r["open_count"]) for r in rows] == [
+        ("客户A", 2, 3, 2),
+        ("客户B", 0, 1, 0),
+    ]
+    assert (rows[0]["sales_name"], rows[0]["service_name"], rows[1]["service_name"]) == ("张三", "李四", None)
+
+
+def test_filters(db, sales):
+    service = seed(db, sales)
+
+    def companies(**filters):
+        return [r["company"] for r in crud_service_record.get_service_records_by_customer(db, **filters)]
+
+    assert companies(status="已完成") == ["客户B"]
+    assert companies(service_id=service.id) == ["客户A"]
+    assert companies(city="广州") == ["客户B"]
+
+
+def test_page_is_a_single_statement(capture_statements, db, sales):
+    seed(db, sales)
+
+    statements = capture_statements(lambda: crud_service_record.get_service_records_by_customer(db, limit=10))
+
+    assert len(statements) == 1
+
+
+@pytest.fixture
+def client(db):
+    app = FastAPI()
+    app.include_router(service_records.router, prefix="/api/service-records")
+    app.dependency_overrides[get_db] = lambda: db
+    return TestClient(app)
+
+
+def test_endpoint_pages_by_customer(client, db, sales):
+    seed(db, sales)
+
+    first = client.get("/api/service-records/by-customer", params={"limit": 1}).json()
+    second = client.get("/api/service-records/by-customer", params={"limit": 1, "cursor": first["next_cursor"]}).json()
+
+    assert [r["company"] for r in first["items"]] == ["客户A"]
+    assert [r["company"] for r in second["items"]] == ["客户B"] and second["next_cursor"] is None
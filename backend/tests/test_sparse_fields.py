@@ -0,0 +1,63 @@
+import json
+import pytest
+from fastapi import HTTPException
+from app import models, schemas
+from app.crud import crud_customer, crud_order
+from app.utils.fields import parse_fields, projection_response
+
+
+def seed(db, sales):
+    for i in range(3):
+        db.add(models.Customer(
+            company=f"客户{i}", notes="很长的备注" * 100, sales_id=sales.id,
+            contacts=[models.Contact(name="李四", phone="13800000000")],
+        ))
+    db.commit()
+
+
+def test_parse_fields_always_includes_id():
+    assert parse_fields("company, status,company", crud_customer.CUSTOMER_FIELDS) == ("id", "company", "status")
+    assert parse_fields(None, crud_customer.CUSTOMER_FIELDS) is None
+
+
+def test_parse_fields_rejects_unknown_names():
+    with pytest.raises(HTTPException) as exc:
+        parse_fields("company,password", crud_customer.CUSTOMER_FIELDS)
+    assert exc.value.status_code == 400
+
+
+def test_sparse_customers_select_only_requested_columns(capture_statements, db, sales):
+    seed(db, sales)
+    fields = parse_fields("company,sales_name", crud_customer.CUSTOMER_FIELDS)
+
+    rows = []
+    statements = capture_statements(lambda: rows.extend(crud_customer.get_customers(db, fields=fields)))
+
+    assert len(statements) == 1  # 未请求联系人，不查询 contacts
+    assert "notes" not in statements[0][0] and "address" not in statements[0][0]
+    assert rows[0] == {"id": 1, "company": "客户0", "sales_name": "张三"}
+
+
+def test_sparse_customers_with_contacts(capture_statements, db, sales):
+    seed(db, sales)
+    fields = parse_fields("company,contacts", crud_customer.CUSTOMER_FIELDS)
+
+    statements = capture_statements(lambda: crud_customer.get_customers(db, fields=fields))
+    rows = crud_customer.get_customers(db, fields=fields)
+
+    assert len(statements) == 2
+    assert [contact["name"] for contact in rows[0]["contacts"]] == ["李四"]
+
+
+def test_projection_response_keeps_field_serialization(db, sales):
+    seed(db, sales)
+    db.add(models.Order(order_number="SO-1", customer_id=1, sales_id=1, paid_amount=10))
+    db.commit()
+    fields = parse_fields("status,paid_amount,total_amount", crud_order.ORDER_FIELDS)
+
+    response = projection_response(schemas.Order, fields, crud_order.get_orders(db, fields=fields), next_cursor=None)
+
+    assert json.loads(response.body) == {
+        "items": [{"id": 1, "status": "待付款", "paid_amount": "10.00", "total_amount": "0.00"}],
+        "next_cursor": None,
+    }
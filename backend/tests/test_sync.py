@@ -0,0 +1,106 @@
+import pytest
+
+from sqlalchemy import delete, insert
+from app import models
+from app.crud import crud_change_log, crud_sync
+
+
+def test_changes_since_token(db):
+    db.add(models.Customer(company="客户A"))
+    db.commit()
+    token = crud_sync.get_latest_position(db)
+
+    customer = models.Customer(company="客户B", contacts=[models.Contact(name="李四", phone="138")])
+    db.add(customer)
+    db.commit()
+
+    changes, new_token, has_more = crud_sync.get_changes(db, since=token)
+
+    assert [row["company"] for row in changes["customers"]["upserted"]] == ["客户B"]
+    assert [row["name"] for row in changes["contacts"]["upserted"]] == ["李四"]
+    assert new_token > token and not has_more
+    assert crud_sync.get_changes(db, since=new_token)[0]["customers"]["upserted"] == []
+
+
+def test_deletes_leave_tombstones(db):
+    customer = models.Customer(company="客户A")
+    db.add(customer)
+    db.commit()
+    token = crud_sync.get_latest_position(db)
+
+    db.delete(customer)
+    db.commit()
+
+    changes, _, _ = crud_sync.get_changes(db, since=token)
+    assert changes["customers"] == {"upserted": [], "deleted": [customer.id]}
+
+
+def test_repeated_changes_are_compacted_and_tokens_stay_monotonic(db):
+    customer = models.Customer(company="客户A")
+    db.add(customer)
+    db.commit()
+    token = crud_sync.get_latest_position(db)
+
+    for city in ("北京", "上海", "深圳"):
+        customer.city = city
+        db.commit()
+
+    assert db.query(models.ChangeLog).filter_by(table_name="customers").count() == 1
+    assert crud_sync.get_latest_position(db) > token
+    changes, _, _ = crud_sync.get_changes(db, since=token)
+    assert [row["city"] for row in changes["customers"]["upserted"]] == ["深圳"]
+
+
+def test_limit_reports_has_more(db):
+    db.add_all([models.Customer(company=f"客户{i}") for i in range(5)])
+    db.commit()
+
+    changes, token, has_more = crud_sync.get_changes(db, since=(0, 0), limit=3)
+    rest, _, more = crud_sync.get_changes(db, since=token, limit=3)
+
+    assert has_more and not more
+    assert len(changes["customers"]["upserted"]) + len(rest["customers"]["upserted"]) == 5
+
+
+@pytest.mark.parametrize("first_xact, second_xact", [(100, 101), (101, 100)])
+def test_transactions_committed_out_of_order_are_not_skipped(db, monkeypatch, first_xact, second_xact):
+    # PostgreSQL 上的两事务场景：事务 A 先取得 id=10 但尚未提交，事务 B 取得 id=11 并已提交。
+    # SQLite 无法并发写入，这里按 PostgreSQL 的方式读取，直接写入变更日志并模拟快照 xmin：A 未结束时 xmin 为 A 的事务号
+    customers = [models.Customer(company="客户A"), models.Customer(company="客户B")]
+    db.add_all(customers)
+    db.commit()
+    db.execute(delete(models.ChangeLog))
+    snapshot = {"xmin": first_xact}
+    monkeypatch.setattr(crud_change_log, "_commits_in_id_order", lambda db: False)
+    monkeypatch.setattr(
+        crud_change_log, "committed_conditions", lambda db: [models.ChangeLog.xact_id < snapshot["xmin"]]
+    )
+
+    def log(xact_id, change_id, customer):
+        db.execute(insert(models.ChangeLog).values(
+            id=change_id, xact_id=xact_id, table_name="customers", row_id=customer.id, operation="U"
+        ))
+        db.commit()
+
+    log(second_xact, 11, customers[1])
+    changes, token, _ = crud_sync.get_changes(db, since=(0, 0))
+    delivered = [row["company"] for row in changes["customers"]["upserted"]]
+
+    log(first_xact, 10, customers[0])
+    snapshot["xmin"] = 102
+    changes, token, _ = crud_sync.get_changes(db, since=token)
+    delivered += [row["company"] for row in changes["customers"]["upserted"]]
+
+    assert sorted(delivered) == ["客户A", "客户B"]
+    assert token == (101, 11 if first_xact == 100 else 10)
+    assert crud_sync.get_latest_position(db) == token
+
+
+def test_change_log_support_is_checked_per_dialect():
+    from sqlalchemy import create_mock_engine
+    from app.models.change_log import check_change_log_support
+
+    for url in ("sqlite://", "postgresql://"):
+        check_change_log_support(create_mock_engine(url, lambda *a, **kw: None))
+    with pytest.raises(RuntimeError):
+        check_change_log_support(create_mock_engine("mysql://", lambda *a, **kw: None))
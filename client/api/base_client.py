@@ -3,7 +3,8 @@ API客户端基础类
 """
 import requests
 import json
-from typing import Dict, Any, Optional, List
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List, Tuple
 from config_clean import API_BASE_URL, API_TIMEOUT, DEBUG
 
 class APIException(Exception):
@@ -16,6 +17,9 @@ class APIException(Exception):
 class BaseAPIClient:
     """API客户端基础类"""
     
+    # 条件 GET 缓存的最大条目数
+    ETAG_CACHE_SIZE = 64
+    
     def __init__(self):
         self.base_url = API_BASE_URL
         self.timeout = API_TIMEOUT
@@ -27,11 +31,23 @@ class BaseAPIClient:
             'Accept': 'application/json',
             'User-Agent': 'SellSYS-Client/1.0'
         })
+        
+        # 条件 GET 缓存：{请求键: (ETag, 响应原文)}，服务端返回 304 时直接复用原文
+        self._etag_cache: "OrderedDict[Tuple, Tuple[str, str]]" = OrderedDict()
     
     def _make_request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
         """发起HTTP请求"""
         url = f"{self.base_url.rstrip('/')}/{endpoint.lstrip('/')}"
         
+        # GET 请求带上上次的 ETag，数据未变化时服务端返回 304 且不含响应体
+        cache_key = None
+        cached = None
+        if method.upper() == 'GET':
+            cache_key = (url, json.dumps(kwargs.get('params') or {}, sort_keys=True, default=str))
+            cached = self._etag_cache.get(cache_key)
+            if cached:
+                kwargs['headers'] = {**kwargs.get('headers', {}), 'If-None-Match': cached[0]}
+        
         try:
             if DEBUG:
                 print(f"[API] {method.upper()} {url}")
@@ -48,6 +64,10 @@ class BaseAPIClient:
             if DEBUG:
                 print(f"[API] Response status: {response.status_code}")
             
+            if response.status_code == 304 and cached:
+                self._etag_cache.move_to_end(cache_key)
+                return json.loads(cached[1])
+            
             # 检查响应状态
             if response.status_code >= 400:
                 error_data = {}
@@ -64,7 +84,10 @@ class BaseAPIClient:
             
             # 解析响应
             try:
-                return response.json()
+                data = response.json()
+                if cache_key and response.headers.get('ETag'):
+                    self._remember_etag(cache_key, response.headers['ETag'], response.text)
+                return data
             except json.JSONDecodeError:
                 return {"message": "Success", "data": response.text}
                 
@@ -75,6 +98,36 @@ class BaseAPIClient:
         except requests.exceptions.RequestException as e:
             raise APIException(f"请求异常: {str(e)}")
     
+    def _remember_etag(self, cache_key: Tuple, etag: str, body: str):
+        """记录 GET 响应的 ETag 和原文，超出容量时淘汰最久未用的条目"""
+        self._etag_cache[cache_key] = (etag, body)
+        self._etag_cache.move_to_end(cache_key)
+        while len(self._etag_cache) > self.ETAG_CACHE_SIZE:
+            self._etag_cache.popitem(last=False)
+    
+    def download(self, endpoint: str, file_path: str, params: Optional[Dict] = None) -> int:
+        """以流式方式下载接口返回的文件并写入 file_path，返回写入的字节数"""
+        url = f"{self.base_url.rstrip('/')}/{endpoint.lstrip('/')}"
+        try:
+            with self.session.get(url, params=params, timeout=self.timeout, stream=True) as response:
+                if response.status_code >= 400:
+                    raise APIException(
+                        message=f"API请求失败: {response.status_code}",
+                        status_code=response.status_code
+                    )
+                written = 0
+                with open(file_path, 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=64 * 1024):
+                        f.write(chunk)
+                        written += len(chunk)
+                return written
+        except requests.exceptions.Timeout:
+            raise APIException("请求超时，请检查网络连接")
+        except requests.exceptions.ConnectionError:
+            raise APIException("连接失败，请检查服务器状态")
+        except requests.exceptions.RequestException as e:
+            raise APIException(f"请求异常: {str(e)}")
+    
     def get(self, endpoint: str, params: Optional[Dict] = None) -> Dict[str, Any]:
         """GET请求"""
         return self._make_request('GET', endpoint, params=params)
@@ -100,11 +153,13 @@ class BaseAPIClient:
         self.session.headers.update({
             'Authorization': f'Bearer {token}'
         })
+        self._etag_cache.clear()
     
     def clear_auth_token(self):
         """清除认证令牌"""
         if 'Authorization' in self.session.headers:
             del self.session.headers['Authorization']
+        self._etag_cache.clear()
 
 class CRUDAPIClient(BaseAPIClient):
     """CRUD操作API客户端基础类"""
@@ -16,9 +16,9 @@ class CustomersAPI(CRUDAPIClient):
             # 构建搜索参数
             search_params = {}
             
-            # 关键词搜索
+            # 关键词搜索（后端全文检索参数为 q）
             if params.get('search'):
-                search_params['search'] = params['search']
+                search_params['q'] = params['search']
             
             # 公司名称
             if params.get('company'):
@@ -60,6 +60,24 @@ class CustomersAPI(CRUDAPIClient):
             print(f"搜索客户失败: {e}")
             return []
     
+    def suggest_companies(self, prefix: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """客户单位输入联想（支持拼音首字母）"""
+        try:
+            response = self.get(f"{self.endpoint}suggest", params={'prefix': prefix, 'limit': limit})
+            return response if isinstance(response, list) else []
+        except APIException as e:
+            print(f"获取客户单位联想失败: {e}")
+            return []
+    
+    def get_facets(self, params: Dict[str, Any] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """获取筛选项分面（行业、省份、城市、状态、销售负责人的取值及客户数）"""
+        try:
+            response = self.get(f"{self.endpoint}facets", params=params)
+            return response if isinstance(response, dict) else {}
+        except APIException as e:
+            print(f"获取筛选项分面失败: {e}")
+            return {}
+    
     def get_customer_contacts(self, customer_id: int) -> List[Dict[str, Any]]:
         """获取客户联系人"""
         try:
@@ -98,31 +116,31 @@ class CustomersAPI(CRUDAPIClient):
             print(f"删除客户联系人失败: {e}")
             return False
     
-    def assign_sales_person(self, customer_ids: List[int], sales_id: int) -> bool:
-        """分配销售负责人"""
+    def assign_sales_person(self, customer_ids: List[int], sales_id: Optional[int]) -> int:
+        """批量分配销售负责人，一次请求提交全部客户，返回实际更新的客户数（失败返回 -1）"""
         try:
             data = {
                 'customer_ids': customer_ids,
                 'sales_id': sales_id
             }
-            self.post(f"{self.endpoint}assign_sales/", data)
-            return True
+            response = self.post(f"{self.endpoint}assign_sales/", data)
+            return response.get('updated', 0) if isinstance(response, dict) else 0
         except APIException as e:
             print(f"分配销售负责人失败: {e}")
-            return False
+            return -1
     
-    def assign_service_person(self, customer_ids: List[int], service_id: int) -> bool:
-        """分配客服负责人"""
+    def assign_service_person(self, customer_ids: List[int], service_id: Optional[int]) -> int:
+        """批量分配客服负责人，一次请求提交全部客户，返回实际更新的客户数（失败返回 -1）"""
         try:
             data = {
                 'customer_ids': customer_ids,
                 'service_id': service_id
             }
-            self.post(f"{self.endpoint}assign_service/", data)
-            return True
+            response = self.post(f"{self.endpoint}assign_service/", data)
+            return response.get('updated', 0) if isinstance(response, dict) else 0
         except APIException as e:
             print(f"分配客服负责人失败: {e}")
-            return False
+            return -1
     
     def get_customer_orders(self, customer_id: int) -> List[Dict[str, Any]]:
         """获取客户订单"""
@@ -169,25 +187,27 @@ class CustomersAPI(CRUDAPIClient):
             print(f"获取客户统计信息失败: {e}")
             return {}
     
-    def export_customers(self, params: Dict[str, Any] = None) -> Optional[bytes]:
-        """导出客户数据"""
+    def export_customers(self, file_path: str, params: Dict[str, Any] = None) -> bool:
+        """导出客户数据到本地文件（CSV，params 可带 format=ndjson 及列表筛选条件）"""
         try:
-            # 这里应该返回文件内容，但由于是模拟，返回None
-            print("导出客户数据功能需要后端支持")
-            return None
+            self.download(f"{self.endpoint}export", file_path, params=params)
+            return True
         except APIException as e:
             print(f"导出客户数据失败: {e}")
-            return None
+            return False
     
-    def import_customers(self, file_data: bytes) -> Dict[str, Any]:
-        """导入客户数据"""
+    def import_customers(self, file_data: bytes, filename: str = "customers.csv") -> Dict[str, Any]:
+        """导入客户数据（CSV 或 XLSX 文件）"""
         try:
-            # 这里应该上传文件，但由于是模拟，返回空结果
-            print("导入客户数据功能需要后端支持")
-            return {"success": 0, "failed": 0, "errors": []}
+            # 以 multipart 上传，需去掉会话默认的 JSON Content-Type
+            return self._make_request(
+                'POST', f"{self.endpoint}import",
+                files={'file': (filename, file_data)},
+                headers={'Content-Type': None},
+            )
         except APIException as e:
             print(f"导入客户数据失败: {e}")
-            return {"success": 0, "failed": 0, "errors": [str(e)]}
+            return {"total_rows": 0, "imported": 0, "failed": 0, "errors": [str(e)]}
 
 # 创建全局实例
 customers_api = CustomersAPI()
@@ -0,0 +1,47 @@
+"""
+增量同步API客户端
+"""
+from typing import Dict, Any, Optional
+from .base_client import BaseAPIClient, APIException
+
+class SyncAPI(BaseAPIClient):
+    """增量同步API客户端"""
+    
+    endpoint = "/sync/changes"
+    
+    def get_token(self) -> Optional[str]:
+        """获取当前同步令牌（在完整加载列表之前调用）"""
+        try:
+            return self.get(self.endpoint).get('token')
+        except APIException as e:
+            print(f"获取同步令牌失败: {e}")
+            return None
+    
+    def get_changes(self, since: str, limit: int = 1000) -> Optional[Dict[str, Any]]:
+        """
+        拉取 since 之后的全部变更，自动跟随 has_more 继续请求
+        
+        返回 {'token': 新令牌, 'changes': {表名: {'upserted': [...], 'deleted': [...]}}}，
+        失败时返回 None（调用方应退回到完整刷新）。
+        """
+        merged: Dict[str, Dict[str, list]] = {}
+        token = since
+        try:
+            while True:
+                response = self.get(self.endpoint, params={'since': token, 'limit': limit})
+                token = response['token']
+                for table, changes in response.get('changes', {}).items():
+                    target = merged.setdefault(table, {'upserted': [], 'deleted': []})
+                    target['upserted'].extend(changes.get('upserted', []))
+                    target['deleted'].extend(changes.get('deleted', []))
+                if not response.get('has_more'):
+                    return {'token': token, 'changes': merged}
+        except (APIException, KeyError) as e:
+            print(f"拉取增量变更失败: {e}")
+            return None
+
+# 创建全局实例
+sync_api = SyncAPI()
+
+# 导出
+__all__ = ['SyncAPI', 'sync_api']
@@ -6,7 +6,7 @@ from PySide6.QtWidgets import (
     QLineEdit, QComboBox, QHeaderView, QMessageBox, QLabel, QCheckBox
 )
 from PySide6.QtGui import QStandardItemModel, QStandardItem
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer
 from typing import List, Dict, Any
 from .dialog_styles import show_message_box
 
@@ -67,11 +67,18 @@ class CustomerManagementView(QWidget):
         # 客户单位
         self.customer_unit_combo = QComboBox()
         self.customer_unit_combo.setFixedWidth(120)
-        self.customer_unit_combo.setPlaceholderText("客户单位")
+        # 可输入，输入时从服务端联想客户单位（支持拼音首字母），不再下载全部客户
+        self.customer_unit_combo.setEditable(True)
+        self.customer_unit_combo.setInsertPolicy(QComboBox.InsertPolicy.NoInsert)
+        self.customer_unit_combo.lineEdit().setPlaceholderText("客户单位")
         self.customer_unit_combo.addItem("全部", None)
-        # 这里会在加载数据时动态填充客户单位列表
         # 设置当前索引为-1以显示占位符
         self.customer_unit_combo.setCurrentIndex(-1)
+
+        # 输入防抖，停止输入 200ms 后再请求联想
+        self.company_suggest_timer = QTimer(self)
+        self.company_suggest_timer.setSingleShot(True)
+        self.company_suggest_timer.setInterval(200)
         self.setup_combo_style(self.customer_unit_combo)
         toolbar_layout.addWidget(self.customer_unit_combo)
 
@@ -395,6 +402,8 @@ class CustomerManagementView(QWidget):
     def setup_connections(self):
         """设置信号连接"""
         self.search_btn.clicked.connect(self.on_search_clicked)
+        self.customer_unit_combo.lineEdit().textEdited.connect(self.company_suggest_timer.start)
+        self.company_suggest_timer.timeout.connect(self.update_company_suggestions)
         self.reset_btn.clicked.connect(self.on_reset_clicked)
         self.province_combo.currentTextChanged.connect(self.on_province_changed)
         self.table_view.doubleClicked.connect(self.on_row_double_clicked)
@@ -430,41 +439,18 @@ class CustomerManagementView(QWidget):
             self.update_table_view()
 
     def update_filter_options(self):
-        """更新筛选条件的选项"""
-        if not self.customers_data:
+        """更新筛选条件的选项（由服务端分面统计提供，不再遍历客户列表）"""
+        # 客户单位选项由输入联想提供，见 update_company_suggestions
+        facets = customers_api.get_facets()
+        if not facets:
             return
 
-        # 更新客户单位选项
-        companies = set()
-        sales_persons = set()
-
-        for customer in self.customers_data:
-            if customer.get('company'):
-                companies.add(customer['company'])
-            if customer.get('sales_person'):
-                sales_persons.add(customer['sales_person'])
-
-        # 更新客户单位下拉框
-        current_company = self.customer_unit_combo.currentData()
-        self.customer_unit_combo.clear()
-        self.customer_unit_combo.addItem("全部", None)
-        for company in sorted(companies):
-            self.customer_unit_combo.addItem(company, company)
-
-        # 恢复之前的选择
-        if current_company:
-            index = self.customer_unit_combo.findData(current_company)
-            if index >= 0:
-                self.customer_unit_combo.setCurrentIndex(index)
-        else:
-            self.customer_unit_combo.setCurrentIndex(-1)
-
-        # 更新销售人员下拉框
+        # 更新销售人员下拉框，选项值为销售员工ID
         current_sales = self.sales_person_combo.currentData()
         self.sales_person_combo.clear()
         self.sales_person_combo.addItem("全部", None)
-        for sales in sorted(sales_persons):
-            self.sales_person_combo.addItem(sales, sales)
+        for sales in facets.get('sales', []):
+            self.sales_person_combo.addItem(f"{sales['label'] or sales['value']} ({sales['count']})", sales['value'])
 
         # 恢复之前的选择
         if current_sales:
@@ -474,6 +460,27 @@ class CustomerManagementView(QWidget):
         else:
             self.sales_person_combo.setCurrentIndex(-1)
 
+    def update_company_suggestions(self):
+        """根据输入的前缀从服务端获取客户单位联想"""
+        prefix = self.customer_unit_combo.lineEdit().text().strip()
+        if not prefix:
+            return
+
+        suggestions = customers_api.suggest_companies(prefix)
+
+        # 重新填充下拉项时保留用户正在输入的文字
+        self.customer_unit_combo.blockSignals(True)
+        self.customer_unit_combo.clear()
+        self.customer_unit_combo.addItem("全部", None)
+        for suggestion in suggestions:
+            self.customer_unit_combo.addItem(suggestion['company'], suggestion['company'])
+        self.customer_unit_combo.setCurrentIndex(-1)
+        self.customer_unit_combo.setEditText(prefix)
+        self.customer_unit_combo.blockSignals(False)
+
+        if suggestions:
+            self.customer_unit_combo.showPopup()
+
     def update_table_view(self):
         """更新表格视图"""
         self.model.clear()
@@ -568,14 +575,17 @@ class CustomerManagementView(QWidget):
 
     def on_search_clicked(self):
         """搜索按钮点击事件"""
-        # 获取搜索条件
+        # 获取搜索条件（客户单位可直接输入，未选中联想项时按输入文字查询）
+        company = self.customer_unit_combo.currentData()
+        if company is None and self.customer_unit_combo.currentIndex() != 0:
+            company = self.customer_unit_combo.currentText().strip()
         params = {
-            'company': self.customer_unit_combo.currentData(),
+            'company': company,
             'industry': self.industry_combo.currentData(),
             'province': self.province_combo.currentData(),
             'city': self.city_combo.currentData(),
             'status': self.contact_status_combo.currentData(),
-            'sales_person': self.sales_person_combo.currentData()
+            'sales_id': self.sales_person_combo.currentData()
         }
 
         # 移除空值
@@ -600,6 +610,7 @@ class CustomerManagementView(QWidget):
         """重置按钮点击事件"""
         # 重置为占位符状态（索引-1）
         self.customer_unit_combo.setCurrentIndex(-1)
+        self.customer_unit_combo.clearEditText()
         self.industry_combo.setCurrentIndex(-1)
         self.province_combo.setCurrentIndex(-1)
         self.city_combo.setCurrentIndex(-1)
@@ -656,12 +667,13 @@ class CustomerManagementView(QWidget):
             if dialog.exec():
                 assignment_data = dialog.get_assignment_data()
 
-                # 为每个选中的客户分配销售
-                success_count = 0
-                for customer in selected_customers:
-                    # 这里应该调用API更新客户的销售人员信息
-                    # 暂时模拟成功
-                    success_count += 1
+                if assignment_data['sales_person_id'] is None:
+                    show_message_box(self, "提示", "请选择销售人员")
+                    return
+
+                # 所有选中的客户通过一次批量请求分配销售
+                customer_ids = [customer['id'] for customer in selected_customers if customer.get('id') is not None]
+                success_count = customers_api.assign_sales_person(customer_ids, assignment_data['sales_person_id'])
 
                 if success_count > 0:
                     show_message_box(self, "成功", f"成功为 {success_count} 个客户分配销售人员: {assignment_data['sales_person']}!")
@@ -686,12 +698,13 @@ class CustomerManagementView(QWidget):
             if dialog.exec():
                 assignment_data = dialog.get_assignment_data()
 
-                # 为每个选中的客户分配客服
-                success_count = 0
-                for customer in selected_customers:
-                    # 这里应该调用API更新客户的客服人员信息
-                    # 暂时模拟成功
-                    success_count += 1
+                if assignment_data['service_person_id'] is None:
+                    show_message_box(self, "提示", "请选择客服人员")
+                    return
+
+                # 所有选中的客户通过一次批量请求分配客服
+                customer_ids = [customer['id'] for customer in selected_customers if customer.get('id') is not None]
+                success_count = customers_api.assign_service_person(customer_ids, assignment_data['service_person_id'])
 
                 if success_count > 0:
                     show_message_box(self, "成功", f"成功为 {success_count} 个客户分配客服人员: {assignment_data['service_person']}!")
@@ -166,9 +166,8 @@ class ServiceRecordView(QWidget):
                     customer = customers_map[customer_id]
                     
                     if customer_id not in customer_service_data:
-                        # 获取该客户的联系人数量
-                        contacts = contacts_api.get_contacts_for_customer(customer_id) or []
-                        contact_count = len(contacts)
+                        # 联系人数量由客户列表直接返回，无需逐个客户请求联系人
+                        contact_count = customer.get('contact_count', 0)
                         
                         customer_service_data[customer_id] = {
                             'customer': customer,
@@ -273,9 +272,8 @@ class ServiceRecordView(QWidget):
                         continue
                     
                     if customer_id not in customer_service_data:
-                        # 获取该客户的联系人数量
-                        contacts = contacts_api.get_contacts_for_customer(customer_id) or []
-                        contact_count = len(contacts)
+                        # 联系人数量由客户列表直接返回，无需逐个客户请求联系人
+                        contact_count = customer.get('contact_count', 0)
                         
                         customer_service_data[customer_id] = {
                             'customer': customer,